@@ -0,0 +1,203 @@
+"""
+Allocation profiling of benchmark processes with tracemalloc.
+
+AllocationProfiler snapshots the traced memory at start() and stop() and
+reports what the code in between allocated and had not freed by the end
+(retained bytes and blocks), the peak of traced memory above the start, and
+the source lines with the most growth. tracemalloc only sees live blocks, so
+the retained figures are net growth, not allocation churn: memory that is
+allocated and freed between the snapshots shows up in the peak only. Allocations of the benchmark harness
+itself (pytest and its fixtures and log capture, pytest-benchmark, the
+latency histograms, samplers and tracemalloc) are left out.
+
+An isolated server is profiled from the benchmark process: launched with
+--alloc-profile DIR it calls serve_profiles(DIR), which creates a FIFO,
+control_path(DIR, pid), and reads "start" and "stop" commands from it on a
+thread of its own. The server answers each command by writing
+profile_path(DIR, pid), which request_profile() waits for. FIFOs are POSIX
+only; on Windows servers are not profiled.
+"""
+import json
+import logging
+import os
+import sysconfig
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per allocation: enough to see whether the harness made it; sites are the innermost line
+FRAMES = 16
+
+# Allocation sites kept per profile
+TOP_SITES = 10
+
+# Harness files whose allocations are not the RPC's
+_IGNORED = [
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    tracemalloc.__file__,
+    os.path.join("*", "_pytest", "*"),
+    os.path.join("*", "pluggy", "*"),
+    os.path.join("*", "pytest_benchmark", "*"),
+    os.path.join("*", "pytest_asyncio", "*"),
+    os.path.join("*", "conftest.py"),
+    os.path.join("*", "alloc_profile.py"),
+    os.path.join("*", "latency.py"),
+    os.path.join("*", "resources.py"),
+]
+
+# Allocations made anywhere below these are left out too: log records and captured output,
+# kept alive by pytest's capture rather than by the code that logged or printed them
+_IGNORED_CALLERS = [
+    os.path.join("*", "logging", "__init__.py"),
+    os.path.join("*", "_pytest", "capture.py"),
+    os.path.join("*", "_pytest", "logging.py"),
+]
+
+# Servers can only be profiled where there are FIFOs to drive them through
+SERVER_PROFILING = hasattr(os, "mkfifo")
+
+# Prefixes dropped from allocation sites: this repository, then the standard library
+_PREFIXES = [os.path.dirname(os.path.abspath(__file__)), sysconfig.get_paths()["stdlib"]]
+
+
+def site_name(frame):
+    """file:line of an allocation, relative to this repository, site-packages or the standard library."""
+    filename = frame.filename
+    if "site-packages" in filename:
+        filename = filename[filename.rindex("site-packages") + len("site-packages") + 1:]
+    else:
+        for prefix in _PREFIXES:
+            if filename.startswith(prefix + os.sep):
+                filename = os.path.relpath(filename, prefix)
+                break
+    return f"{filename.replace(os.sep, '/')}:{frame.lineno}"
+
+
+class AllocationProfiler:
+    """Allocations between start() and stop(), starting tracemalloc if it is not already tracing."""
+
+    def __init__(self, top=TOP_SITES):
+        self.top = top
+        self._started_tracing = False
+        self._before = None
+        self._traced_before = 0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(FRAMES)
+            self._started_tracing = True
+        self._before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self._traced_before = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        """
+        The profile: retained_bytes and retained_blocks still allocated, alloc_peak_bytes
+        above the start, and retained_sites, the top lines by retained bytes, as
+        {"site", "bytes", "blocks"} dicts.
+        """
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1] - self._traced_before
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        filters = ([tracemalloc.Filter(False, pattern) for pattern in _IGNORED]
+                   + [tracemalloc.Filter(False, pattern, all_frames=True) for pattern in _IGNORED_CALLERS])
+        stats = after.filter_traces(filters).compare_to(self._before.filter_traces(filters), "lineno")
+        grown = [stat for stat in stats if stat.size_diff > 0]
+        return {
+            "retained_bytes": sum(stat.size_diff for stat in stats),
+            "retained_blocks": sum(stat.count_diff for stat in stats),
+            "alloc_peak_bytes": max(peak, 0),
+            "retained_sites": [
+                {"site": site_name(stat.traceback[0]), "bytes": stat.size_diff, "blocks": stat.count_diff}
+                for stat in grown[:self.top]
+            ],
+        }
+
+
+def per_operation(role, profile, operations):
+    """A profile keyed for a benchmark's extra_info, e.g. client_retained_bytes_per_op."""
+    results = {f"{role}_{key}": value for key, value in profile.items()}
+    if operations:
+        results[f"{role}_retained_bytes_per_op"] = profile["retained_bytes"] / operations
+        results[f"{role}_retained_blocks_per_op"] = profile["retained_blocks"] / operations
+    return results
+
+
+def control_path(directory, pid):
+    return os.path.join(directory, f"alloc_profile_{pid}.fifo")
+
+
+def profile_path(directory, pid):
+    return os.path.join(directory, f"alloc_profile_{pid}.json")
+
+
+def serve_profiles(directory):
+    """Start and stop an AllocationProfiler in this (server) process when told to through its FIFO."""
+    if not SERVER_PROFILING:
+        logger.warning("Allocation profiling of servers needs FIFOs, which this platform does not have")
+        return
+    fifo = control_path(directory, os.getpid())
+    path = profile_path(directory, os.getpid())
+    os.mkfifo(fifo)
+    profiler = None
+
+    def answer(command):
+        nonlocal profiler
+        if command == "start":
+            profiler = AllocationProfiler()
+            profiler.start()
+            reply = {"state": "started"}
+        elif command == "stop" and profiler is not None:
+            reply = dict(profiler.stop(), state="stopped")
+            profiler = None
+        else:
+            reply = {"state": "error", "error": f"Unexpected command {command!r}"}
+        # Write under another name first so the reader never sees half a file
+        with open(path + ".tmp", "w") as f:
+            json.dump(reply, f)
+        os.replace(path + ".tmp", path)
+
+    def serve():
+        while True:
+            # Blocks until a client opens the FIFO; reopened after each one
+            with open(fifo) as f:
+                for line in f:
+                    answer(line.strip())
+
+    threading.Thread(target=serve, name="AllocationProfiler", daemon=True).start()
+
+
+def request_profile(pid, directory, command, timeout=30.0):
+    """Send "start" or "stop" to a server run with serve_profiles(directory) and return its answer."""
+    path = profile_path(directory, pid)
+    if os.path.exists(path):
+        os.remove(path)
+    deadline = time.monotonic() + timeout
+
+    def wait(description):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Server {pid} did not {description} within {timeout}s")
+        time.sleep(0.01)
+
+    while True:
+        try:
+            # Non-blocking, so that a server that is gone cannot hang the benchmark
+            fd = os.open(control_path(directory, pid), os.O_WRONLY | os.O_NONBLOCK)
+            break
+        except OSError:  # No reader yet (ENXIO), or no FIFO yet
+            wait("open its allocation profiling FIFO")
+    with os.fdopen(fd, "w") as f:
+        f.write(command + "\n")
+    while not os.path.exists(path):
+        wait(f"answer the allocation profiling command {command!r}")
+    with open(path) as f:
+        reply = json.load(f)
+    os.remove(path)
+    if reply["state"] == "error":
+        raise RuntimeError(f"Server {pid}: {reply['error']}")
+    return reply
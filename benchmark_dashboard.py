@@ -8,6 +8,9 @@ import matplotlib.pyplot as plt
 import numpy as np
 from tabulate import tabulate
 
+from generate_report import ALLOC_HEADERS, RESOURCE_HEADERS, format_allocation, format_resource
+from scaling import usl_throughput
+
 def load_results(results_dir):
     """Load processed benchmark results."""
     # Ensure the directory exists
@@ -29,8 +32,11 @@ def plot_comparison_chart(results, output_dir):
     
     comparisons = results['comparisons']
     
-    # Prepare data for plotting
-    tests = list(comparisons.keys())
+    # Prepare data for plotting; cases on a scaling curve are drawn by plot_scaling_chart
+    scaled_cases = {case for curve in results.get('scaling', []) for case in curve['cases']}
+    tests = [test for test in comparisons if test not in scaled_cases]
+    if not tests:
+        return None
     implementations = results['summary']['implementations']
     
     # Create a figure with subplots for each test
@@ -80,6 +86,121 @@ def plot_comparison_chart(results, output_dir):
     print(f"Comparison chart saved to: {chart_path}")
     return chart_path
 
+def scaling_title(curve):
+    """Test name and its other parameters, e.g. 'test_benchmark_pool_scaling (pool_size=4)'."""
+    if not curve['params']:
+        return curve['test']
+    params = ", ".join(f"{name}={value}" for name, value in curve['params'].items())
+    return f"{curve['test']} ({params})"
+
+def plot_scaling_chart(results, output_dir):
+    """Generate throughput and latency curves against concurrency with their USL fits, or None without data."""
+    groups = {}
+    for curve in results.get('scaling', []):
+        groups.setdefault(scaling_title(curve), []).append(curve)
+    if not groups:
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+
+    fig, axes = plt.subplots(len(groups), 2, figsize=(14, 5 * len(groups)), squeeze=False)
+    for (title, curves), (throughput_ax, latency_ax) in zip(groups.items(), axes):
+        for curve in curves:
+            parameter = curve['parameter']
+            concurrency = curve[parameter]
+            impl = curve['implementation']
+            line, = throughput_ax.plot(concurrency, curve['throughput'], 'o-', label=impl)
+            fit = curve['fit']
+            if fit:
+                dense = np.linspace(min(concurrency), max(concurrency), 200)
+                throughput_ax.plot(dense, usl_throughput(dense, fit['lambda'], fit['sigma'], fit['kappa']),
+                                   '--', color=line.get_color(), alpha=0.6)
+                if fit['knee_concurrency']:
+                    throughput_ax.axvline(fit['knee_concurrency'], color=line.get_color(), linestyle=':', alpha=0.6)
+            points = [(n, p99 * 1000) for n, p99 in zip(concurrency, curve['p99']) if p99 is not None]
+            if points:
+                latency_ax.plot(*zip(*points), 'o-', color=line.get_color(), label=f"{impl} p99")
+            if fit:
+                latency_ax.plot(concurrency, [latency * 1000 for latency in fit['fitted_latency']],
+                                '--', color=line.get_color(), alpha=0.6, label=f"{impl} USL mean")
+        throughput_ax.set_title(f"Throughput: {title}")
+        throughput_ax.set_xlabel(parameter)
+        throughput_ax.set_ylabel("Operations/second (dashed: USL fit, dotted: knee)")
+        throughput_ax.set_xscale('log')
+        throughput_ax.legend()
+        latency_ax.set_title(f"Latency: {title}")
+        latency_ax.set_xlabel(parameter)
+        latency_ax.set_ylabel("Latency (ms)")
+        latency_ax.set_xscale('log')
+        latency_ax.set_yscale('log')
+        latency_ax.legend(fontsize='small')
+
+    plt.tight_layout()
+    chart_path = os.path.join(output_dir, "scaling_chart.png")
+    plt.savefig(chart_path)
+    print(f"Scaling chart saved to: {chart_path}")
+    return chart_path
+
+def latency_by_test(results):
+    """Per-call latency percentiles of each implementation, for the tests that recorded them."""
+    latency_tests = {}
+    for test, impls in results['comparisons'].items():
+        impls = {impl: data['latency'] for impl, data in impls.items() if 'latency' in data}
+        if impls:
+            latency_tests[test] = impls
+    return latency_tests
+
+def resources_by_test(results):
+    """Client and server resource usage of each implementation, for the tests that sampled it."""
+    resource_tests = {}
+    for test, impls in results['comparisons'].items():
+        impls = {impl: data['resources'] for impl, data in impls.items() if 'resources' in data}
+        if impls:
+            resource_tests[test] = impls
+    return resource_tests
+
+def allocations_by_test(results):
+    """Client and server retained allocations per operation of each implementation, for the tests that profiled them."""
+    alloc_tests = {}
+    for test, impls in results['comparisons'].items():
+        impls = {impl: data['allocations'] for impl, data in impls.items() if 'allocations' in data}
+        if impls:
+            alloc_tests[test] = impls
+    return alloc_tests
+
+def plot_latency_chart(results, output_dir):
+    """Generate grouped bar charts of p50/p99/p99.9 call latency per implementation, or None without data."""
+    latency_tests = latency_by_test(results)
+    if not latency_tests:
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+
+    percentiles = [('p50', 'p50'), ('p99', 'p99'), ('p99_9', 'p99.9')]
+    fig, axes = plt.subplots(len(latency_tests), 1, figsize=(10, 5 * len(latency_tests)))
+    if len(latency_tests) == 1:
+        axes = [axes]
+
+    for ax, (test, impls) in zip(axes, latency_tests.items()):
+        # Lowest p99 first
+        impl_names = sorted(impls, key=lambda impl: impls[impl]['p99'])
+        positions = np.arange(len(impl_names))
+        width = 0.8 / len(percentiles)
+        for j, (key, label) in enumerate(percentiles):
+            ax.bar(positions + j * width, [impls[impl][key] * 1000 for impl in impl_names], width, label=label)
+        ax.set_xticks(positions + width * (len(percentiles) - 1) / 2)
+        ax.set_xticklabels(impl_names)
+        # Tails are often orders of magnitude above the median
+        ax.set_yscale('log')
+        ax.set_title(f"Call latency: {test}")
+        ax.set_ylabel("Latency (ms, log scale)")
+        ax.set_xlabel("Implementation")
+        ax.legend()
+
+    plt.tight_layout()
+    chart_path = os.path.join(output_dir, "latency_chart.png")
+    plt.savefig(chart_path)
+    print(f"Latency chart saved to: {chart_path}")
+    return chart_path
+
 def plot_win_chart(results, output_dir):
     """Generate a pie chart showing win distribution."""
     # Ensure output directory exists
@@ -103,7 +224,47 @@ def plot_win_chart(results, output_dir):
     print(f"Win distribution chart saved to: {chart_path}")
     return chart_path
 
-def generate_html_report(results, output_dir, comparison_chart, win_chart):
+def scaling_table_html(results):
+    """HTML tables of the USL fit, knee and saturation point of each fitted scaling curve."""
+    groups = {}
+    for curve in results.get('scaling', []):
+        if curve['fit']:
+            groups.setdefault(scaling_title(curve), []).append(curve)
+    html = ""
+    for title, curves in groups.items():
+        html += f"""
+        <h3>Scaling: {title}</h3>
+        <table>
+            <tr>
+                <th>Implementation</th>
+                <th>Best Operations/Second</th>
+                <th>Contention (sigma)</th>
+                <th>Coherency (kappa)</th>
+                <th>USL Peak Concurrency</th>
+                <th>Knee</th>
+                <th>Saturation</th>
+                <th>R²</th>
+            </tr>
+        """
+        for curve in sorted(curves, key=lambda c: -max(c['throughput'])):
+            fit = curve['fit']
+            peak = f"{fit['peak_concurrency']:.1f}" if fit['peak_concurrency'] else "none"
+            html += f"""
+            <tr>
+                <td>{curve['implementation']}</td>
+                <td>{max(curve['throughput']):.2f}</td>
+                <td>{fit['sigma']:.4f}</td>
+                <td>{fit['kappa']:.6f}</td>
+                <td>{peak}</td>
+                <td>{fit['knee_concurrency'] or "none"}</td>
+                <td>{fit['saturation_concurrency']}</td>
+                <td>{fit['r_squared']:.3f}</td>
+            </tr>
+            """
+        html += "</table>"
+    return html
+
+def generate_html_report(results, output_dir, comparison_chart, win_chart, latency_chart=None, scaling_chart=None):
     """Generate an HTML report with interactive elements."""
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
@@ -133,17 +294,41 @@ def generate_html_report(results, output_dir, comparison_chart, win_chart):
             <p>Total tests: {results['summary']['test_count']}</p>
             <p>Implementations tested: {', '.join(results['summary']['implementations'])}</p>
         </div>
-        
+    """
+
+    if scaling_chart:
+        html_content += f"""
+        <div class="chart">
+            <h2>Concurrency Scaling</h2>
+            <img src="{os.path.basename(scaling_chart)}" alt="Throughput and latency against concurrency with USL fits" width="1000">
+        </div>
+        """
+        html_content += scaling_table_html(results)
+
+    if comparison_chart:
+        html_content += f"""
         <div class="chart">
             <h2>Performance Comparison</h2>
             <img src="{os.path.basename(comparison_chart)}" alt="Performance Comparison Chart" width="800">
         </div>
-        
+        """
+
+    html_content += f"""
         <div class="chart">
             <h2>Win Distribution</h2>
             <img src="{os.path.basename(win_chart)}" alt="Win Distribution Chart" width="500">
         </div>
-        
+    """
+
+    if latency_chart:
+        html_content += f"""
+        <div class="chart">
+            <h2>Call Latency Percentiles</h2>
+            <img src="{os.path.basename(latency_chart)}" alt="p50, p99 and p99.9 call latency by implementation" width="800">
+        </div>
+        """
+
+    html_content += """
         <h2>Detailed Results</h2>
     """
     
@@ -179,6 +364,120 @@ def generate_html_report(results, output_dir, comparison_chart, win_chart):
             """
         
         html_content += "</table>"
+
+    # Per-call latency tables, lowest p99 first
+    latency_tests = latency_by_test(results)
+    if latency_tests:
+        html_content += """
+        <h2>Per-Call Latency Percentiles</h2>
+        <p>Latency of single calls: p99 is the time 99% of the calls did not exceed.</p>
+        """
+    for test, impls in latency_tests.items():
+        html_content += f"""
+        <h3>Latency: {test}</h3>
+        <table>
+            <tr>
+                <th>Implementation</th>
+                <th>p50</th>
+                <th>p90</th>
+                <th>p99</th>
+                <th>p99.9</th>
+                <th>Max</th>
+            </tr>
+        """
+        for impl, latency in sorted(impls.items(), key=lambda x: x[1]['p99']):
+            cells = "".join(f"<td>{format_time(latency[key])}</td>"
+                            for key in ('p50', 'p90', 'p99', 'p99_9', 'max_latency'))
+            html_content += f"""
+            <tr>
+                <td>{impl}</td>
+                {cells}
+            </tr>
+            """
+        html_content += "</table>"
+
+    # Resource usage tables, least client and server CPU per operation first
+    resource_tests = resources_by_test(results)
+    if resource_tests:
+        html_content += """
+        <h2>Resource Usage</h2>
+        <p>CPU seconds per 1000 operations, peak resident memory and context switches per operation,
+        sampled from /proc while each test ran. Server figures are only separate with --rpc-isolated.</p>
+        """
+    for test, impls in resource_tests.items():
+        header_cells = "".join(f"<th>{header}</th>" for _, header in RESOURCE_HEADERS)
+        html_content += f"""
+        <h3>Resources: {test}</h3>
+        <table>
+            <tr>
+                <th>Implementation</th>
+                {header_cells}
+            </tr>
+        """
+        for impl, resources in sorted(impls.items(), key=lambda x: x[1]['client_cpu_s_per_1k_ops']
+                                      + (x[1]['server_cpu_s_per_1k_ops'] or 0)):
+            cells = "".join(f"<td>{format_resource(key, resources[key])}</td>" for key, _ in RESOURCE_HEADERS)
+            html_content += f"""
+            <tr>
+                <td>{impl}</td>
+                {cells}
+            </tr>
+            """
+        html_content += "</table>"
+
+    # Retained allocation tables (--rpc-alloc-profile), fewest retained bytes per operation first, then the top sites
+    alloc_tests = allocations_by_test(results)
+    if alloc_tests:
+        html_content += """
+        <h2>Retained Allocations</h2>
+        <p>Net growth of memory traced by tracemalloc over each test (allocated and still held at its end), per
+        operation, and the peak above the start. Short-lived allocations (churn) only show in the peak. Server
+        figures are only separate with --rpc-isolated.</p>
+        """
+    for test, impls in alloc_tests.items():
+        header_cells = "".join(f"<th>{header}</th>" for _, header in ALLOC_HEADERS)
+        html_content += f"""
+        <h3>Retained allocations: {test}</h3>
+        <table>
+            <tr>
+                <th>Implementation</th>
+                {header_cells}
+            </tr>
+        """
+        for impl, allocations in sorted(impls.items(), key=lambda x: x[1]['client_retained_bytes_per_op']
+                                        + (x[1]['server_retained_bytes_per_op'] or 0)):
+            cells = "".join(f"<td>{format_allocation(key, allocations[key])}</td>" for key, _ in ALLOC_HEADERS)
+            html_content += f"""
+            <tr>
+                <td>{impl}</td>
+                {cells}
+            </tr>
+            """
+        html_content += "</table>"
+    for impl, roles in sorted(results.get('retained_sites', {}).items()):
+        html_content += f"""
+        <h3>Top retaining sites: {impl}</h3>
+        <table>
+            <tr>
+                <th>Process</th>
+                <th>Site</th>
+                <th>Bytes</th>
+                <th>Blocks</th>
+                <th>Tests</th>
+            </tr>
+        """
+        for role, sites in roles.items():
+            for site in sites:
+                html_content += f"""
+            <tr>
+                <td>{role}</td>
+                <td>{site['site']}</td>
+                <td>{site['bytes']}</td>
+                <td>{site['blocks']}</td>
+                <td>{site['tests']}</td>
+            </tr>
+            """
+        html_content += "</table>"
     
     html_content += """
     </body>
@@ -240,9 +539,12 @@ def main():
         # Generate charts using the resolved directory
         comparison_chart = plot_comparison_chart(results, results_dir)
         win_chart = plot_win_chart(results, results_dir)
+        latency_chart = plot_latency_chart(results, results_dir)
+        scaling_chart = plot_scaling_chart(results, results_dir)
         
         # Generate HTML report
-        html_report = generate_html_report(results, results_dir, comparison_chart, win_chart)
+        html_report = generate_html_report(results, results_dir, comparison_chart, win_chart, latency_chart,
+                                           scaling_chart)
         
         print("\nDashboard generation complete!")
         print(f"Open the HTML report to view the results: {html_report}")
@@ -8,6 +8,10 @@ import os
 import uuid
 import pytest
 
+from alloc_profile import SERVER_PROFILING, AllocationProfiler, per_operation, request_profile
+from latency import LatencyHistogram
+from resources import ResourceSampler, available as resource_sampling_available
+
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s %(levelname)s: %(message)s', force=True)
@@ -15,10 +19,186 @@ logging.basicConfig(level=logging.INFO,
 
 def pytest_addoption(parser):
     parser.addoption("--rpc", action="store", default="rpyc",
-                     choices=["pure-python", "rpyc", "zmq", "grpc", "named-pipe", "pyro", "pyro5"],
+                     choices=["pure-python", "asyncio", "rpyc", "zmq", "grpc", "named-pipe", "unix-socket", "shm", "mp-connection", "pyro", "pyro5"],
                      help="Choose the RPC implementation to benchmark.")
     parser.addoption("--rpc-isolated", action="store_true", default=False,
                      help="Run the RPC server in an isolated process (ignored for pure-python).")
+    parser.addoption("--rpc-huge-payloads", action="store_true", default=False,
+                     help="Also run the 10-500 MB payload benchmarks (needs several GB of memory).")
+    parser.addoption("--rpc-offload-threshold", action="store", type=int, default=1024 * 1024,
+                     help="Payload size in bytes from which the offload variants of the large-payload "
+                          "benchmarks pass payloads through shared memory (0 = never).")
+    parser.addoption("--rpc-resource-interval", action="store", type=float, default=0.05,
+                     help="Seconds between /proc samples of the client and isolated server CPU, memory and "
+                          "context switches during each benchmark (0 = off; Linux only).")
+    parser.addoption("--rpc-alloc-profile", action="store_true", default=False,
+                     help="Profile allocations with tracemalloc on the client and isolated server during each "
+                          "benchmark (tracing slows every call, so timings are not comparable to normal runs).")
+    parser.addoption("--grpc-chunk-size", action="store", type=int, default=1024 * 1024,
+                     help="Chunk size in bytes for gRPC payloads streamed over Upload/Echo.")
+    parser.addoption("--grpc-stream-batch-size", action="store", type=int, default=0,
+                     help="Values per gRPC stream message via StreamValuesBatched (0 = one message per value).")
+    parser.addoption("--grpc-call-mode", action="store", default="unary", choices=["unary", "pipelined"],
+                     help="gRPC simple_call: one unary RPC per call, or calls multiplexed over one bidi stream.")
+    parser.addoption("--rpc-transport", action="store", default="tcp", choices=["tcp", "ipc"],
+                     help="Same-host transport for asyncio, mp-connection, ZeroMQ and gRPC: loopback TCP or Unix domain sockets.")
+    parser.addoption("--asyncio-serializer", action="store", default="binary",
+                     choices=["json", "binary", "pickle"],
+                     help="Message encoding for the raw asyncio backend.")
+    parser.addoption("--asyncio-stream-chunk-size", action="store", type=int, default=100,
+                     help="Values per message when the raw asyncio backend streams.")
+    parser.addoption("--shm-ring-size", action="store", type=int, default=4 * 1024 * 1024,
+                     help="Bytes per direction in the shared-memory backend's rings.")
+    parser.addoption("--shm-threshold", action="store", type=int, default=256 * 1024,
+                     help="Payload size in bytes from which the shared-memory backend uses a pooled shared memory block (0 = never).")
+    parser.addoption("--rpyc-client-mode", action="store", default="executor",
+                     choices=["executor", "async"],
+                     help="RPyC/named-pipe/unix-socket client mode: one executor thread per call, or "
+                          "asyncio futures over AsyncResult with a background serving thread.")
+    parser.addoption("--rpyc-pool-size", action="store", type=int, default=4,
+                     help="Maximum number of pooled RPyC/unix-socket connections used by executor-mode calls.")
+    parser.addoption("--rpyc-pool-strategy", action="store", default="round-robin",
+                     choices=["round-robin", "least-busy"],
+                     help="How executor-mode RPyC/unix-socket calls pick a pooled connection.")
+    parser.addoption("--rpyc-stream-chunk-size", action="store", type=int, default=100,
+                     help="Items per remote next() call when streaming from RPyC/named-pipe/unix-socket (0 = collect item by item).")
+    parser.addoption("--rpyc-stream-prefetch", action="store", type=int, default=2,
+                     help="Number of RPyC/named-pipe/unix-socket stream chunks prefetched by the background thread.")
+    parser.addoption("--zmq-stream-window", action="store", type=int, default=64,
+                     help="Stream credits granted to the ZeroMQ server ahead of consumption.")
+    parser.addoption("--zmq-serializer", action="store", default="json",
+                     choices=["json", "binary", "pickle"],
+                     help="Message encoding for ZeroMQ: JSON, length-prefixed binary frames, or pickle protocol 5.")
+    parser.addoption("--zmq-zero-copy-threshold", action="store", type=int, default=64 * 1024,
+                     help="Payload size in bytes from which ZeroMQ sends raw zero-copy frames (0 = always copy inline).")
+    parser.addoption("--pyro-stream-chunk-size", action="store", type=int, default=100,
+                     help="Items per remote next() call when streaming from Pyro4 (0 = one item per call).")
+    parser.addoption("--pyro-stream-prefetch", action="store", type=int, default=2,
+                     help="Number of Pyro4 stream chunks prefetched by the background thread.")
+    parser.addoption("--pyro5-pool-size", action="store", type=int, default=8,
+                     help="Maximum number of pooled Pyro5 proxies (connections).")
+    parser.addoption("--pyro5-pool-idle-timeout", action="store", type=float, default=30.0,
+                     help="Seconds before an idle pooled Pyro5 proxy is closed.")
+
+
+# Tuning options recorded in each benchmark's extra_info, with the --rpc choices they apply to
+RPC_TUNING_OPTIONS = {
+    "rpc_transport": ("asyncio", "mp-connection", "zmq", "grpc"),
+    "asyncio_serializer": ("asyncio",),
+    "asyncio_stream_chunk_size": ("asyncio",),
+    "shm_ring_size": ("shm",),
+    "shm_threshold": ("shm",),
+    "grpc_chunk_size": ("grpc",),
+    "grpc_stream_batch_size": ("grpc",),
+    "grpc_call_mode": ("grpc",),
+    "rpyc_client_mode": ("rpyc", "named-pipe", "unix-socket"),
+    "rpyc_stream_chunk_size": ("rpyc", "named-pipe", "unix-socket"),
+    "rpyc_stream_prefetch": ("rpyc", "named-pipe", "unix-socket"),
+    "rpyc_pool_size": ("rpyc", "unix-socket"),
+    "rpyc_pool_strategy": ("rpyc", "unix-socket"),
+    "zmq_stream_window": ("zmq",),
+    "zmq_serializer": ("zmq",),
+    "zmq_zero_copy_threshold": ("zmq",),
+    "pyro_stream_chunk_size": ("pyro",),
+    "pyro_stream_prefetch": ("pyro",),
+    "pyro5_pool_size": ("pyro5",),
+    "pyro5_pool_idle_timeout": ("pyro5",),
+}
+
+
+@pytest.fixture(autouse=True)
+def record_rpc_options(request):
+    """Attach the tuning options of the implementation under test to the benchmark results."""
+    if "benchmark" not in request.fixturenames:
+        return
+    rpc_type = request.config.getoption("--rpc")
+    benchmark = request.getfixturevalue("benchmark")
+    for option, rpc_types in RPC_TUNING_OPTIONS.items():
+        if rpc_type in rpc_types:
+            benchmark.extra_info[option] = request.config.getoption(option)
+
+
+def timed_operations(benchmark):
+    """Operations in the benchmark's timed rounds (one run when benchmarking is disabled)."""
+    runs = benchmark.stats.stats.rounds * benchmark.stats.iterations if benchmark.stats else 1
+    return benchmark.extra_info.get('operations', 1) * runs
+
+
+@pytest.fixture(autouse=True)
+def record_resources(request):
+    """
+    Sample CPU time, resident memory, context switches and I/O of the client
+    (this process) and of an isolated server while the test runs, and attach
+    them to the benchmark results. An in-process server is part of the client.
+    """
+    interval = request.config.getoption("--rpc-resource-interval")
+    if (not interval or not resource_sampling_available() or "benchmark" not in request.fixturenames
+            or "rpc_implementation" not in request.fixturenames):
+        yield
+        return
+    benchmark = request.getfixturevalue("benchmark")
+    server_pid = request.getfixturevalue("rpc_implementation").server_pid
+    pids = {"client": os.getpid()}
+    if server_pid is not None:
+        pids["server"] = server_pid
+    sampler = ResourceSampler(pids, interval)
+    sampler.start()
+    yield
+    sampler.stop()
+    benchmark.extra_info['resource_interval'] = interval
+    benchmark.extra_info['server_in_process'] = server_pid is None
+    benchmark.extra_info.update(sampler.results(timed_operations(benchmark)))
+
+
+@pytest.fixture(scope="session")
+def alloc_profile_dir(tmp_path_factory):
+    """Where isolated servers launched with --alloc-profile take commands and write their profiles."""
+    return str(tmp_path_factory.mktemp("alloc_profile"))
+
+
+@pytest.fixture(autouse=True)
+def record_allocations(request):
+    """
+    With --rpc-alloc-profile, snapshot tracemalloc around the test in this
+    process and in an isolated server, and attach the bytes
+    and blocks retained per operation, the peak and the top retaining sites
+    to the benchmark results. An in-process server is part of the client.
+    """
+    if (not request.config.getoption("--rpc-alloc-profile") or "benchmark" not in request.fixturenames
+            or "rpc_implementation" not in request.fixturenames):
+        yield
+        return
+    benchmark = request.getfixturevalue("benchmark")
+    server_pid = request.getfixturevalue("rpc_implementation").server_pid if SERVER_PROFILING else None
+    if server_pid is not None:
+        request_profile(server_pid, request.getfixturevalue("alloc_profile_dir"), "start")
+    profiler = AllocationProfiler()
+    profiler.start()
+    yield
+    client = profiler.stop()
+    operations = timed_operations(benchmark)
+    benchmark.extra_info.update(per_operation("client", client, operations))
+    if server_pid is not None:
+        server = request_profile(server_pid, request.getfixturevalue("alloc_profile_dir"), "stop")
+        del server["state"]
+        benchmark.extra_info.update(per_operation("server", server, operations))
+
+
+@pytest.fixture
+def latency(benchmark):
+    """
+    Histogram of the latency of each individual RPC call a test makes, e.g.
+
+        with latency.time():
+            await rpc_implementation.simple_call(42)
+
+    stored with its percentiles in the benchmark's extra_info.
+    """
+    histogram = LatencyHistogram()
+    yield histogram
+    if histogram.count:
+        benchmark.extra_info.update(histogram.summary())
+        benchmark.extra_info['latency_histogram'] = histogram.to_dict()
 
 
 async def launch_and_wait(cmd, protocol, timeout=30):
@@ -75,9 +255,19 @@ async def launch_and_wait(cmd, protocol, timeout=30):
                  proc.kill()
         raise # Re-raise the exception
 
+    # Keep draining the server output so a chatty server never blocks on a full pipe
+    proc.output_task = asyncio.create_task(drain_output(proc, protocol))
     return proc
 
 
+async def drain_output(proc, protocol):
+    while True:
+        line_bytes = await proc.stdout.readline()
+        if not line_bytes:
+            break
+        logging.debug(f"{protocol} server output: {line_bytes.decode(errors='ignore').rstrip()}")
+
+
 import pytest_asyncio
 
 @pytest_asyncio.fixture
@@ -99,16 +289,24 @@ async def rpc_implementation(request):
     elif isolated:
         # Dynamic port assignment
         port = get_dynamic_port() # Moved inside elif isolated
+        # Servers profile their allocations when record_allocations tells them to
+        server_args = []
+        if request.config.getoption("--rpc-alloc-profile"):
+            server_args = ["--alloc-profile", request.getfixturevalue("alloc_profile_dir")]
         if rpc_type == "rpyc":
             cmd = [sys.executable, "-u", "launch_rpyc.py", "--port", str(port)]
-            proc = await launch_and_wait(cmd, "RPyC")
+            proc = await launch_and_wait(cmd + server_args, "RPyC")
             from implementations.rpyc_impl import RPyCImplementation
-            impl = RPyCImplementation(host="localhost", port=port, external_server=True)
-            def connect():
-                import rpyc
-                impl.conn = rpyc.connect(impl.host, impl.port)
-            await asyncio.get_running_loop().run_in_executor(None, connect)
+            impl = RPyCImplementation(host="localhost", port=port, external_server=True,
+                                      client_mode=request.config.getoption("--rpyc-client-mode"),
+                                      stream_chunk_size=request.config.getoption("--rpyc-stream-chunk-size"),
+                                      stream_prefetch=request.config.getoption("--rpyc-stream-prefetch"),
+                                      pool_size=request.config.getoption("--rpyc-pool-size"),
+                                      pool_strategy=request.config.getoption("--rpyc-pool-strategy"))
+            await impl.setup()  # Connects and creates the pool; the server runs in the launched process
+            impl.server_pid = proc.pid
             yield impl
+            await impl.teardown()
             proc.terminate()
             try:
                 await asyncio.wait_for(proc.wait(), timeout=5.0)
@@ -117,28 +315,121 @@ async def rpc_implementation(request):
         elif rpc_type == "named-pipe":
             if os.name != "nt":
                 pytest.skip("Named pipes are only supported on Windows")
-            import uuid
             pipe_name = r"\\.\pipe\RPyC_{}".format(uuid.uuid4().hex)
             cmd = [sys.executable, "-u", "launch_named_pipe.py", "--pipe-name", pipe_name]
-            proc = await launch_and_wait(cmd, "Named Pipe")
+            proc = await launch_and_wait(cmd + server_args, "Named Pipe")
             from named_pipe_impl import NamedPipeImplementation
-            impl = NamedPipeImplementation(external_server=True)
+            impl = NamedPipeImplementation(external_server=True,
+                                           client_mode=request.config.getoption("--rpyc-client-mode"),
+                                           stream_chunk_size=request.config.getoption("--rpyc-stream-chunk-size"),
+                                           stream_prefetch=request.config.getoption("--rpyc-stream-prefetch"))
             impl.pipe_name = pipe_name
             await impl.setup()
+            impl.server_pid = proc.pid
+            yield impl
+            await impl.teardown()
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+        elif rpc_type == "asyncio":
+            serializer = request.config.getoption("--asyncio-serializer")
+            transport = request.config.getoption("--rpc-transport")
+            cmd = [sys.executable, "-u", "launch_asyncio.py", "--port", str(port),
+                   "--transport", transport, "--serializer", serializer]
+            proc = await launch_and_wait(cmd + server_args, "Asyncio")
+            from implementations.asyncio_impl import AsyncioImplementation
+            impl = AsyncioImplementation(external_server=True, serializer=serializer,
+                                         transport=transport, port=port,
+                                         stream_chunk_size=request.config.getoption("--asyncio-stream-chunk-size"))
+            await impl.setup()  # Connects only; the server runs in the launched process
+            impl.server_pid = proc.pid
+            yield impl
+            await impl.teardown()
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+            if transport == "ipc":
+                from implementations.transports import ipc_path, remove_socket_file
+                remove_socket_file(ipc_path("asyncio", port))
+        elif rpc_type == "mp-connection":
+            transport = request.config.getoption("--rpc-transport")
+            cmd = [sys.executable, "-u", "launch_mp_connection.py", "--port", str(port), "--transport", transport]
+            proc = await launch_and_wait(cmd + server_args, "multiprocessing.connection")
+            from implementations.mp_connection_impl import MPConnectionImplementation
+            impl = MPConnectionImplementation(external_server=True, transport=transport, port=port)
+            await impl.setup()  # Connects only; the server runs in the launched process
+            impl.server_pid = proc.pid
+            yield impl
+            await impl.teardown()
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+            if transport == "ipc":
+                from implementations.transports import ipc_path, remove_socket_file
+                remove_socket_file(ipc_path("mp-connection", port))
+        elif rpc_type == "shm":
+            if os.name == "nt":
+                pytest.skip("The shared-memory backend needs POSIX named FIFOs")
+            name = f"art{uuid.uuid4().hex[:16]}"
+            ring_size = request.config.getoption("--shm-ring-size")
+            shm_threshold = request.config.getoption("--shm-threshold")
+            cmd = [sys.executable, "-u", "launch_shm.py", "--name", name,
+                   "--ring-size", str(ring_size), "--shm-threshold", str(shm_threshold)]
+            proc = await launch_and_wait(cmd + server_args, "Shared Memory")
+            from implementations.shm_impl import SharedMemoryImplementation, remove_shm_resources
+            impl = SharedMemoryImplementation(name=name, external_server=True, ring_size=ring_size,
+                                              shm_threshold=shm_threshold)
+            await impl.setup()  # Attaches to the segment; the server runs in the launched process
+            impl.server_pid = proc.pid
+            yield impl
+            await impl.teardown()
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                proc.kill()
+            remove_shm_resources(name)  # In case the server was killed before cleaning up
+        elif rpc_type == "unix-socket":
+            if not hasattr(socket, "AF_UNIX"):
+                pytest.skip("Unix domain sockets are not supported on this platform")
+            from implementations.transports import ipc_path, remove_socket_file
+            socket_path = ipc_path("rpyc", port)
+            cmd = [sys.executable, "-u", "launch_unix_socket.py", "--socket-path", socket_path]
+            proc = await launch_and_wait(cmd + server_args, "Unix Socket")
+            from implementations.unix_socket_impl import UnixSocketImplementation
+            impl = UnixSocketImplementation(socket_path=socket_path, external_server=True,
+                                            client_mode=request.config.getoption("--rpyc-client-mode"),
+                                            stream_chunk_size=request.config.getoption("--rpyc-stream-chunk-size"),
+                                            stream_prefetch=request.config.getoption("--rpyc-stream-prefetch"),
+                                            pool_size=request.config.getoption("--rpyc-pool-size"),
+                                            pool_strategy=request.config.getoption("--rpyc-pool-strategy"))
+            await impl.setup()  # Connects only; the server runs in the launched process
+            impl.server_pid = proc.pid
             yield impl
+            await impl.teardown()
             proc.terminate()
             try:
                 await asyncio.wait_for(proc.wait(), timeout=5.0)
             except asyncio.TimeoutError:
                 proc.kill()
+            remove_socket_file(socket_path)  # The terminated server cannot clean up after itself
         elif rpc_type == "pyro":
             # Assumes Pyro Name Server is running and accessible
             object_name = f"example.benchmark.{uuid.uuid4().hex}"
             cmd = [sys.executable, "-u", "launch_pyro.py", "--name", object_name]
-            proc = await launch_and_wait(cmd, "Pyro")
+            proc = await launch_and_wait(cmd + server_args, "Pyro")
             from implementations.pyro_impl import PyroImplementation
-            impl = PyroImplementation(external_server=True, object_name=object_name)
+            impl = PyroImplementation(external_server=True, object_name=object_name,
+                                      stream_chunk_size=request.config.getoption("--pyro-stream-chunk-size"),
+                                      stream_prefetch=request.config.getoption("--pyro-stream-prefetch"))
             await impl.setup()  # Connects proxy via NS
+            impl.server_pid = proc.pid
             yield impl
             # Terminate the process - our improved launcher will clean up the name server registration
             proc.terminate()
@@ -151,11 +442,15 @@ async def rpc_implementation(request):
             # Assumes Pyro5 Name Server is running and accessible
             object_name = f"example.benchmark.pyro5.{uuid.uuid4().hex}"
             cmd = [sys.executable, "-u", "launch_pyro5.py", "--name", object_name]
-            proc = await launch_and_wait(cmd, "Pyro5")
+            proc = await launch_and_wait(cmd + server_args, "Pyro5")
             from implementations.pyro5_impl import Pyro5Implementation
-            impl = Pyro5Implementation(external_server=True, object_name=object_name)
+            impl = Pyro5Implementation(external_server=True, object_name=object_name,
+                                       pool_size=request.config.getoption("--pyro5-pool-size"),
+                                       pool_idle_timeout=request.config.getoption("--pyro5-pool-idle-timeout"))
             await impl.setup()  # Connects proxy via NS
+            impl.server_pid = proc.pid
             yield impl
+            await impl.teardown()  # Closes pooled proxies
             # Terminate the process - our improved launcher will clean up the name server registration
             proc.terminate()
             try:
@@ -164,25 +459,41 @@ async def rpc_implementation(request):
                 logging.warning("Pyro5 server did not terminate gracefully, killing it")
                 proc.kill()
         elif rpc_type == "grpc":
-            cmd = [sys.executable, "-u", "launch_grpc.py", "--port", str(port)]
-            proc = await launch_and_wait(cmd, "gRPC")
+            transport = request.config.getoption("--rpc-transport")
+            cmd = [sys.executable, "-u", "launch_grpc.py", "--port", str(port), "--transport", transport]
+            proc = await launch_and_wait(cmd + server_args, "gRPC")
             from implementations.grpc_impl import GRPCImplementation
-            impl = GRPCImplementation(port=port, external_server=True)
+            impl = GRPCImplementation(port=port, external_server=True, transport=transport,
+                                      chunk_size=request.config.getoption("--grpc-chunk-size"),
+                                      stream_batch_size=request.config.getoption("--grpc-stream-batch-size"),
+                                      call_mode=request.config.getoption("--grpc-call-mode"))
             await impl.setup()
+            impl.server_pid = proc.pid
             yield impl
+            await impl.teardown()  # Ends the Pipeline stream and closes the channel
             proc.terminate()
             try:
                 await asyncio.wait_for(proc.wait(), timeout=5.0)
             except asyncio.TimeoutError:
                 proc.kill()
         elif rpc_type == "zmq":
-            cmd = [sys.executable, "-u", "launch_zmq.py", "--port", str(port)]
-            proc = await launch_and_wait(cmd, "ZeroMQ")
+            serializer = request.config.getoption("--zmq-serializer")
+            zero_copy_threshold = request.config.getoption("--zmq-zero-copy-threshold")
+            transport = request.config.getoption("--rpc-transport")
+            stream_port = get_dynamic_port()
+            cmd = [sys.executable, "-u", "launch_zmq.py", "--port", str(port), "--stream-port", str(stream_port),
+                   "--transport", transport, "--serializer", serializer,
+                   "--zero-copy-threshold", str(zero_copy_threshold)]
+            proc = await launch_and_wait(cmd + server_args, "ZeroMQ")
             from implementations.zmq_impl import ZMQImplementation
-            impl = ZMQImplementation(external_server=True)
-            impl.simple_endpoint = f"tcp://127.0.0.1:{port}"
-            await asyncio.sleep(0.1)
+            impl = ZMQImplementation(external_server=True,
+                                     stream_window=request.config.getoption("--zmq-stream-window"),
+                                     serializer=serializer, zero_copy_threshold=zero_copy_threshold,
+                                     transport=transport, port=port, stream_port=stream_port)
+            await impl.setup()  # Connects the client socket; the servers run in the launched process
+            impl.server_pid = proc.pid
             yield impl
+            await impl.teardown()
             proc.terminate()
             try:
                 await asyncio.wait_for(proc.wait(), timeout=5.0)
@@ -191,24 +502,63 @@ async def rpc_implementation(request):
     elif not isolated: # Handle non-isolated cases (excluding pure-python handled above)
         if rpc_type == "rpyc":
             from implementations.rpyc_impl import RPyCImplementation
-            impl = RPyCImplementation()
+            impl = RPyCImplementation(client_mode=request.config.getoption("--rpyc-client-mode"),
+                                      stream_chunk_size=request.config.getoption("--rpyc-stream-chunk-size"),
+                                      stream_prefetch=request.config.getoption("--rpyc-stream-prefetch"),
+                                      pool_size=request.config.getoption("--rpyc-pool-size"),
+                                      pool_strategy=request.config.getoption("--rpyc-pool-strategy"))
         elif rpc_type == "named-pipe":
             if os.name != "nt":
                 pytest.skip("Named pipes are only supported on Windows")
             from named_pipe_impl import NamedPipeImplementation
-            impl = NamedPipeImplementation()
+            impl = NamedPipeImplementation(client_mode=request.config.getoption("--rpyc-client-mode"),
+                                           stream_chunk_size=request.config.getoption("--rpyc-stream-chunk-size"),
+                                           stream_prefetch=request.config.getoption("--rpyc-stream-prefetch"))
+        elif rpc_type == "asyncio":
+            from implementations.asyncio_impl import AsyncioImplementation
+            impl = AsyncioImplementation(serializer=request.config.getoption("--asyncio-serializer"),
+                                         transport=request.config.getoption("--rpc-transport"),
+                                         stream_chunk_size=request.config.getoption("--asyncio-stream-chunk-size"))
+        elif rpc_type == "mp-connection":
+            from implementations.mp_connection_impl import MPConnectionImplementation
+            impl = MPConnectionImplementation(transport=request.config.getoption("--rpc-transport"))
+        elif rpc_type == "shm":
+            if os.name == "nt":
+                pytest.skip("The shared-memory backend needs POSIX named FIFOs")
+            from implementations.shm_impl import SharedMemoryImplementation
+            impl = SharedMemoryImplementation(ring_size=request.config.getoption("--shm-ring-size"),
+                                              shm_threshold=request.config.getoption("--shm-threshold"))
+        elif rpc_type == "unix-socket":
+            if not hasattr(socket, "AF_UNIX"):
+                pytest.skip("Unix domain sockets are not supported on this platform")
+            from implementations.unix_socket_impl import UnixSocketImplementation
+            impl = UnixSocketImplementation(client_mode=request.config.getoption("--rpyc-client-mode"),
+                                            stream_chunk_size=request.config.getoption("--rpyc-stream-chunk-size"),
+                                            stream_prefetch=request.config.getoption("--rpyc-stream-prefetch"),
+                                            pool_size=request.config.getoption("--rpyc-pool-size"),
+                                            pool_strategy=request.config.getoption("--rpyc-pool-strategy"))
         elif rpc_type == "zmq":
             from implementations.zmq_impl import ZMQImplementation
-            impl = ZMQImplementation()
+            impl = ZMQImplementation(stream_window=request.config.getoption("--zmq-stream-window"),
+                                     serializer=request.config.getoption("--zmq-serializer"),
+                                     zero_copy_threshold=request.config.getoption("--zmq-zero-copy-threshold"),
+                                     transport=request.config.getoption("--rpc-transport"))
         elif rpc_type == "grpc":
             from implementations.grpc_impl import GRPCImplementation
-            impl = GRPCImplementation()
+            impl = GRPCImplementation(transport=request.config.getoption("--rpc-transport"),
+                                      chunk_size=request.config.getoption("--grpc-chunk-size"),
+                                      stream_batch_size=request.config.getoption("--grpc-stream-batch-size"),
+                                      call_mode=request.config.getoption("--grpc-call-mode"))
         elif rpc_type == "pyro":
             from implementations.pyro_impl import PyroImplementation
-            impl = PyroImplementation()  # Starts internal Pyro4 daemon
+            impl = PyroImplementation(  # Starts internal Pyro4 daemon
+                stream_chunk_size=request.config.getoption("--pyro-stream-chunk-size"),
+                stream_prefetch=request.config.getoption("--pyro-stream-prefetch"))
         elif rpc_type == "pyro5":
             from implementations.pyro5_impl import Pyro5Implementation
-            impl = Pyro5Implementation() # Starts internal Pyro5 daemon
+            impl = Pyro5Implementation(  # Starts internal Pyro5 daemon
+                pool_size=request.config.getoption("--pyro5-pool-size"),
+                pool_idle_timeout=request.config.getoption("--pyro5-pool-idle-timeout"))
         try:
             logging.info(f"Setting up {rpc_type} implementation in-process")
             await asyncio.wait_for(impl.setup(), timeout=15)
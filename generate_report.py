@@ -18,6 +18,52 @@ def format_time(seconds):
     else:
         return f"{seconds:.4f} s"
 
+# Per-call latency columns written by process_results.py, with their report headers
+LATENCY_HEADERS = [('p50', 'p50'), ('p90', 'p90'), ('p99', 'p99'), ('p99_9', 'p99.9'), ('max_latency', 'Max')]
+
+# Resource usage columns written by process_results.py, with their report headers
+RESOURCE_HEADERS = [(f'{role}_{key}', f'{role.title()} {header}') for role in ('client', 'server')
+                    for key, header in [('cpu_s_per_1k_ops', 'CPU s/1k Ops'), ('peak_rss_kb', 'Peak RSS'),
+                                        ('voluntary_ctx_switches_per_op', 'Vol. Switches/Op'),
+                                        ('involuntary_ctx_switches_per_op', 'Invol. Switches/Op')]]
+
+def format_resource(key, value):
+    """Format a resource usage figure; None (no isolated server) as 'in client'."""
+    if value is None:
+        return "in client"
+    if key.endswith('peak_rss_kb'):
+        return f"{value / 1024:.1f} MB"
+    if key.endswith('cpu_s_per_1k_ops'):
+        return f"{value:.4f}"
+    return f"{value:.3f}"
+
+# Retained allocation and peak columns written by process_results.py with --rpc-alloc-profile, with their report headers
+ALLOC_HEADERS = [(f'{role}_{key}', f'{role.title()} {header}') for role in ('client', 'server')
+                 for key, header in [('retained_bytes_per_op', 'Retained Bytes/Op'),
+                                     ('retained_blocks_per_op', 'Retained Blocks/Op'), ('alloc_peak_bytes', 'Alloc Peak')]]
+
+def format_allocation(key, value):
+    """Format an allocation figure; None (no isolated server) as 'in client'."""
+    if value is None:
+        return "in client"
+    if key.endswith('alloc_peak_bytes'):
+        return f"{value / 1024:.1f} KB"
+    return f"{value:.2f}"
+
+def scaling_title(curve):
+    """Test name and its other parameters, e.g. 'test_benchmark_pool_scaling (pool_size=4)'."""
+    if not curve['params']:
+        return curve['test']
+    params = ", ".join(f"{name}={value}" for name, value in curve['params'].items())
+    return f"{curve['test']} ({params})"
+
+def group_scaling_curves(curves):
+    """Scaling curves grouped by scaling_title(), one curve per implementation in each group."""
+    groups = {}
+    for curve in curves:
+        groups.setdefault(scaling_title(curve), []).append(curve)
+    return groups
+
 def generate_summary_report(results, output_file):
     """Generate a summary report in plain text format."""
     with open(output_file, 'w') as f:
@@ -80,12 +126,127 @@ def generate_summary_report(results, output_file):
             f.write(tabulate(table_data, headers=headers, tablefmt="grid"))
             f.write("\n\n")
         
+        # Write per-call latency percentiles for the tests that recorded them
+        latency_tests = {test: {impl: data['latency'] for impl, data in impls.items() if 'latency' in data}
+                         for test, impls in results['comparisons'].items()}
+        latency_tests = {test: impls for test, impls in latency_tests.items() if impls}
+        if latency_tests:
+            f.write("PER-CALL LATENCY PERCENTILES\n")
+            f.write("----------------------------\n\n")
+            for test, impls in latency_tests.items():
+                f.write(f"Test: {test}\n")
+                f.write(f"{'-' * (len(test) + 6)}\n\n")
+
+                # Lowest p99 first
+                sorted_impls = sorted(impls.items(), key=lambda x: x[1]['p99'])
+                table_data = [[impl] + [format_time(latency[key]) for key, _ in LATENCY_HEADERS]
+                              for impl, latency in sorted_impls]
+                headers = ["Implementation"] + [header for _, header in LATENCY_HEADERS]
+                f.write(tabulate(table_data, headers=headers, tablefmt="grid"))
+                f.write("\n\n")
+
+        # Write client and server resource usage for the tests that sampled it
+        resource_tests = {test: {impl: data['resources'] for impl, data in impls.items() if 'resources' in data}
+                          for test, impls in results['comparisons'].items()}
+        resource_tests = {test: impls for test, impls in resource_tests.items() if impls}
+        if resource_tests:
+            f.write("RESOURCE USAGE\n")
+            f.write("--------------\n\n")
+            for test, impls in resource_tests.items():
+                f.write(f"Test: {test}\n")
+                f.write(f"{'-' * (len(test) + 6)}\n\n")
+
+                # Least client and server CPU per operation first
+                sorted_impls = sorted(impls.items(), key=lambda x: (x[1]['client_cpu_s_per_1k_ops']
+                                                                    + (x[1]['server_cpu_s_per_1k_ops'] or 0)))
+                table_data = [[impl] + [format_resource(key, resources[key]) for key, _ in RESOURCE_HEADERS]
+                              for impl, resources in sorted_impls]
+                headers = ["Implementation"] + [header for _, header in RESOURCE_HEADERS]
+                f.write(tabulate(table_data, headers=headers, tablefmt="grid"))
+                f.write("\n\n")
+
+        # Write retained allocations per operation and the top retaining sites (--rpc-alloc-profile)
+        alloc_tests = {test: {impl: data['allocations'] for impl, data in impls.items() if 'allocations' in data}
+                       for test, impls in results['comparisons'].items()}
+        alloc_tests = {test: impls for test, impls in alloc_tests.items() if impls}
+        if alloc_tests:
+            f.write("RETAINED ALLOCATIONS PER OPERATION\n")
+            f.write("----------------------------------\n\n")
+            for test, impls in alloc_tests.items():
+                f.write(f"Test: {test}\n")
+                f.write(f"{'-' * (len(test) + 6)}\n\n")
+
+                # Fewest client and server retained bytes per operation first
+                sorted_impls = sorted(impls.items(), key=lambda x: (x[1]['client_retained_bytes_per_op']
+                                                                    + (x[1]['server_retained_bytes_per_op'] or 0)))
+                table_data = [[impl] + [format_allocation(key, allocations[key]) for key, _ in ALLOC_HEADERS]
+                              for impl, allocations in sorted_impls]
+                headers = ["Implementation"] + [header for _, header in ALLOC_HEADERS]
+                f.write(tabulate(table_data, headers=headers, tablefmt="grid"))
+                f.write("\n\n")
+        retained_sites = results.get('retained_sites', {})
+        if retained_sites:
+            f.write("TOP RETAINING SITES\n")
+            f.write("-------------------\n\n")
+            for impl, roles in sorted(retained_sites.items()):
+                f.write(f"Implementation: {impl}\n")
+                f.write(f"{'-' * (len(impl) + 16)}\n\n")
+                table_data = [[role, site['site'], site['bytes'], site['blocks'], site['tests']]
+                              for role, sites in roles.items() for site in sites]
+                headers = ["Process", "Site", "Bytes", "Blocks", "Tests"]
+                f.write(tabulate(table_data, headers=headers, tablefmt="grid"))
+                f.write("\n\n")
+
+        # Write concurrency scaling fits
+        curves = [curve for curve in results.get('scaling', []) if curve['fit']]
+        if curves:
+            f.write("CONCURRENCY SCALING\n")
+            f.write("-------------------\n\n")
+            for title, group in group_scaling_curves(curves).items():
+                f.write(f"Test: {title}\n")
+                f.write(f"{'-' * (len(title) + 6)}\n\n")
+                table_data = []
+                # Highest peak throughput first
+                for curve in sorted(group, key=lambda c: -max(c['throughput'])):
+                    fit = curve['fit']
+                    table_data.append([
+                        curve['implementation'],
+                        f"{max(curve['throughput']):.2f}",
+                        f"{fit['lambda']:.2f}",
+                        f"{fit['sigma']:.4f}",
+                        f"{fit['kappa']:.6f}",
+                        f"{fit['peak_concurrency']:.1f}" if fit['peak_concurrency'] else "none",
+                        fit['knee_concurrency'] if fit['knee_concurrency'] else "none",
+                        fit['saturation_concurrency'],
+                        f"{fit['r_squared']:.3f}",
+                    ])
+                headers = ["Implementation", "Best Ops/Second", "Fitted Ops/Second at 1", "Contention",
+                           "Coherency", "USL Peak", "Knee", "Saturation", "R²"]
+                f.write(tabulate(table_data, headers=headers, tablefmt="grid"))
+                f.write("\n\n")
+
         # Write explanation of metrics
         f.write("EXPLANATION OF METRICS\n")
         f.write("---------------------\n")
-        f.write("Mean Time: Average execution time per operation\n")
+        f.write("Mean Time: Average execution time per operation (batch time divided by the operations in it)\n")
         f.write("Relative Speed: How many times slower than the fastest implementation (1.00x is fastest)\n")
         f.write("Ops/Second: Operations per second (higher is better)\n")
+        f.write("p50/p90/p99/p99.9: Latency of a single call that 50/90/99/99.9% of the calls did not exceed\n")
+        f.write("Max: Slowest single call\n")
+        if resource_tests:
+            f.write("CPU s/1k Ops: CPU seconds (user + system) the process used per 1000 operations\n")
+            f.write("Peak RSS: Highest resident memory sampled while the test ran\n")
+            f.write("Vol./Invol. Switches/Op: Context switches per operation from blocking / from preemption\n")
+            f.write("Server figures are 'in client' when the server ran in the benchmark process (no --rpc-isolated)\n")
+        if alloc_tests:
+            f.write("Retained Bytes/Op, Blocks/Op: Net growth of memory traced by tracemalloc over the test (allocated and still held at its end), per operation; not allocation churn\n")
+            f.write("Alloc Peak: Highest traced memory above the start of the test, which is where short-lived allocations (churn) show\n")
+            f.write("Top retaining sites: Lines holding the most of the retained memory, added up over an implementation's tests\n")
+        if curves:
+            f.write("Contention, Coherency: sigma and kappa of the Universal Scalability Law fitted to ops/second against concurrency\n")
+            f.write("USL Peak: Concurrency at which the fitted throughput is highest (none if it never falls)\n")
+            f.write("Knee: Lowest concurrency at which the fitted throughput reaches 80% of its ceiling (the USL peak, or lambda/sigma without one)\n")
+            f.write("Saturation: Lowest measured concurrency reaching 90% of the best measured throughput\n")
 
 def generate_csv_report(results, output_file):
     """Generate a CSV report for easy import into spreadsheets."""
@@ -102,6 +263,15 @@ def generate_csv_report(results, output_file):
                 'Operations/Second': data['ops_per_sec'],
                 'Is Fastest': data['is_fastest']
             }
+            latency = data.get('latency', {})
+            for key, header in LATENCY_HEADERS:
+                row[f'{header} Latency (s)'] = latency.get(key)
+            resources = data.get('resources', {})
+            for key, header in RESOURCE_HEADERS:
+                row[header] = resources.get(key)
+            allocations = data.get('allocations', {})
+            for key, header in ALLOC_HEADERS:
+                row[header] = allocations.get(key)
             rows.append(row)
     
     df = pd.DataFrame(rows)
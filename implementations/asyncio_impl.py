@@ -0,0 +1,320 @@
+"""
+Raw asyncio RPC backend: the cheapest cross-process round trip in Python.
+
+No framework sits between the benchmark and the socket. Client and server talk
+over one asyncio stream per client (TCP or a Unix domain socket) using
+length-prefixed messages:
+
+    <I body length> <Q request id> <B kind> <B frame count> body
+
+where the body holds the serializer's frames, each prefixed with its <I length.
+Large str and bytes values, and every echo_bytes() payload, follow the
+serializer's frames as raw frames, so they are neither encoded nor copied
+into the serialized message.
+Request IDs let many calls share the connection; a single reader task resolves
+replies in whatever order they arrive. Streams are pushed by the server as
+CHUNK messages of up to stream_chunk_size values followed by END; the server
+keeps at most the credited number of chunks in flight and the client returns
+a CREDIT for every chunk it consumes.
+"""
+import asyncio
+import itertools
+import logging
+import struct
+from typing import AsyncIterator
+
+from interface import RPCImplementation
+from implementations.operations import double
+from implementations.serializers import byte_view, get_serializer, join_payloads, split_payloads
+from implementations.transports import check_transport, ipc_path, remove_socket_file
+
+logger = logging.getLogger(__name__)
+
+# Message header: body length, request id, message kind, number of frames
+_HEADER = struct.Struct("<IQBB")
+_FRAME_LENGTH = struct.Struct("<I")
+
+# Message kinds
+CALL, CALL_MANY, STREAM, CREDIT, CANCEL, RESULT, CHUNK, END, ERROR, ECHO = range(10)
+
+# Message key of echo_bytes() payloads, in both the ECHO request and its RESULT
+BYTES_KEY = "data"
+
+# Values at least this large travel as raw frames after the serializer's frames
+RAW_PAYLOAD_THRESHOLD = 64 * 1024
+
+
+def write_message(writer, serializer, request_id, kind, msg):
+    """Encode msg and queue it on writer as a single length-prefixed message."""
+    header, raw_frames = split_payloads(msg, RAW_PAYLOAD_THRESHOLD, raw_keys=(BYTES_KEY,))
+    frames = serializer.dumps(header) + raw_frames
+    parts = [None]
+    body_length = 0
+    for frame in frames:
+        size = memoryview(frame).nbytes
+        parts.append(_FRAME_LENGTH.pack(size))
+        parts.append(frame)
+        body_length += _FRAME_LENGTH.size + size
+    parts[0] = _HEADER.pack(body_length, request_id, kind, len(frames))
+    # One writelines() call per message, so concurrent writers never interleave
+    writer.writelines(parts)
+
+
+async def read_message(reader, serializer):
+    """Read one message; returns (request id, kind, msg) or raises IncompleteReadError at EOF."""
+    body_length, request_id, kind, frame_count = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    body = memoryview(await reader.readexactly(body_length))
+    frames = []
+    offset = 0
+    for _ in range(frame_count):
+        (size,) = _FRAME_LENGTH.unpack_from(body, offset)
+        offset += _FRAME_LENGTH.size
+        frames.append(body[offset:offset + size])
+        offset += size
+    return request_id, kind, join_payloads(serializer.loads(frames), frames)
+
+
+class AsyncioServer:
+    """Serves simple calls and chunked streams to any number of connections."""
+
+    def __init__(self, serializer="binary", transport="tcp", port=5557):
+        check_transport(transport)
+        self.serializer = get_serializer(serializer)
+        self.transport = transport
+        self.port = port
+        self.socket_path = ipc_path("asyncio", port) if transport == "ipc" else None
+        self.server = None
+
+    async def start(self):
+        if self.socket_path:
+            remove_socket_file(self.socket_path)
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, "127.0.0.1", self.port)
+        logger.info("Asyncio RPC server listening on %s", self.socket_path or f"127.0.0.1:{self.port}")
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.socket_path:
+            remove_socket_file(self.socket_path)
+
+    async def _handle_connection(self, reader, writer):
+        streams = {}  # request id -> (task pushing that stream, its chunk credits)
+
+        def send(request_id, kind, msg):
+            write_message(writer, self.serializer, request_id, kind, msg)
+
+        try:
+            while True:
+                try:
+                    request_id, kind, msg = await read_message(reader, self.serializer)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                self._handle_message(request_id, kind, msg, streams, send, writer.drain)
+                # Replies are buffered by write(); only wait when the peer is not keeping up
+                await writer.drain()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._cancel_streams(streams)
+            writer.close()
+
+    def _handle_message(self, request_id, kind, msg, streams, send, flush):
+        """
+        Answer one request through send(request_id, kind, msg). Streams run as
+        tasks in streams that await flush() whenever the client falls behind.
+        """
+        try:
+            if kind == CALL:
+                send(request_id, RESULT, {"result": double(msg["value"])})
+            elif kind == CALL_MANY:
+                send(request_id, RESULT, {"results": [double(value) for value in msg["values"]]})
+            elif kind == ECHO:
+                send(request_id, RESULT, {BYTES_KEY: msg[BYTES_KEY]})
+            elif kind == STREAM:
+                credits = asyncio.Semaphore(msg["credits"])
+                task = asyncio.create_task(self._push_stream(
+                    request_id, msg["count"], msg["chunk_size"], credits, send, flush))
+                streams[request_id] = (task, credits)
+                task.add_done_callback(lambda _, request_id=request_id: streams.pop(request_id, None))
+            elif kind == CREDIT:
+                if request_id in streams:
+                    streams[request_id][1].release()
+            elif kind == CANCEL:
+                if request_id in streams:
+                    streams.pop(request_id)[0].cancel()
+            else:
+                send(request_id, ERROR, {"error": f"Unknown message kind {kind}"})
+        except Exception as e:
+            send(request_id, ERROR, {"error": str(e)})
+
+    @staticmethod
+    def _cancel_streams(streams):
+        for task, _ in list(streams.values()):
+            task.cancel()
+
+    async def _push_stream(self, request_id, count, chunk_size, credits, send, flush):
+        """Send range(count) as CHUNK messages, each one paid for with a credit."""
+        chunk_size = max(1, chunk_size)
+        try:
+            for start in range(0, count, chunk_size):
+                await credits.acquire()
+                send(request_id, CHUNK, {"values": list(range(start, min(start + chunk_size, count)))})
+                await flush()
+            send(request_id, END, {})
+        except ConnectionError:
+            pass
+
+
+class AsyncioImplementation(RPCImplementation):
+    def __init__(self, external_server=False, serializer="binary", transport="tcp", port=5557,
+                 stream_chunk_size=100, stream_credits=8):
+        """
+        serializer: message encoding ("binary", "json" or "pickle"); must match the server's.
+        transport: "tcp" for loopback TCP or "ipc" for a Unix domain socket named after port.
+        stream_chunk_size: values per CHUNK message when streaming.
+        stream_credits: chunks the server may send ahead of the consumer.
+        """
+        check_transport(transport)
+        self.external_server = external_server
+        self.serializer = get_serializer(serializer)
+        self.transport = transport
+        self.port = port
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_credits = max(1, stream_credits)
+        self.server = None if external_server else AsyncioServer(serializer, transport, port)
+        self.reader = None
+        self.writer = None
+        self.receiver_task = None
+        # request id -> future (calls) or queue (streams)
+        self._pending = {}
+        self._request_ids = itertools.count(1)
+
+    async def setup(self):
+        if self.server:
+            await self.server.start()
+        if self.transport == "ipc":
+            self.reader, self.writer = await asyncio.open_unix_connection(ipc_path("asyncio", self.port))
+        else:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.receiver_task = asyncio.create_task(self._receive())
+
+    async def teardown(self):
+        if self.receiver_task:
+            self.receiver_task.cancel()
+            try:
+                await self.receiver_task
+            except asyncio.CancelledError:
+                pass
+            self.receiver_task = None
+        self._fail_pending(RuntimeError("Asyncio RPC client shut down"))
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.writer = None
+        if self.server:
+            await self.server.close()
+
+    def _send(self, request_id, kind, msg):
+        """Queue a message for the server; _flush() waits until the transport takes it."""
+        write_message(self.writer, self.serializer, request_id, kind, msg)
+
+    async def _flush(self):
+        await self.writer.drain()
+
+    def _connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def _receive(self):
+        try:
+            while True:
+                self._dispatch(*await read_message(self.reader, self.serializer))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            logger.error("Asyncio RPC connection lost: %s", e)
+            self._fail_pending(RuntimeError("Asyncio RPC connection lost"))
+
+    def _dispatch(self, request_id, kind, msg):
+        """Hand an incoming message to the call or stream waiting on its request id."""
+        waiter = self._pending.get(request_id)
+        if waiter is None:
+            # Late reply for a call that timed out, or chunks of a cancelled stream
+            return
+        if isinstance(waiter, asyncio.Queue):
+            waiter.put_nowait((kind, msg))
+            return
+        del self._pending[request_id]
+        if waiter.done():
+            return
+        if kind == ERROR:
+            waiter.set_exception(RuntimeError(f"Error from server: {msg['error']}"))
+        else:
+            waiter.set_result(msg)
+
+    def _fail_pending(self, error):
+        for waiter in self._pending.values():
+            if isinstance(waiter, asyncio.Queue):
+                waiter.put_nowait((ERROR, {"error": str(error)}))
+            elif not waiter.done():
+                waiter.set_exception(error)
+        self._pending.clear()
+
+    async def _call(self, kind, request, timeout):
+        """Send a request under a fresh request id and wait for its reply."""
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._send(request_id, kind, request)
+            await self._flush()
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Timeout waiting for response after {timeout} seconds")
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def simple_call(self, value) -> object:
+        reply = await self._call(CALL, {"value": value}, timeout=10.0)
+        return reply["result"]
+
+    async def simple_call_many(self, values) -> list:
+        """Send all values in a single message and receive all results in one reply."""
+        reply = await self._call(CALL_MANY, {"values": list(values)}, timeout=60.0)
+        return reply["results"]
+
+    async def echo_bytes(self, buf) -> bytes:
+        reply = await self._call(ECHO, {BYTES_KEY: byte_view(buf)}, timeout=60.0)
+        return reply[BYTES_KEY]
+
+    async def stream_values(self, count: int) -> AsyncIterator[int]:
+        request_id = next(self._request_ids)
+        # Never holds more than stream_credits chunks, so the shared reader never blocks on it
+        queue = asyncio.Queue()
+        self._pending[request_id] = queue
+        finished = False
+        try:
+            self._send(request_id, STREAM, {"count": count, "chunk_size": self.stream_chunk_size,
+                                            "credits": self.stream_credits})
+            await self._flush()
+            while True:
+                kind, msg = await asyncio.wait_for(queue.get(), timeout=15.0)
+                if kind == END:
+                    finished = True
+                    return
+                if kind == ERROR:
+                    finished = True
+                    raise RuntimeError(f"Error from server: {msg['error']}")
+                # Credit the chunk before handing it out, so the next one is already on its way
+                self._send(request_id, CREDIT, {})
+                for value in msg["values"]:
+                    yield value
+        finally:
+            self._pending.pop(request_id, None)
+            if not finished and self._connected():
+                # Stop the server pushing the rest of an abandoned stream
+                self._send(request_id, CANCEL, {})
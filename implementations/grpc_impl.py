@@ -1,4 +1,5 @@
 import asyncio
+import itertools
 import logging
 import time
 
@@ -24,60 +25,152 @@ except ImportError as e:
     logging.error("gRPC stubs not found. Please run build_protos.py to generate them.")
     raise e
 from interface import RPCImplementation
+from implementations.operations import double
+from implementations.serializers import byte_view
+from implementations.transports import check_transport, ipc_path
+
+# Values per StreamBatch when the client leaves the batch size to the server
+DEFAULT_STREAM_BATCH_SIZE = 1000
+
+# simple_call modes: one unary RPC per call, or calls multiplexed over one Pipeline stream
+CALL_MODES = ("unary", "pipelined")
+
+def _double(request):
+    """Build the SimpleResponse for a SimpleRequest (value multiplied by 2)."""
+    payload = request.WhichOneof("payload")
+    if payload == "int_value":
+        return rpc_pb2.SimpleResponse(int_value=double(request.int_value))
+    if payload == "bytes_value":
+        return rpc_pb2.SimpleResponse(bytes_value=double(request.bytes_value))
+    result = double(request.str_value)
+    if isinstance(result, int):  # An offload handle, answered with the result size
+        return rpc_pb2.SimpleResponse(int_value=result)
+    return rpc_pb2.SimpleResponse(str_value=result)
+
+def _to_request(value):
+    if isinstance(value, int):
+        return rpc_pb2.SimpleRequest(int_value=value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return rpc_pb2.SimpleRequest(bytes_value=bytes(value))
+    return rpc_pb2.SimpleRequest(str_value=value)
+
+def _from_response(response):
+    return getattr(response, response.WhichOneof("payload"))
 
 class GRPCServiceServicer(rpc_pb2_grpc.RPCServiceServicer):
     async def SimpleCall(self, request, context):
-        if request.WhichOneof("payload") == "int_value":
-            # logging.debug("GRPC SimpleCall received int request: %d", request.int_value)
-            result = request.int_value * 2
-            response = rpc_pb2.SimpleResponse(int_value=result)
-        else:
-            # logging.debug("GRPC SimpleCall received string request of length: %d", len(request.str_value))
-            result = request.str_value * 2
-            response = rpc_pb2.SimpleResponse(str_value=result)
-        
+        # logging.debug("GRPC SimpleCall received request with payload: %s", request.WhichOneof("payload"))
+        response = _double(request)
         # logging.debug("GRPC SimpleCall sending response")
         return response
 
+    async def SimpleCallMany(self, request, context):
+        return rpc_pb2.SimpleBatchResponse(responses=[_double(item) for item in request.requests])
+
+    async def Pipeline(self, request_iterator, context):
+        async for item in request_iterator:
+            yield rpc_pb2.PipelinedResponse(id=item.id, response=_double(item.request))
+
     async def StreamValues(self, request, context):
         # logging.debug("GRPC StreamValues received request with count: %d", request.count)
         for i in range(request.count):
             yield rpc_pb2.StreamResponse(value=i)
         # logging.debug("GRPC StreamValues finished sending responses")
 
+    async def StreamValuesBatched(self, request, context):
+        batch_size = request.batch_size or DEFAULT_STREAM_BATCH_SIZE
+        for start in range(0, request.count, batch_size):
+            yield rpc_pb2.StreamBatch(values=range(start, min(start + batch_size, request.count)))
+
+    async def Upload(self, request_iterator, context):
+        size = 0
+        async for chunk in request_iterator:
+            size += len(chunk.data)
+        return rpc_pb2.UploadResponse(size=size)
+
+    async def Echo(self, request_iterator, context):
+        # Chunks go straight back as they arrive; only a repeated payload is kept
+        # until the client has sent all of it
+        received = []
+        repeat = None
+        async for chunk in request_iterator:
+            if repeat is None:
+                repeat = max(1, chunk.repeat)
+            if repeat > 1:
+                received.append(chunk)
+            yield chunk
+        for _ in range((repeat or 1) - 1):
+            for chunk in received:
+                yield chunk
+
+    async def EchoBytes(self, request, context):
+        return request
+
 class GRPCImplementation(RPCImplementation):
-    def __init__(self, port=50051, external_server=False):
+    # Channel send/receive limit; larger single messages are rejected by gRPC
+    channel_message_limit = 50 * 1024 * 1024
+
+    def __init__(self, port=50051, external_server=False, transport="tcp",
+                 chunk_size=1024 * 1024, chunk_threshold=8 * 1024 * 1024, stream_batch_size=0,
+                 call_mode="unary"):
+        """
+        call_mode: "unary" makes each simple_call its own SimpleCall RPC;
+            "pipelined" sends them all over one long-lived bidirectional
+            Pipeline stream, matching replies to calls by request ID.
+        chunk_threshold: str/bytes payloads longer than this are sent through the
+            streaming Echo RPC in chunk_size pieces instead of one SimpleCall
+            message, so payload size is not bounded by channel_message_limit.
+        stream_batch_size: values per message for stream_values over the
+            StreamValuesBatched RPC; 0 streams one StreamResponse per value.
+        """
+        check_transport(transport)
         self.port = port
         self.external_server = external_server
-        logging.info(f"GRPCImplementation.__init__ called with port {port}, external_server={external_server}")
+        self.transport = transport
+        self.chunk_size = chunk_size
+        self.chunk_threshold = chunk_threshold
+        self.stream_batch_size = stream_batch_size
+        if call_mode not in CALL_MODES:
+            raise ValueError(f"Unknown call mode: {call_mode}. Choose from {', '.join(CALL_MODES)}")
+        self.call_mode = call_mode
+        # Over ipc the port number only names the socket file
+        self.address = f"unix:{ipc_path('grpc', port)}" if transport == "ipc" else f"127.0.0.1:{port}"
+        logging.info(f"GRPCImplementation.__init__ called with address {self.address}, external_server={external_server}")
         self.server = None
         self.channel = None
         self.stub = None
         self._loop = None  # Store the event loop
 
+        # Pipelined mode: the stream is opened on first use; requests are fed from
+        # a queue and a dispatcher task resolves the future waiting on each reply
+        self._pipeline_queue = None
+        self._pipeline_task = None
+        self._pending_calls = {}  # request ID -> future
+        self._call_ids = itertools.count()
+
     async def setup(self):
         # Store the current event loop
         self._loop = asyncio.get_running_loop()
         logging.info(f"Entering GRPCImplementation.setup(), external_server={self.external_server}")
+        options = [
+            ('grpc.max_send_message_length', self.channel_message_limit),
+            ('grpc.max_receive_message_length', self.channel_message_limit),
+        ]
         if not self.external_server:
-            self.server = grpc.aio.server()
+            self.server = grpc.aio.server(options=options)
             rpc_pb2_grpc.add_RPCServiceServicer_to_server(GRPCServiceServicer(), self.server)
-            self.server.add_insecure_port(f"127.0.0.1:{self.port}")
+            self.server.add_insecure_port(self.address)
             await self.server.start()
-            logging.info(f"gRPC server started on port {self.port}")
+            logging.info(f"gRPC server started on {self.address}")
         await asyncio.sleep(0.5)
         logging.debug("GRPCImplementation.setup: current event loop id: %s", id(asyncio.get_running_loop()))
-        options = [
-            ('grpc.max_send_message_length', 50 * 1024 * 1024),
-            ('grpc.max_receive_message_length', 50 * 1024 * 1024),
-        ]
         
         # Log before creating channel
-        logging.info(f"Creating gRPC channel to 127.0.0.1:{self.port}")
+        logging.info(f"Creating gRPC channel to {self.address}")
         
         # Create the channel with the current event loop context
         self.channel = grpc.aio.insecure_channel(
-            f"127.0.0.1:{self.port}", 
+            self.address,
             options=options
         )
         
@@ -85,7 +178,7 @@ class GRPCImplementation(RPCImplementation):
         logging.info(f"Channel created: {self.channel}")
         self.stub = rpc_pb2_grpc.RPCServiceStub(self.channel)
         
-        logging.info("Attempting to connect to gRPC server at 127.0.0.1:%d", self.port)
+        logging.info("Attempting to connect to gRPC server at %s", self.address)
         try:
             logging.info("Channel connectivity state before waiting: %s", self.channel.get_state())
             logging.info("Waiting for gRPC channel to be ready with timeout=5")
@@ -96,6 +189,12 @@ class GRPCImplementation(RPCImplementation):
             raise
 
     async def teardown(self):
+        if self._pipeline_task:
+            self._pipeline_queue.put_nowait(None)  # Half-close the stream
+            try:
+                await asyncio.wait_for(asyncio.shield(self._pipeline_task), timeout=5)
+            except asyncio.TimeoutError:
+                self._pipeline_task.cancel()
         if self.channel:
             await self.channel.close()
         if self.server and not self.external_server:
@@ -106,47 +205,120 @@ class GRPCImplementation(RPCImplementation):
                 pass
 
     async def simple_call(self, value) -> object:
+        if isinstance(value, (str, bytes)) and len(value) > self.chunk_threshold:
+            # Too large for a single message: double it through the chunked Echo stream
+            data = await self.echo(value.encode("utf-8") if isinstance(value, str) else value, repeat=2)
+            return data.decode("utf-8") if isinstance(value, str) else data
+        if self.call_mode == "pipelined":
+            return await self._pipelined_call(value)
+        if not self.stub:
+            logging.error("gRPC stub is not initialized!")
+            raise ConnectionError("gRPC stub not available")
+        request = _to_request(value)
+        # Per-call logging stays at debug level so it does not weigh on the timings
+        logging.debug("GRPC simple_call sending %s request", request.WhichOneof("payload"))
         try:
-            logging.debug(f"Entering simple_call with value type: {type(value)}")
-            
-            if isinstance(value, int):
-                request = rpc_pb2.SimpleRequest(int_value=value)
-                logging.info(f"GRPC simple_call sending int request: {value}")
-            else:
-                request = rpc_pb2.SimpleRequest(str_value=value)
-                logging.info(f"GRPC simple_call sending string request of length: {len(value)}")
-            
-            try:
-                # Log before making the RPC call
-                logging.info("About to make gRPC SimpleCall")
-                
-                # Ensure the stub is available
-                if not self.stub:
-                    logging.error("gRPC stub is not initialized!")
-                    raise ConnectionError("gRPC stub not available")
-                    
-                # Use the stub with explicit timeout
-                start_time = time.time()
-                response = await self.stub.SimpleCall(request, wait_for_ready=True, timeout=15.0)
-                elapsed = time.time() - start_time
-                
-                # Log after the RPC call
-                logging.info(f"gRPC SimpleCall completed in {elapsed:.3f} seconds")
-                
-                if response.WhichOneof("payload") == "int_value":
-                    logging.info("GRPC simple_call received int response: %d", response.int_value)
-                    return response.int_value
-                else:
-                    logging.info("GRPC simple_call received string response of length: %d", len(response.str_value))
-                    return response.str_value
-            except grpc.aio.AioRpcError as e:
-                logging.error(f"GRPC simple_call: RPC error: {e.code()}: {e.details()}")
-                return None
-        except Exception as e:
-            logging.error(f"GRPC simple_call: unexpected error: {e}")
-            return None
+            response = await self.stub.SimpleCall(request, wait_for_ready=True, timeout=15.0)
+        except grpc.aio.AioRpcError as e:
+            # Fail like a pipelined call: a timeout, or a ConnectionError
+            logging.error(f"GRPC simple_call: RPC error: {e.code()}: {e.details()}")
+            if e.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+                raise asyncio.TimeoutError("gRPC SimpleCall timed out") from e
+            raise ConnectionError(f"gRPC SimpleCall failed: {e.code()}") from e
+        logging.debug("GRPC simple_call received %s response", response.WhichOneof("payload"))
+        return _from_response(response)
+
+    async def simple_call_many(self, values) -> list:
+        if not self.stub:
+            logging.error("gRPC stub is not initialized!")
+            raise ConnectionError("gRPC stub not available")
+        request = rpc_pb2.SimpleBatchRequest(requests=[_to_request(value) for value in values])
+        logging.info(f"GRPC simple_call_many sending batch of {len(request.requests)} requests")
+        response = await self.stub.SimpleCallMany(request, wait_for_ready=True, timeout=60.0)
+        return [_from_response(item) for item in response.responses]
+
+    async def _pipelined_call(self, value):
+        """Send one call over the shared Pipeline stream and wait for the reply with its ID."""
+        if self._pipeline_task is None:
+            self._open_pipeline()
+        call_id = next(self._call_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_calls[call_id] = future
+        self._pipeline_queue.put_nowait(rpc_pb2.PipelinedRequest(id=call_id, request=_to_request(value)))
+        try:
+            return await asyncio.wait_for(future, timeout=15.0)
+        finally:
+            self._pending_calls.pop(call_id, None)
+
+    def _open_pipeline(self):
+        if not self.stub:
+            logging.error("gRPC stub is not initialized!")
+            raise ConnectionError("gRPC stub not available")
+        self._pipeline_queue = asyncio.Queue()
+
+        async def requests():
+            while (request := await self._pipeline_queue.get()) is not None:
+                yield request
+
+        call = self.stub.Pipeline(requests(), wait_for_ready=True)
+        self._pipeline_task = asyncio.create_task(self._dispatch_pipeline(call))
+        logging.info("GRPC opened pipelined call stream")
+
+    async def _dispatch_pipeline(self, call):
+        """Resolve pending calls from the Pipeline replies until the stream ends."""
+        error = ConnectionError("gRPC pipeline stream closed")
+        try:
+            async for reply in call:
+                future = self._pending_calls.pop(reply.id, None)
+                if future is not None and not future.done():
+                    future.set_result(_from_response(reply.response))
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        except grpc.aio.AioRpcError as e:
+            logging.error(f"GRPC pipeline stream failed: {e.code()}: {e.details()}")
+            error = ConnectionError(f"gRPC pipeline stream failed: {e.code()}")
+        finally:
+            # The next pipelined call opens a fresh stream
+            self._pipeline_task = None
+            for future in self._pending_calls.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending_calls.clear()
+
+    def _chunks(self, data, repeat=0):
+        """Split data into PayloadChunk messages of at most chunk_size bytes."""
+        view = memoryview(data)
+        # An empty payload still sends one chunk so the server sees the repeat count
+        for offset in range(0, max(len(view), 1), self.chunk_size):
+            yield rpc_pb2.PayloadChunk(data=bytes(view[offset:offset + self.chunk_size]),
+                                       repeat=repeat if offset == 0 else 0)
+
+    async def upload(self, data) -> int:
+        """Send data to the server in chunks over the client-streaming Upload RPC; returns the size received."""
+        response = await self.stub.Upload(self._chunks(data), wait_for_ready=True, timeout=300.0)
+        return response.size
+
+    async def echo(self, data, repeat=1) -> bytes:
+        """Send data in chunks over the bidirectional Echo RPC and return what comes back (repeat times)."""
+        call = self.stub.Echo(self._chunks(data, repeat), wait_for_ready=True, timeout=300.0)
+        return b"".join([chunk.data async for chunk in call])
+
+    async def echo_bytes(self, buf) -> bytes:
+        view = byte_view(buf)
+        if view.nbytes > self.chunk_threshold:
+            return await self.echo(view)
+        # protobuf bytes fields take only bytes, so other buffers are copied once here
+        request = rpc_pb2.BytesPayload(data=buf if type(buf) is bytes else view.tobytes())
+        response = await self.stub.EchoBytes(request, wait_for_ready=True, timeout=60.0)
+        return response.data
 
     async def stream_values(self, count: int):
+        if self.stream_batch_size > 0:
+            async for value in self._stream_values_batched(count):
+                yield value
+            return
+
         request = rpc_pb2.StreamRequest(count=count)
         logging.info(f"GRPC stream_values sending request: {request}")
         
@@ -178,3 +350,14 @@ class GRPCImplementation(RPCImplementation):
             logging.error(f"GRPC stream_values error: {e}")
             # Re-raise to let the caller handle it
             raise
+
+    async def _stream_values_batched(self, count: int):
+        """Stream values in packed StreamBatch messages of stream_batch_size values."""
+        if not self.stub:
+            logging.error("gRPC stub is not initialized!")
+            raise ConnectionError("gRPC stub not available")
+        request = rpc_pb2.StreamRequest(count=count, batch_size=self.stream_batch_size)
+        logging.info(f"GRPC stream_values sending batched request: count={count}, batch_size={self.stream_batch_size}")
+        async for batch in self.stub.StreamValuesBatched(request, wait_for_ready=True, timeout=60.0):
+            for value in batch.values:
+                yield value
@@ -0,0 +1,265 @@
+"""
+Standard-library RPC backend on multiprocessing.connection.
+
+Listener/Client connections carry the asyncio backend's protocol (request ids,
+calls, batches and credit-based chunked streams), one send_bytes() frame at a
+time. Frame 0 holds the message header and its pickle (protocol 5); large
+bytes values follow as pickle out-of-band buffers and large strings as raw
+frames, so neither is copied into the pickle stream.
+
+Connections are blocking, so the server answers each client on its own
+thread and the client reads replies on a background thread that hands them
+to the event loop; calls from any number of tasks share the one connection.
+"""
+import asyncio
+import logging
+import socket
+import struct
+import threading
+from multiprocessing.connection import Client, Listener
+
+from implementations.asyncio_impl import (BYTES_KEY, CALL, CALL_MANY, CANCEL, CHUNK, CREDIT, ECHO, END, ERROR,
+                                          RESULT, STREAM, AsyncioImplementation)
+from implementations.operations import double
+from implementations.serializers import (PICKLE_OOB_THRESHOLD, PickleSerializer, join_payloads,
+                                         split_payloads)
+from implementations.transports import check_transport, ipc_path, remove_socket_file
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<QBH")  # request id, message kind, number of frames
+_serializer = PickleSerializer()
+
+
+def connection_address(transport, port):
+    """(address, family) of the listener for a transport and port."""
+    check_transport(transport)
+    if transport == "ipc":
+        return ipc_path("mp-connection", port), "AF_UNIX"
+    return ("127.0.0.1", port), "AF_INET"
+
+
+def set_nodelay(conn):
+    """Disable Nagle on a TCP connection; messages are often several small writes."""
+    sock = socket.socket(fileno=conn.fileno())
+    try:
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    finally:
+        sock.detach()
+
+
+def shutdown_connection(conn):
+    """Close conn so that a thread blocked in recv_bytes() on it wakes up with EOFError."""
+    try:
+        # Closing the descriptor alone does not interrupt a blocked recv on Linux
+        sock = socket.socket(fileno=conn.fileno())
+    except OSError:
+        return  # Already closed by its serving thread
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    finally:
+        sock.detach()
+    conn.close()
+
+
+def send_message(conn, request_id, kind, msg):
+    """Send one message as a header+pickle frame followed by its out-of-band frames."""
+    # Large bytes stay in the message for pickle to pass out-of-band; only large strings need moving
+    header, raw_frames = split_payloads(msg, PICKLE_OOB_THRESHOLD, split_bytes=False)
+    frames = _serializer.dumps(header) + raw_frames
+    conn.send_bytes(_HEADER.pack(request_id, kind, len(frames)) + frames[0])
+    for frame in frames[1:]:
+        conn.send_bytes(frame)
+
+
+def recv_message(conn):
+    """Receive one message; returns (request id, kind, msg) or raises EOFError."""
+    first = memoryview(conn.recv_bytes())
+    request_id, kind, frame_count = _HEADER.unpack_from(first)
+    frames = [first[_HEADER.size:]]
+    frames.extend(conn.recv_bytes() for _ in range(frame_count - 1))
+    return request_id, kind, join_payloads(_serializer.loads(frames), frames)
+
+
+class _ServerStream:
+    """Credits and cancellation of one stream pushed by the server."""
+
+    def __init__(self, credits):
+        self.credits = threading.Semaphore(credits)
+        self.cancelled = threading.Event()
+
+
+class MPConnectionServer:
+    """Threaded multiprocessing.connection server answering like AsyncioServer."""
+
+    def __init__(self, transport="tcp", port=5558):
+        self.address, self.family = connection_address(transport, port)
+        self.listener = None
+        self.accept_thread = None
+        self.connections = set()
+        self.closing = False
+
+    def start(self):
+        if self.family == "AF_UNIX":
+            remove_socket_file(self.address)
+        self.listener = Listener(self.address, self.family)
+        self.accept_thread = threading.Thread(target=self._accept_loop, name="MPConnectionAccept", daemon=True)
+        self.accept_thread.start()
+        logger.info("multiprocessing.connection server listening on %s", self.address)
+
+    def close(self):
+        self.closing = True
+        if self.listener:
+            try:
+                # accept() does not notice close(); wake it with a connection of our own
+                Client(self.address, self.family).close()
+            except OSError:
+                pass
+            self.accept_thread.join(timeout=5)
+            self.listener.close()  # Also removes an AF_UNIX socket file
+            self.listener = None
+        for conn in list(self.connections):
+            shutdown_connection(conn)
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                break
+            if self.closing:
+                conn.close()
+                break
+            set_nodelay(conn)
+            self.connections.add(conn)
+            threading.Thread(target=self._serve, args=(conn,), name="MPConnectionServe", daemon=True).start()
+
+    def _serve(self, conn):
+        send_lock = threading.Lock()
+        streams = {}  # request id -> _ServerStream
+
+        def send(request_id, kind, msg):
+            with send_lock:
+                send_message(conn, request_id, kind, msg)
+
+        try:
+            while True:
+                try:
+                    request_id, kind, msg = recv_message(conn)
+                except (EOFError, OSError):
+                    break
+                try:
+                    if kind == CALL:
+                        send(request_id, RESULT, {"result": double(msg["value"])})
+                    elif kind == CALL_MANY:
+                        send(request_id, RESULT, {"results": [double(value) for value in msg["values"]]})
+                    elif kind == ECHO:
+                        send(request_id, RESULT, {BYTES_KEY: msg[BYTES_KEY]})
+                    elif kind == STREAM:
+                        stream = streams[request_id] = _ServerStream(msg["credits"])
+                        threading.Thread(target=self._push_stream, name="MPConnectionStream", daemon=True,
+                                         args=(send, streams, request_id, stream, msg["count"],
+                                               msg["chunk_size"])).start()
+                    elif kind == CREDIT:
+                        if request_id in streams:
+                            streams[request_id].credits.release()
+                    elif kind == CANCEL:
+                        stream = streams.pop(request_id, None)
+                        if stream:
+                            stream.cancelled.set()
+                            stream.credits.release()  # Wake it if it is waiting for credit
+                    else:
+                        send(request_id, ERROR, {"error": f"Unknown message kind {kind}"})
+                except (EOFError, OSError):
+                    break
+                except Exception as e:
+                    send(request_id, ERROR, {"error": str(e)})
+        finally:
+            for stream in list(streams.values()):
+                stream.cancelled.set()
+                stream.credits.release()
+            self.connections.discard(conn)
+            if not conn.closed:
+                conn.close()
+
+    @staticmethod
+    def _push_stream(send, streams, request_id, stream, count, chunk_size):
+        """Send range(count) as CHUNK messages, each one paid for with a credit."""
+        chunk_size = max(1, chunk_size)
+        try:
+            for start in range(0, count, chunk_size):
+                stream.credits.acquire()
+                if stream.cancelled.is_set():
+                    return
+                send(request_id, CHUNK, {"values": list(range(start, min(start + chunk_size, count)))})
+            send(request_id, END, {})
+        except (EOFError, OSError):
+            pass
+        finally:
+            streams.pop(request_id, None)
+
+
+class MPConnectionImplementation(AsyncioImplementation):
+    def __init__(self, external_server=False, transport="tcp", port=5558, stream_chunk_size=100,
+                 stream_credits=8):
+        """
+        transport: "tcp" for loopback TCP or "ipc" for an AF_UNIX socket named after port.
+        stream_chunk_size, stream_credits: as for AsyncioImplementation.
+        """
+        super().__init__(external_server=True, serializer="pickle", transport=transport, port=port,
+                         stream_chunk_size=stream_chunk_size, stream_credits=stream_credits)
+        self.external_server = external_server
+        self.server = None if external_server else MPConnectionServer(transport, port)
+        self.conn = None
+        self.reader_thread = None
+        self._send_lock = threading.Lock()
+
+    async def setup(self):
+        loop = asyncio.get_running_loop()
+        if self.server:
+            self.server.start()
+        address, family = connection_address(self.transport, self.port)
+        self.conn = await loop.run_in_executor(None, Client, address, family)
+        set_nodelay(self.conn)
+        self.reader_thread = threading.Thread(target=self._read_replies, args=(loop,),
+                                              name="MPConnectionReader", daemon=True)
+        self.reader_thread.start()
+
+    async def teardown(self):
+        if self.conn:
+            conn, self.conn = self.conn, None
+            shutdown_connection(conn)  # Ends the reader thread's recv
+        if self.reader_thread:
+            self.reader_thread.join(timeout=5)
+            self.reader_thread = None
+        self._fail_pending(RuntimeError("multiprocessing.connection client shut down"))
+        if self.server:
+            self.server.close()
+
+    def _read_replies(self, loop):
+        """Runs on the reader thread: decode replies and dispatch them on the event loop."""
+        conn = self.conn
+        try:
+            while True:
+                loop.call_soon_threadsafe(self._dispatch, *recv_message(conn))
+        except (EOFError, OSError):
+            pass
+        except RuntimeError:
+            return  # The event loop is closed
+        if self.conn is not None:
+            logger.error("multiprocessing.connection connection lost")
+            loop.call_soon_threadsafe(self._fail_pending, RuntimeError("multiprocessing.connection connection lost"))
+
+    def _send(self, request_id, kind, msg):
+        # Blocks only while the socket buffer is full; the server keeps reading meanwhile
+        with self._send_lock:
+            send_message(self.conn, request_id, kind, msg)
+
+    async def _flush(self):
+        pass
+
+    def _connected(self):
+        return self.conn is not None
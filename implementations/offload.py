@@ -0,0 +1,289 @@
+"""
+Out-of-band shared-memory offload of large payloads, on top of any backend.
+
+OffloadImplementation wraps an RPCImplementation. A payload of threshold bytes
+or more is copied into a shared memory segment taken from a pooled arena and
+only a short handle string travels over the wrapped backend's simple_call:
+
+    shm-offload:<op>:<request segment>:<request size>:<response segment>:<response capacity>
+
+Every backend's server handles simple calls with operations.double(), which
+passes handles to serve_offloaded(): the server reads the request segment, writes the result
+of op into the response segment the client reserved and replies with the
+result size in bytes. The client reads the result out of the response segment
+and returns both segments to the arena, so segments are not created per call.
+
+Doubling a str doubles its UTF-8 bytes, so the server never decodes a payload.
+"""
+import collections
+import os
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+from interface import RPCImplementation
+
+OFFLOAD_PREFIX = "shm-offload:"
+
+# Payloads of this many bytes or more are offloaded by default
+DEFAULT_OFFLOAD_THRESHOLD = 1024 * 1024
+
+# Handle operations: double a str (as UTF-8) or a bytes payload, or echo bytes back
+DOUBLE_STR, DOUBLE_BYTES, ECHO_BYTES = "s", "b", "e"
+
+# Segments of other processes a server keeps attached between calls
+MAX_ATTACHED_SEGMENTS = 16
+
+# Segments created by arenas in this process, so an in-process server uses them directly
+_local_segments = {}
+_attached = collections.OrderedDict()  # name -> SharedMemory attached by a server, oldest first
+_segments_lock = threading.Lock()
+
+
+def is_offload_handle(value):
+    return isinstance(value, str) and value.startswith(OFFLOAD_PREFIX)
+
+
+def attach_segment(name):
+    """Segment called name: this process's own, or a cached attachment to another process's."""
+    with _segments_lock:
+        segment = _local_segments.get(name)
+        if segment is not None:
+            return segment
+        segment = _attached.pop(name, None)
+        if segment is None:
+            segment = shared_memory.SharedMemory(name=name)
+            if os.name == "posix":
+                # The client's arena owns and unlinks the segment
+                resource_tracker.unregister(segment._name, "shared_memory")
+            while len(_attached) >= MAX_ATTACHED_SEGMENTS:
+                _close_segment(_attached.popitem(last=False)[1])
+        _attached[name] = segment
+        return segment
+
+
+def _close_segment(segment):
+    try:
+        segment.close()
+    except BufferError:
+        pass  # Another thread is still copying; the mapping goes once its views are released
+
+
+def serve_offloaded(handle):
+    """Server side: carry out the operation of an offload handle and return the result size in bytes."""
+    op, request_name, size, response_name, capacity = handle[len(OFFLOAD_PREFIX):].split(":")
+    size = int(size)
+    copies = 1 if op == ECHO_BYTES else 2
+    if size * copies > int(capacity):
+        raise ValueError(f"Offload response segment too small: {capacity} < {size * copies} bytes")
+    request = attach_segment(request_name).buf[:size]
+    response = attach_segment(response_name).buf[:size * copies]
+    try:
+        for offset in range(0, size * copies, size or 1):
+            response[offset:offset + size] = request
+    finally:
+        request.release()
+        response.release()
+    return size * copies
+
+
+class SharedMemoryArena:
+    """
+    Pool of shared memory segments reused across calls.
+
+    Segments come in power-of-two capacities of at least min_size bytes.
+    acquire() hands out a free segment (creating one only when none fits)
+    holding one reference, retain() adds a reference and release() drops one,
+    returning the segment to the pool when none are left. At most max_free
+    segments per capacity are kept; the arena unlinks all of them on close().
+    """
+
+    def __init__(self, min_size=DEFAULT_OFFLOAD_THRESHOLD, max_free=2):
+        self.min_size = min_size
+        self.max_free = max_free
+        self._free = collections.defaultdict(list)  # capacity -> free segments
+        self._refs = {}  # name -> references to a segment in use
+        self._capacity = {}  # name -> capacity of every segment of this arena
+
+    def acquire(self, size):
+        capacity = max(self.min_size, 1 << max(0, size - 1).bit_length())
+        free = self._free[capacity]
+        segment = free.pop() if free else self._create(capacity)
+        self._refs[segment.name] = 1
+        return segment
+
+    def retain(self, segment):
+        self._refs[segment.name] += 1
+
+    def release(self, segment):
+        if segment.name not in self._refs:
+            return  # Discarded
+        self._refs[segment.name] -= 1
+        if self._refs[segment.name]:
+            return
+        del self._refs[segment.name]
+        free = self._free[self._capacity[segment.name]]
+        if len(free) < self.max_free:
+            free.append(segment)
+        else:
+            self._destroy(segment)
+
+    def discard(self, segment):
+        """Drop a segment a server may still write to, e.g. after a timed-out call, instead of reusing it."""
+        if self._refs.pop(segment.name, None) is not None:
+            self._destroy(segment)
+
+    def capacity(self, segment):
+        return self._capacity[segment.name]
+
+    def close(self):
+        for segments in self._free.values():
+            for segment in segments:
+                self._destroy(segment)
+        self._free.clear()
+        for name in list(self._refs):
+            with _segments_lock:
+                segment = _local_segments.get(name)
+            if segment is not None:
+                self._destroy(segment)
+        self._refs.clear()
+
+    def _create(self, capacity):
+        segment = shared_memory.SharedMemory(create=True, size=capacity)
+        self._capacity[segment.name] = capacity
+        with _segments_lock:
+            _local_segments[segment.name] = segment
+        return segment
+
+    def _destroy(self, segment):
+        with _segments_lock:
+            _local_segments.pop(segment.name, None)
+        self._capacity.pop(segment.name, None)
+        _close_segment(segment)
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class OffloadImplementation(RPCImplementation):
+    """
+    Wraps any RPCImplementation and sends str/bytes payloads of threshold
+    bytes or more through shared memory, passing only a handle to the backend.
+    Everything else, streams included, goes straight to the wrapped backend.
+    """
+
+    def __init__(self, inner, threshold=DEFAULT_OFFLOAD_THRESHOLD, arena=None):
+        """
+        inner: the backend whose server resolves the handles.
+        threshold: payload size in bytes from which to offload (0 = never).
+        arena: SharedMemoryArena to take segments from; one of its own by default.
+        """
+        self.inner = inner
+        self.threshold = threshold
+        self.arena = arena or SharedMemoryArena()
+
+    def __getattr__(self, name):
+        # Backend-specific extras (upload(), pool, ...) come from the wrapped implementation
+        return getattr(self.inner, name)
+
+    @property
+    def server_pid(self):
+        return self.inner.server_pid
+
+    async def setup(self):
+        await self.inner.setup()
+
+    async def teardown(self):
+        try:
+            await self.inner.teardown()
+        finally:
+            self.arena.close()
+
+    def _offload_op(self, value):
+        """Handle operation for a simple-call value, or None if it goes to the backend as it is."""
+        if not self.threshold:
+            return None
+        if isinstance(value, str):
+            return DOUBLE_STR if len(value) >= self.threshold else None
+        if isinstance(value, (bytes, bytearray, memoryview)) and memoryview(value).nbytes >= self.threshold:
+            return DOUBLE_BYTES
+        return None
+
+    def _publish(self, op, value, request=None):
+        """Copy value into a request segment (unless given one) and reserve its response segment."""
+        payload = value.encode("utf-8") if op == DOUBLE_STR else memoryview(value).cast("B")
+        size = len(payload)
+        if request is None:
+            request = self.arena.acquire(size)
+            request.buf[:size] = payload
+        response = self.arena.acquire(size if op == ECHO_BYTES else 2 * size)
+        handle = (f"{OFFLOAD_PREFIX}{op}:{request.name}:{size}:"
+                  f"{response.name}:{self.arena.capacity(response)}")
+        return handle, request, response
+
+    def _collect(self, op, size, request, response):
+        """Read the result of an offloaded call and give its segments back to the arena."""
+        if not isinstance(size, int):
+            # Backends that log and swallow errors return None instead of the size
+            self.arena.discard(request)
+            self.arena.discard(response)
+            raise RuntimeError(f"Offloaded call failed: {size!r}")
+        view = response.buf[:size]
+        try:
+            result = str(view, "utf-8") if op == DOUBLE_STR else bytes(view)
+        finally:
+            view.release()
+        self.arena.release(request)
+        self.arena.release(response)
+        return result
+
+    async def _call(self, op, value):
+        handle, request, response = self._publish(op, value)
+        try:
+            size = await self.inner.simple_call(handle)
+        except BaseException:
+            self.arena.discard(request)
+            self.arena.discard(response)
+            raise
+        return self._collect(op, size, request, response)
+
+    async def simple_call(self, value) -> object:
+        op = self._offload_op(value)
+        if op is None:
+            return await self.inner.simple_call(value)
+        return await self._call(op, value)
+
+    async def simple_call_many(self, values) -> list:
+        values = list(values)
+        requests = list(values)
+        offloaded = {}  # index -> (op, request segment, response segment)
+        published = {}  # id of a payload -> its request segment, shared by repeats in the batch
+        for index, value in enumerate(values):
+            op = self._offload_op(value)
+            if op is None:
+                continue
+            request = published.get((op, id(value)))
+            if request is not None:
+                self.arena.retain(request)
+            requests[index], request, response = self._publish(op, value, request)
+            published[(op, id(value))] = request
+            offloaded[index] = (op, request, response)
+        try:
+            results = await self.inner.simple_call_many(requests)
+        except BaseException:
+            for _, request, response in offloaded.values():
+                self.arena.discard(request)
+                self.arena.discard(response)
+            raise
+        for index, (op, request, response) in offloaded.items():
+            results[index] = self._collect(op, results[index], request, response)
+        return results
+
+    async def echo_bytes(self, buf) -> bytes:
+        if not self.threshold or memoryview(buf).nbytes < self.threshold:
+            return await self.inner.echo_bytes(buf)
+        return await self._call(ECHO_BYTES, buf)
+
+    async def stream_values(self, count: int):
+        async for value in self.inner.stream_values(count):
+            yield value
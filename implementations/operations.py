@@ -0,0 +1,19 @@
+"""
+The operations benchmark servers perform, shared by every backend.
+
+A simple call doubles its value: strings and bytes are repeated, numbers
+multiplied by 2. Offload handles (see offload.py) are served from shared
+memory instead, and their result is its size in bytes.
+"""
+from implementations.offload import is_offload_handle, serve_offloaded
+
+
+def double(value):
+    """Result of a simple call: strings and bytes are repeated, numbers multiplied by 2."""
+    if is_offload_handle(value):
+        return serve_offloaded(value)
+    if isinstance(value, str):
+        return value + value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value) * 2
+    return value * 2
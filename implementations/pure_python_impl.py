@@ -1,6 +1,8 @@
 import asyncio
 from typing import AsyncIterator
 from interface import RPCImplementation
+from implementations.operations import double
+
 
 class PurePythonImplementation(RPCImplementation):
     """
@@ -18,10 +20,15 @@ class PurePythonImplementation(RPCImplementation):
     async def simple_call(self, value) -> object:
         """Directly performs the simple operation (multiply by 2)."""
         # Simulate the behavior of other implementations
-        if isinstance(value, str):
-            return value + value
-        else:
-            return value * 2
+        return double(value)
+
+    async def simple_call_many(self, values) -> list:
+        """Directly performs the simple operation on every value."""
+        return [double(value) for value in values]
+
+    async def echo_bytes(self, buf) -> bytes:
+        """Directly returns a copy of the payload, as a receiving server would hold."""
+        return bytes(buf)
 
     async def stream_values(self, count: int) -> AsyncIterator[int]:
         """Directly yields the requested sequence of values."""
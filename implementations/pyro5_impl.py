@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import logging
 import threading
 import time
@@ -7,8 +8,11 @@ from typing import AsyncIterator
 
 import Pyro5.api
 import Pyro5.errors
+import serpent
 
 from interface import RPCImplementation
+from implementations.operations import double
+from implementations.serializers import byte_view
 
 # Configure logging for this module
 log = logging.getLogger(__name__)
@@ -27,7 +31,11 @@ class BenchmarkService:
     def simple_call(self, value):
         """Simple RPC call that doubles the input value"""
         # log.debug(f"Pyro5 simple_call received: {value}")
-        return value * 2
+        return double(value)
+
+    def echo_bytes(self, data):
+        """Return the payload unchanged; serpent delivers bytes as a base64 dict"""
+        return serpent.tobytes(data)
 
     def stream_values(self, count):
         """
@@ -40,15 +48,183 @@ class BenchmarkService:
         # log.debug(f"Pyro5 stream_values finished yielding for count: {count}")
 
 
+class _PooledProxy:
+    """A pooled proxy and the time it was last returned to the pool."""
+    __slots__ = ("proxy", "last_used")
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.last_used = time.monotonic()
+
+
+class Pyro5ProxyPool:
+    """
+    Bounded pool of bound Pyro5 proxies shared by the executor threads.
+
+    Each proxy keeps its TCP connection open between calls. A thread gets back
+    the proxy it used last when that one is idle (so ownership does not have to
+    move), otherwise any idle proxy, and only opens a new connection while the
+    pool is below max_size. Proxies idle for longer than idle_timeout are
+    closed, and proxies idle for longer than health_check_interval are pinged
+    before being handed out again.
+    """
+
+    def __init__(self, uri, max_size=8, idle_timeout=30.0, health_check_interval=5.0):
+        if max_size < 1:
+            raise ValueError("Pyro5 proxy pool size must be at least 1")
+        self.uri = uri
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._idle = []  # _PooledProxy entries, most recently used last
+        self._size = 0  # idle + checked out
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+    @property
+    def size(self):
+        """Number of open proxies, idle or checked out."""
+        return self._size
+
+    def _connect(self):
+        proxy = Pyro5.api.Proxy(self.uri)
+        proxy._pyroBind()
+        return proxy
+
+    @staticmethod
+    def _close(entry):
+        try:
+            entry.proxy._pyroClaimOwnership()
+            entry.proxy._pyroRelease()
+        except Exception as e:
+            log.warning(f"Error releasing pooled Pyro5 proxy: {e}")
+
+    def _evict_idle_locked(self, now):
+        """Drop idle proxies past idle_timeout or beyond max_size; returns them for closing."""
+        evicted = [e for e in self._idle if now - e.last_used > self.idle_timeout]
+        keep = [e for e in self._idle if now - e.last_used <= self.idle_timeout]
+        excess = max(0, self._size - len(evicted) - self.max_size)
+        if excess:
+            evicted.extend(keep[:excess])
+            keep = keep[excess:]
+        self._idle = keep
+        self._size -= len(evicted)
+        return evicted
+
+    def _healthy(self, entry, now):
+        if now - entry.last_used <= self.health_check_interval:
+            return True
+        try:
+            entry.proxy._pyroGetMetadata()  # Round trip to the daemon
+            return True
+        except Pyro5.errors.PyroError as e:
+            log.warning(f"Discarding unhealthy pooled Pyro5 proxy: {e}")
+            return False
+
+    def acquire(self):
+        """Check out a proxy owned by the calling thread, blocking while the pool is exhausted."""
+        while True:
+            entry = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Pyro5 proxy pool is closed.")
+                    evicted = self._evict_idle_locked(time.monotonic())
+                    affine = getattr(self._local, "entry", None)
+                    if affine is not None and affine in self._idle:
+                        entry = affine
+                        self._idle.remove(entry)
+                        break
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1  # Reserve the slot before connecting
+                        break
+                    self._cond.wait()
+            for stale in evicted:
+                self._close(stale)
+
+            if entry is None:
+                try:
+                    entry = _PooledProxy(self._connect())
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                entry.proxy._pyroClaimOwnership()
+                if not self._healthy(entry, time.monotonic()):
+                    self.release(entry, healthy=False)
+                    continue
+            self._local.entry = entry
+            return entry
+
+    def release(self, entry, healthy=True):
+        """Return a checked-out proxy; unhealthy proxies are closed instead of reused."""
+        with self._cond:
+            if healthy and not self._closed and self._size <= self.max_size:
+                entry.last_used = time.monotonic()
+                self._idle.append(entry)
+                entry = None
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if entry is not None:
+            self._close(entry)
+
+    @contextlib.contextmanager
+    def proxy(self):
+        """Context manager yielding a pooled proxy for the duration of one call."""
+        entry = self.acquire()
+        try:
+            yield entry.proxy
+        except Pyro5.errors.CommunicationError:
+            self.release(entry, healthy=False)
+            raise
+        except BaseException:
+            self.release(entry)
+            raise
+        else:
+            self.release(entry)
+
+    def resize(self, max_size):
+        """Change the pool bound; surplus proxies are closed as they become idle."""
+        if max_size < 1:
+            raise ValueError("Pyro5 proxy pool size must be at least 1")
+        with self._cond:
+            self.max_size = max_size
+            evicted = self._evict_idle_locked(time.monotonic())
+            self._cond.notify_all()
+        for entry in evicted:
+            self._close(entry)
+
+    def close(self):
+        """Close all idle proxies; proxies still checked out are closed when released."""
+        with self._cond:
+            self._closed = True
+            evicted, self._idle = self._idle, []
+            self._size -= len(evicted)
+            self._cond.notify_all()
+        for entry in evicted:
+            self._close(entry)
+
+
 class Pyro5Implementation(RPCImplementation):
     """
     Implementation of the RPCImplementation interface using Pyro5.
     """
 
-    def __init__(self, host='localhost', port=0, external_server=False, object_name=None):
+    def __init__(self, host='localhost', port=0, external_server=False, object_name=None,
+                 pool_size=8, pool_idle_timeout=30.0):
         self.host = host
         self.port = port
         self.external_server = external_server
+        self.pool_size = pool_size
+        self.pool_idle_timeout = pool_idle_timeout
+        self.pool = None
         # Ensure a unique name if running multiple instances locally without external server
         instance_id = uuid.uuid4().hex[:8] if not external_server else ""
         self.object_name = object_name or f"{PYRO5_NS_PREFIX}.{instance_id}"
@@ -208,11 +384,16 @@ class Pyro5Implementation(RPCImplementation):
                         raise  # Re-raise unexpected errors immediately
 
             await loop.run_in_executor(None, connect_to_external)
+        self.pool = Pyro5ProxyPool(self.proxy._pyroUri, max_size=self.pool_size,
+                                   idle_timeout=self.pool_idle_timeout)
         log.info("Pyro5 setup complete.")
 
     async def teardown(self):
         """Clean up resources"""
         log.info(f"Tearing down Pyro5 (external={self.external_server})")
+        if self.pool:
+            await asyncio.get_running_loop().run_in_executor(None, self.pool.close)
+            self.pool = None
         if self.proxy:
             try:
                 self.proxy._pyroRelease()
@@ -269,13 +450,13 @@ class Pyro5Implementation(RPCImplementation):
         loop = asyncio.get_running_loop()
 
         def remote_call():
-            # Create a thread-local copy of the proxy for this call
-            local_proxy = self.proxy.__copy__()
             try:
-                # log.debug(f"Executing remote simple_call with value: {value}")
-                result = local_proxy.simple_call(value)
-                # log.debug(f"Received result from remote simple_call: {result}")
-                return result
+                # Reuse a pooled, already connected proxy for this call
+                with self.pool.proxy() as local_proxy:
+                    # log.debug(f"Executing remote simple_call with value: {value}")
+                    result = local_proxy.simple_call(value)
+                    # log.debug(f"Received result from remote simple_call: {result}")
+                    return result
             except Pyro5.errors.CommunicationError as e:
                 log.error(f"Pyro5 communication error during simple_call: {e}")
                 # Consider attempting reconnect or raising specific error
@@ -299,6 +480,45 @@ class Pyro5Implementation(RPCImplementation):
             # Error already logged in remote_call, re-raise
             raise
 
+    async def simple_call_many(self, values) -> list:
+        """Double every value using a single batched Pyro5 request"""
+        if not self.proxy:
+            raise RuntimeError("Pyro5 proxy not connected.")
+        loop = asyncio.get_running_loop()
+        values = list(values)
+
+        def remote_batch():
+            try:
+                with self.pool.proxy() as local_proxy:
+                    with Pyro5.api.BatchProxy(local_proxy) as batch:
+                        for value in values:
+                            batch.simple_call(value)
+                        return list(batch())
+            except Pyro5.errors.CommunicationError as e:
+                log.error(f"Pyro5 communication error during simple_call_many: {e}")
+                raise
+
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, remote_batch),
+            timeout=60.0
+        )
+
+    async def echo_bytes(self, buf) -> bytes:
+        """Send a binary payload and return the server's copy"""
+        if not self.proxy:
+            raise RuntimeError("Pyro5 proxy not connected.")
+        loop = asyncio.get_running_loop()
+        data = byte_view(buf)
+
+        def remote_call():
+            with self.pool.proxy() as local_proxy:
+                return serpent.tobytes(local_proxy.echo_bytes(data))
+
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, remote_call),
+            timeout=60.0
+        )
+
     async def stream_values(self, count: int) -> AsyncIterator[int]:
         """Stream values from the remote generator"""
         if not self.proxy:
@@ -307,30 +527,32 @@ class Pyro5Implementation(RPCImplementation):
 
         def _collect_stream_sync():
             # This function runs entirely in the executor thread
-            local_proxy = self.proxy.__copy__() # Create a proxy copy for this thread
             remote_iterator = None
             collected_items = []
             try:
-                log.debug(f"Requesting remote iterator for stream_values({count})")
-                remote_iterator = local_proxy.stream_values(count)
-                log.debug(f"Received remote iterator proxy: {type(remote_iterator)}")
-                # Iterate and collect all items synchronously within this thread
-                for item in remote_iterator:
-                    collected_items.append(item)
-                log.debug(f"Collected {len(collected_items)} items from stream.")
-                return collected_items
+                # Borrow a pooled proxy for the whole iteration
+                with self.pool.proxy() as local_proxy:
+                    try:
+                        log.debug(f"Requesting remote iterator for stream_values({count})")
+                        remote_iterator = local_proxy.stream_values(count)
+                        log.debug(f"Received remote iterator proxy: {type(remote_iterator)}")
+                        # Iterate and collect all items synchronously within this thread
+                        for item in remote_iterator:
+                            collected_items.append(item)
+                        log.debug(f"Collected {len(collected_items)} items from stream.")
+                        return collected_items
+                    finally:
+                        # Ensure the remote iterator resources are released
+                        if remote_iterator and hasattr(remote_iterator, "close"):
+                            log.debug("Closing remote iterator...")
+                            try:
+                                remote_iterator.close()
+                                log.debug("Pyro5 remote iterator closed.")
+                            except Exception as e_close:
+                                log.warning(f"Error closing remote iterator: {e_close}")
             except Exception:
                 log.exception("Error during synchronous stream collection")
                 raise # Re-raise exception to be caught by the await call
-            finally:
-                # Ensure the remote iterator resources are released
-                if remote_iterator and hasattr(remote_iterator, "close"):
-                    log.debug("Closing remote iterator...")
-                    try:
-                        remote_iterator.close()
-                        log.debug("Pyro5 remote iterator closed.")
-                    except Exception as e_close:
-                        log.warning(f"Error closing remote iterator: {e_close}")
 
         try:
             # Run the synchronous collection function in the executor
@@ -4,7 +4,11 @@ import threading
 from typing import AsyncIterator
 import Pyro4
 import Pyro4.errors
+import serpent
 from interface import RPCImplementation
+from implementations.operations import double
+from implementations.serializers import byte_view
+from implementations.streaming import prefetch_chunks
 
 # Prefix for Pyro name server registrations
 PYRO_NS_PREFIX = "example.benchmark"
@@ -17,7 +21,11 @@ class BenchmarkService:
     """
     def simple_call(self, value):
         """Simple RPC call that doubles the input value"""
-        return value * 2
+        return double(value)
+
+    def echo_bytes(self, data):
+        """Return the payload unchanged; serpent delivers bytes as a base64 dict"""
+        return serpent.tobytes(data)
 
     def stream_values(self, count):
         """
@@ -27,14 +35,30 @@ class BenchmarkService:
         for i in range(count):
             yield i
 
+    def stream_chunks(self, count, chunk_size):
+        """
+        Generator that yields the values from 0 to count-1 in lists of up to
+        chunk_size items, so each remote next() call carries a whole chunk.
+        """
+        for start in range(0, count, chunk_size):
+            yield list(range(start, min(start + chunk_size, count)))
+
 
 class PyroImplementation(RPCImplementation):
     """
     Implementation of the RPCImplementation interface using Pyro4.
     """
-    def __init__(self, host='localhost', port=0, external_server=False, object_name=None):
+    def __init__(self, host='localhost', port=0, external_server=False, object_name=None,
+                 stream_chunk_size=100, stream_prefetch=2):
+        """
+        stream_chunk_size: items per remote next() call when streaming; 0 fetches
+            one item per call on the default executor.
+        stream_prefetch: number of chunks the background thread may fetch ahead.
+        """
         self.host = host
         self.port = port
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_prefetch = stream_prefetch
         self.external_server = external_server
         self.object_name = object_name or f"{PYRO_NS_PREFIX}.benchmark"
         self.daemon = None
@@ -175,8 +199,42 @@ class PyroImplementation(RPCImplementation):
             logging.error(f"Pyro simple_call unexpected error: {e}")
             raise
 
+    async def simple_call_many(self, values) -> list:
+        """Double every value using a single batched Pyro4 request"""
+        loop = asyncio.get_running_loop()
+        values = list(values)
+
+        def remote_batch():
+            batch = Pyro4.batch(self.proxy)
+            for value in values:
+                batch.simple_call(value)
+            return list(batch())
+
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, remote_batch),
+            timeout=60.0
+        )
+
+    async def echo_bytes(self, buf) -> bytes:
+        """Send a binary payload and return the server's copy"""
+        loop = asyncio.get_running_loop()
+        data = byte_view(buf)
+
+        def remote_call():
+            return serpent.tobytes(self.proxy.echo_bytes(data))
+
+        return await asyncio.wait_for(
+            loop.run_in_executor(None, remote_call),
+            timeout=60.0
+        )
+
     async def stream_values(self, count: int) -> AsyncIterator[int]:
         """Stream values from the remote generator"""
+        if self.stream_chunk_size > 0:
+            async for item in self._stream_values_chunked(count):
+                yield item
+            return
+
         loop = asyncio.get_running_loop()
         remote_iterator = None
 
@@ -229,3 +287,12 @@ class PyroImplementation(RPCImplementation):
                 except Exception as e_release:
                     logging.warning(f"Error releasing remote iterator after failure: {e_release}")
             raise  # Re-raise the exception
+
+    async def _stream_values_chunked(self, count: int) -> AsyncIterator[int]:
+        """Stream values in chunks prefetched by a background thread"""
+        def open_chunks():
+            # Runs on the prefetch thread; each next() fetches a whole chunk
+            return self.proxy.stream_chunks(count, self.stream_chunk_size)
+
+        async for item in prefetch_chunks(open_chunks, self.stream_prefetch):
+            yield item
@@ -1,34 +1,246 @@
 import asyncio
+import contextlib
+import logging
+import socket
 import threading
 from typing import AsyncIterator
 import rpyc
 from rpyc.utils.server import ThreadedServer
 from interface import RPCImplementation
+from implementations.operations import double
+from implementations.streaming import prefetch_chunks
 
 class BenchmarkService(rpyc.Service):
     def exposed_simple_call(self, value):
-        # For demonstration, simply multiply value by 2
-        return value * 2
+        return double(value)
+
+    def exposed_simple_call_many(self, values):
+        # Tuples are passed by value (brine); a list would arrive as a netref
+        return tuple(double(value) for value in values)
+
+    def exposed_echo_bytes(self, data):
+        # bytes is passed by value (brine) and goes straight back
+        return data
 
     def exposed_stream_values(self, count):
         # Return a generator yielding values from 0 to count-1
         for i in range(count):
             yield i
 
+    def exposed_stream_chunks(self, count, chunk_size):
+        # Same values as stream_values, but each remote next() returns a whole
+        # chunk; tuples are passed by value, so a chunk costs one round trip
+        for start in range(0, count, chunk_size):
+            yield tuple(range(start, min(start + chunk_size, count)))
+
+def create_tcp_server(port):
+    """ThreadedServer for BenchmarkService listening on a TCP port, with Nagle disabled."""
+    server = ThreadedServer(
+        BenchmarkService,
+        port=port,
+        protocol_config={"allow_public_attrs": True}
+    )
+    # Replies are small writes; with Nagle enabled a reply can wait for the
+    # client's delayed ACK (~40 ms) whenever a new thread starts talking.
+    # Accepted connections inherit TCP_NODELAY from the listening socket.
+    server.listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return server
+
+# Client modes: "executor" blocks an executor thread per call, "async" keeps
+# many requests outstanding on one connection served by a background thread.
+CLIENT_MODES = ("executor", "async")
+
+def bridge_async_result(async_result, loop):
+    """Return an asyncio future that settles when the rpyc AsyncResult arrives."""
+    future = loop.create_future()
+
+    def on_ready(result):
+        # Runs in the connection's serving thread
+        loop.call_soon_threadsafe(_settle_future, future, result)
+
+    async_result.add_callback(on_ready)
+    # add_callback is not atomic with the reply arriving; settle directly if we raced it
+    if async_result._is_ready:
+        _settle_future(future, async_result)
+    return future
+
+def _settle_future(future, async_result):
+    if future.done():
+        return
+    try:
+        future.set_result(async_result.value)
+    except Exception as e:
+        future.set_exception(e)
+
+# Connection pool checkout strategies
+POOL_STRATEGIES = ("round-robin", "least-busy")
+
+class _PooledConnection:
+    """A pool slot: its connection (opened on first use) and the calls in flight on it."""
+    __slots__ = ("conn", "in_flight", "retired", "lock")
+
+    def __init__(self):
+        self.conn = None
+        self.in_flight = 0
+        self.retired = False
+        self.lock = threading.Lock()  # Held while the connection is being opened
+
+class RPyCConnectionPool:
+    """
+    Pool of RPyC connections shared by the executor threads.
+
+    Checking out a connection does not make it exclusive: RPyC lets several
+    threads issue requests on one connection, but they serialize on its locks,
+    so spreading calls over more connections lets the server handle them in
+    parallel. "round-robin" cycles through the slots; "least-busy" picks the
+    connection with the fewest calls in flight and adds a slot only while every
+    open connection is busy. Either way a slot connects on first use.
+    """
+
+    def __init__(self, connect, max_size=4, strategy="round-robin"):
+        if max_size < 1:
+            raise ValueError("RPyC connection pool size must be at least 1")
+        if strategy not in POOL_STRATEGIES:
+            raise ValueError(f"Unknown RPyC pool strategy: {strategy}")
+        self._connect = connect
+        self.max_size = max_size
+        self.strategy = strategy
+        self._slots = []
+        self._next = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        """Number of open connections."""
+        return sum(1 for slot in self._slots if slot.conn is not None)
+
+    def _pick_slot_locked(self):
+        if self.strategy == "round-robin":
+            index = self._next % self.max_size
+            self._next = index + 1
+            if index < len(self._slots):
+                return self._slots[index]
+        elif self._slots:
+            slot = min(self._slots, key=lambda slot: slot.in_flight)
+            if slot.in_flight == 0 or len(self._slots) >= self.max_size:
+                return slot
+        slot = _PooledConnection()
+        self._slots.append(slot)
+        return slot
+
+    def acquire(self):
+        """Check out a slot with an open connection."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("RPyC connection pool is closed.")
+            slot = self._pick_slot_locked()
+            slot.in_flight += 1
+        if slot.conn is None:
+            with slot.lock:
+                if slot.conn is None:
+                    try:
+                        slot.conn = self._connect()
+                    except Exception:
+                        self.release(slot, healthy=False)
+                        raise
+        return slot
+
+    def release(self, slot, healthy=True):
+        """Return a slot; a broken connection is dropped and reopened by a later checkout."""
+        with self._lock:
+            slot.in_flight -= 1
+            if not healthy and slot in self._slots:
+                self._slots.remove(slot)
+                slot.retired = True
+            close = slot.retired and slot.in_flight == 0
+        if close:
+            self._close(slot)
+
+    @staticmethod
+    def _close(slot):
+        conn, slot.conn = slot.conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception as e:
+                logging.warning(f"Error closing pooled RPyC connection: {e}")
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Context manager yielding a pooled connection for the duration of one call."""
+        slot = self.acquire()
+        try:
+            yield slot.conn
+        except (EOFError, ConnectionError):
+            self.release(slot, healthy=False)
+            raise
+        except BaseException:
+            self.release(slot)
+            raise
+        else:
+            self.release(slot)
+
+    def resize(self, max_size):
+        """Change the pool bound; surplus connections close once their calls finish."""
+        if max_size < 1:
+            raise ValueError("RPyC connection pool size must be at least 1")
+        with self._lock:
+            self.max_size = max_size
+            idle = self._retire_locked(self._slots[max_size:])
+            self._slots = self._slots[:max_size]
+        for slot in idle:
+            self._close(slot)
+
+    def close(self):
+        """Close all connections; busy ones close when their last call finishes."""
+        with self._lock:
+            self._closed = True
+            idle = self._retire_locked(self._slots)
+            self._slots = []
+        for slot in idle:
+            self._close(slot)
+
+    @staticmethod
+    def _retire_locked(slots):
+        """Mark slots as leaving the pool; returns those that can be closed right away."""
+        for slot in slots:
+            slot.retired = True
+        return [slot for slot in slots if slot.in_flight == 0]
+
 class RPyCImplementation(RPCImplementation):
-    def __init__(self, host='localhost', port=18861, external_server=False):
+    def __init__(self, host='localhost', port=18861, external_server=False, client_mode="executor",
+                 stream_chunk_size=100, stream_prefetch=2, pool_size=4, pool_strategy="round-robin"):
+        """
+        stream_chunk_size: items per remote next() call when streaming; 0 collects
+            the whole stream item by item before yielding anything.
+        stream_prefetch: number of chunks the background thread may fetch ahead.
+        pool_size, pool_strategy: connection pool used by executor-mode calls.
+        """
+        if client_mode not in CLIENT_MODES:
+            raise ValueError(f"Unknown RPyC client mode: {client_mode}")
         self.host = host
         self.port = port
-        if not external_server:
-            self.server = ThreadedServer(
-                BenchmarkService,
-                port=port,
-                protocol_config={"allow_public_attrs": True}
-            )
-        else:
-            self.server = None
+        self.client_mode = client_mode
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_prefetch = stream_prefetch
+        self.pool_size = pool_size
+        self.pool_strategy = pool_strategy
+        self.pool = None
+        self.server = self._create_server() if not external_server else None
         self.server_thread = None
         self.conn = None
+        self.bg_thread = None
+        self._async_simple_call = None
+        self._async_simple_call_many = None
+        self._async_echo_bytes = None
+
+    def _create_server(self):
+        return create_tcp_server(self.port)
+
+    def _connect(self):
+        """Open a new client connection (blocking)."""
+        return rpyc.connect(self.host, self.port)
 
     async def setup(self):
         loop = asyncio.get_running_loop()
@@ -40,10 +252,26 @@ class RPyCImplementation(RPCImplementation):
             # Wait briefly to ensure the server starts
             await asyncio.sleep(0.5)
         def connect():
-            self.conn = rpyc.connect(self.host, self.port)
+            self.conn = self._connect()
+            if self.client_mode == "executor":
+                # Executor threads spread their calls over pooled connections, opened on first use
+                self.pool = RPyCConnectionPool(self._connect, self.pool_size, self.pool_strategy)
+            if self.client_mode == "async":
+                # Resolve the remote methods once; every attribute access is a round trip
+                self._async_simple_call = rpyc.async_(self.conn.root.simple_call)
+                self._async_simple_call_many = rpyc.async_(self.conn.root.simple_call_many)
+                self._async_echo_bytes = rpyc.async_(self.conn.root.echo_bytes)
+                # Block in serve() instead of the default poll-then-sleep(0.1) cycle
+                self.bg_thread = rpyc.BgServingThread(self.conn, serve_interval=0.1, sleep_interval=0)
         await loop.run_in_executor(None, connect)
 
     async def teardown(self):
+        if self.bg_thread:
+            self.bg_thread.stop()
+            self.bg_thread = None
+        if self.pool:
+            self.pool.close()
+            self.pool = None
         if self.conn:
             self.conn.close()
         if self.server:
@@ -55,9 +283,22 @@ class RPyCImplementation(RPCImplementation):
 
     async def simple_call(self, value) -> object:
         loop = asyncio.get_running_loop()
+        if self.client_mode == "async":
+            try:
+                return await asyncio.wait_for(
+                    bridge_async_result(self._async_simple_call(value), loop), timeout=15.0)
+            except asyncio.TimeoutError:
+                import logging
+                logging.error("RPyC simple_call timeout")
+                return None
+            except Exception as e:
+                import logging
+                logging.error(f"RPyC simple_call error: {e}")
+                return None
         def remote_call():
             try:
-                return self.conn.root.simple_call(value)
+                with self.pool.connection() as conn:
+                    return conn.root.simple_call(value)
             except Exception as e:
                 import logging
                 logging.error(f"RPyC simple_call error: {e}")
@@ -74,10 +315,48 @@ class RPyCImplementation(RPCImplementation):
             logging.error(f"RPyC simple_call unexpected error: {e}")
             return None
 
+    async def simple_call_many(self, values) -> list:
+        loop = asyncio.get_running_loop()
+        values = tuple(values)
+        if self.client_mode == "async":
+            result = await asyncio.wait_for(
+                bridge_async_result(self._async_simple_call_many(values), loop), timeout=60.0)
+            return list(result)
+        def remote_call():
+            with self.pool.connection() as conn:
+                return list(conn.root.simple_call_many(values))
+        return await asyncio.wait_for(loop.run_in_executor(None, remote_call), timeout=60.0)
+
+    async def echo_bytes(self, buf) -> bytes:
+        loop = asyncio.get_running_loop()
+        # Only bytes travels by value; a bytearray, memoryview or array would become a netref
+        data = bytes(buf)
+        if self.client_mode == "async":
+            return await asyncio.wait_for(
+                bridge_async_result(self._async_echo_bytes(data), loop), timeout=60.0)
+        def remote_call():
+            with self.pool.connection() as conn:
+                return conn.root.echo_bytes(data)
+        return await asyncio.wait_for(loop.run_in_executor(None, remote_call), timeout=60.0)
+
     async def stream_values(self, count: int) -> AsyncIterator[int]:
+        if self.stream_chunk_size > 0:
+            async for item in self._stream_values_chunked(count):
+                yield item
+            return
+
         loop = asyncio.get_running_loop()
         def remote_stream():
             return list(self.conn.root.stream_values(count))
         result = await loop.run_in_executor(None, remote_stream)
         for item in result:
             yield item
+
+    async def _stream_values_chunked(self, count: int) -> AsyncIterator[int]:
+        """Stream values in chunks prefetched by a background thread"""
+        def open_chunks():
+            # Runs on the prefetch thread; each next() fetches a whole chunk
+            return self.conn.root.stream_chunks(count, self.stream_chunk_size)
+
+        async for item in prefetch_chunks(open_chunks, self.stream_prefetch):
+            yield item
@@ -0,0 +1,242 @@
+"""
+Message serializers for the message-based backends.
+
+A message is a flat dict with string keys. dumps() turns it into a list of
+frames (bytes-like objects) and loads() turns the frames back into the dict,
+so encoders that keep payloads in separate frames need no extra copying.
+"""
+import json
+import pickle
+import struct
+from array import array
+
+# Payloads at least this large are carried out-of-band by the pickle serializer
+PICKLE_OOB_THRESHOLD = 64 * 1024
+
+# Message key listing the (key, kind) of each payload moved into a trailing raw frame
+RAW_FRAMES_KEY = "_raw"
+
+
+class Serializer:
+    name = None
+
+    def dumps(self, msg: dict) -> list:
+        """Encode a message into a list of frames."""
+        raise NotImplementedError
+
+    def loads(self, frames) -> dict:
+        """
+        Decode a message from the frames produced by dumps(). Frames after the
+        serializer's own are ignored, so raw payload frames may follow them.
+        """
+        raise NotImplementedError
+
+
+class JSONSerializer(Serializer):
+    """One UTF-8 JSON document per message (the original ZMQ wire format)."""
+    name = "json"
+
+    def dumps(self, msg):
+        return [json.dumps(msg, separators=(",", ":")).encode("utf-8")]
+
+    def loads(self, frames):
+        return json.loads(bytes(frames[0]))
+
+
+class BinarySerializer(Serializer):
+    """
+    Compact length-prefixed binary encoding.
+
+    Frame 0 holds one type tag per field; frame 1 holds, for each field, the
+    key (u8 length + ASCII) followed by the value. Strings, bytes and lists are
+    prefixed with a u32 length, integers and floats are fixed width, and lists
+    of integers are packed as a single int64 array.
+    """
+    name = "binary"
+
+    _U8 = struct.Struct("<B")
+    _U32 = struct.Struct("<I")
+    _I64 = struct.Struct("<q")
+    _F64 = struct.Struct("<d")
+
+    def dumps(self, msg):
+        tags = bytearray()
+        body = bytearray()
+        for key, value in msg.items():
+            key_bytes = key.encode("ascii")
+            body += self._U8.pack(len(key_bytes))
+            body += key_bytes
+            tags += self._pack(value, body)
+        return [bytes(tags), bytes(body)]
+
+    def loads(self, frames):
+        tags = bytes(frames[0])
+        body = memoryview(frames[1])
+        msg = {}
+        offset = 0
+        for tag in tags:
+            key_len = body[offset]
+            offset += 1
+            key = str(body[offset:offset + key_len], "ascii")
+            offset += key_len
+            msg[key], offset = self._unpack(tag, body, offset)
+        return msg
+
+    def _pack(self, value, out):
+        """Append the encoded value to out and return its one-byte tag."""
+        if value is None:
+            return b"n"
+        if value is True:
+            return b"t"
+        if value is False:
+            return b"f"
+        if isinstance(value, int):
+            out += self._I64.pack(value)
+            return b"i"
+        if isinstance(value, float):
+            out += self._F64.pack(value)
+            return b"d"
+        if isinstance(value, str):
+            data = value.encode("utf-8")
+            out += self._U32.pack(len(data))
+            out += data
+            return b"s"
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            data = memoryview(value).cast("B")
+            out += self._U32.pack(data.nbytes)
+            out += data
+            return b"b"
+        if isinstance(value, (list, tuple)):
+            if value and all(type(item) is int for item in value):
+                out += self._U32.pack(len(value))
+                out += array("q", value).tobytes()
+                return b"q"
+            out += self._U32.pack(len(value))
+            for item in value:
+                tag_offset = len(out)
+                out += b"\0"
+                out[tag_offset:tag_offset + 1] = self._pack(item, out)
+            return b"l"
+        raise TypeError(f"BinarySerializer cannot encode {type(value).__name__}")
+
+    def _unpack(self, tag, body, offset):
+        """Decode the value with the given tag at offset; returns (value, new offset)."""
+        if tag == ord("n"):
+            return None, offset
+        if tag == ord("t"):
+            return True, offset
+        if tag == ord("f"):
+            return False, offset
+        if tag == ord("i"):
+            return self._I64.unpack_from(body, offset)[0], offset + 8
+        if tag == ord("d"):
+            return self._F64.unpack_from(body, offset)[0], offset + 8
+        (length,) = self._U32.unpack_from(body, offset)
+        offset += 4
+        if tag == ord("s"):
+            return str(body[offset:offset + length], "utf-8"), offset + length
+        if tag == ord("b"):
+            return bytes(body[offset:offset + length]), offset + length
+        if tag == ord("q"):
+            end = offset + 8 * length
+            values = array("q")
+            values.frombytes(body[offset:end])
+            return values.tolist(), end
+        if tag == ord("l"):
+            items = []
+            for _ in range(length):
+                item_tag = body[offset]
+                item, offset = self._unpack(item_tag, body, offset + 1)
+                items.append(item)
+            return items, offset
+        raise ValueError(f"Unknown BinarySerializer tag {chr(tag)!r}")
+
+
+class PickleSerializer(Serializer):
+    """
+    Pickle protocol 5. Bytes-like values of PICKLE_OOB_THRESHOLD or more travel
+    as out-of-band buffers in their own frames instead of being copied into the
+    pickle stream; they decode as memoryviews over the received frames.
+    """
+    name = "pickle"
+
+    def dumps(self, msg):
+        buffers = []
+        msg = {key: self._prepare(value) for key, value in msg.items()}
+        data = pickle.dumps(msg, protocol=5, buffer_callback=buffers.append)
+        return [data] + [buffer.raw() for buffer in buffers]
+
+    @staticmethod
+    def _prepare(value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            if memoryview(value).nbytes >= PICKLE_OOB_THRESHOLD:
+                return pickle.PickleBuffer(value)
+            if isinstance(value, memoryview):
+                return value.tobytes()  # memoryviews cannot be pickled in-band
+        return value
+
+    def loads(self, frames):
+        # pickle only pulls as many buffers as it pickled, leaving any raw frames
+        return pickle.loads(frames[0], buffers=iter(frames[1:]))
+
+
+def byte_view(buf):
+    """Flat unsigned-byte memoryview over any C-contiguous buffer-protocol object, without copying."""
+    return memoryview(buf).cast("B")
+
+
+def split_payloads(msg, threshold, raw_keys=(), split_bytes=True):
+    """
+    Move top-level str and bytes-like values of threshold bytes or more out of
+    msg so they can be sent as raw frames (with copy=False) after the encoded
+    message. Bytes-like values under raw_keys are moved whatever their size.
+    With split_bytes=False only strings are moved, for serializers that carry
+    bytes out-of-band themselves. Returns the message to encode and the list of
+    raw frames; a threshold of 0 keeps every other value inline.
+    """
+    if not threshold and not raw_keys:
+        return msg, []
+    header = {}
+    raw_frames = []
+    kinds = []
+    for key, value in msg.items():
+        if isinstance(value, str) and threshold and len(value) >= threshold:
+            raw_frames.append(value.encode("utf-8"))
+            kinds.append([key, "s"])
+        elif split_bytes and isinstance(value, (bytes, bytearray, memoryview)) and (
+                key in raw_keys or threshold and memoryview(value).nbytes >= threshold):
+            raw_frames.append(value)
+            kinds.append([key, "b"])
+        else:
+            header[key] = value
+    if kinds:
+        header[RAW_FRAMES_KEY] = kinds
+    return header, raw_frames
+
+
+def join_payloads(msg, frames):
+    """
+    Restore the payloads moved out by split_payloads() from the trailing frames.
+    Bytes payloads are returned as memoryviews over the received frames.
+    """
+    kinds = msg.pop(RAW_FRAMES_KEY, None)
+    if not kinds:
+        return msg
+    for (key, kind), frame in zip(kinds, frames[-len(kinds):]):
+        buffer = memoryview(frame)
+        msg[key] = str(buffer, "utf-8") if kind == "s" else buffer
+    return msg
+
+
+SERIALIZERS = {
+    serializer.name: serializer
+    for serializer in (JSONSerializer, BinarySerializer, PickleSerializer)
+}
+
+
+def get_serializer(name):
+    """Return a serializer instance by name ("json", "binary" or "pickle")."""
+    try:
+        return SERIALIZERS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown serializer: {name}. Choose from {', '.join(SERIALIZERS)}") from None
@@ -0,0 +1,400 @@
+"""
+Shared-memory RPC backend for same-host calls.
+
+Client and server share one multiprocessing.shared_memory segment holding two
+single-producer/single-consumer rings: requests flow through the first,
+replies through the second. A record in a ring is the asyncio backend's
+message (request id, kind, serializer frames) behind a <I length, so the
+call, batch and credit-based stream protocol are the same as there; only the
+socket is replaced. After writing a record the producer rings a doorbell, one
+byte written to a named FIFO that the consumer's event loop watches.
+
+Payloads of shm_threshold bytes or more skip the rings: the sender copies
+each into a block taken from its SharedMemoryArena and sends the block's
+name, the receiver reads it in place and sends a RELEASE record back, and
+the sender returns the block to its arena for the next payload. Blocks are
+created by the sending process, tracked as usual and unlinked when its
+channel closes, whether or not the peer ever read them.
+"""
+import asyncio
+import collections
+import logging
+import os
+import struct
+import tempfile
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+
+from implementations.asyncio_impl import AsyncioImplementation, AsyncioServer
+from implementations.offload import SharedMemoryArena, attach_segment
+from implementations.serializers import RAW_FRAMES_KEY, get_serializer, join_payloads, split_payloads
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RING_SIZE = 4 * 1024 * 1024
+
+# Below this size, copying through the ring beats mapping a block of its own
+DEFAULT_SHM_THRESHOLD = 256 * 1024
+
+# Message key listing the [name, size] of each payload moved into its own block
+SHM_BLOCKS_KEY = "_shm"
+
+# Record kind, after the asyncio backend's, listing the blocks a receiver has read
+RELEASE = 255
+
+# Free blocks of each capacity an arena keeps for reuse
+MAX_FREE_BLOCKS = 4
+
+# Seconds a producer waits before retrying a full ring
+RING_FULL_BACKOFF = 0.0005
+
+_RECORD = struct.Struct("<QBB")  # request id, message kind, number of frames
+_FRAME_LENGTH = struct.Struct("<I")
+
+
+def doorbell_path(name, direction):
+    """Named FIFO signalling new records in one direction ("req" or "resp")."""
+    return os.path.join(tempfile.gettempdir(), f"art-benchmark-{name}.{direction}")
+
+
+def remove_shm_resources(name):
+    """Remove the segment and doorbells of a server that could not clean up after itself."""
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        pass
+    else:
+        segment.close()
+        segment.unlink()
+    for direction in ("req", "resp"):
+        try:
+            os.unlink(doorbell_path(name, direction))
+        except FileNotFoundError:
+            pass
+
+
+class ShmRing:
+    """Single-producer, single-consumer ring of length-prefixed records in a shared buffer."""
+
+    _INDEX = struct.Struct("<Q")
+    # Write and read counters, on a cache line of their own before the data
+    HEADER_SIZE = 64
+
+    def __init__(self, buf, offset, size):
+        self._buf = buf
+        self._head_at = offset  # Total bytes ever written; only the producer updates it
+        self._tail_at = offset + 8  # Total bytes ever read; only the consumer updates it
+        self._data = buf[offset + self.HEADER_SIZE:offset + size]
+        self.capacity = size - self.HEADER_SIZE
+
+    def try_write(self, parts):
+        """Append one record made of parts; returns False if the ring lacks the room."""
+        length = sum(memoryview(part).nbytes for part in parts)
+        needed = _FRAME_LENGTH.size + length
+        if needed > self.capacity:
+            raise ValueError(f"Message of {length} bytes does not fit in a {self.capacity} byte ring")
+        head = self._INDEX.unpack_from(self._buf, self._head_at)[0]
+        tail = self._INDEX.unpack_from(self._buf, self._tail_at)[0]
+        if self.capacity - (head - tail) < needed:
+            return False
+        position = self._copy_in(head, _FRAME_LENGTH.pack(length))
+        for part in parts:
+            position = self._copy_in(position, part)
+        # Publish the record only once all of it is in place
+        self._INDEX.pack_into(self._buf, self._head_at, position)
+        return True
+
+    def try_read(self):
+        """Remove and return the oldest record, or None if the ring is empty."""
+        head = self._INDEX.unpack_from(self._buf, self._head_at)[0]
+        tail = self._INDEX.unpack_from(self._buf, self._tail_at)[0]
+        if head == tail:
+            return None
+        (length,) = _FRAME_LENGTH.unpack(self._copy_out(tail, _FRAME_LENGTH.size))
+        record = self._copy_out(tail + _FRAME_LENGTH.size, length)
+        self._INDEX.pack_into(self._buf, self._tail_at, tail + _FRAME_LENGTH.size + length)
+        return record
+
+    def _copy_in(self, position, data):
+        data = memoryview(data).cast("B")
+        start = position % self.capacity
+        first = min(data.nbytes, self.capacity - start)
+        self._data[start:start + first] = data[:first]
+        if first < data.nbytes:
+            self._data[:data.nbytes - first] = data[first:]
+        return position + data.nbytes
+
+    def _copy_out(self, position, size):
+        out = bytearray(size)
+        start = position % self.capacity
+        first = min(size, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        if first < size:
+            out[first:] = self._data[:size - first]
+        return out
+
+    def release(self):
+        self._data.release()
+
+
+def _publish_block(arena, payload):
+    """Copy payload into a block from arena; returns the block and the [name, size] sent for it."""
+    data = memoryview(payload).cast("B")
+    block = arena.acquire(max(1, data.nbytes))
+    block.buf[:data.nbytes] = data
+    return block, [block.name, data.nbytes]
+
+
+def _join_blocks(msg, blocks):
+    """Restore the payloads published by _publish_block(); the blocks can be released afterwards."""
+    views = [attach_segment(name).buf[:size] for name, size in blocks]
+    kinds = list(msg[RAW_FRAMES_KEY])
+    msg = join_payloads(msg, views)
+    for key, kind in kinds:
+        if kind == "b":
+            # Read straight out of the block, before the sender reuses it
+            msg[key] = bytes(msg[key])
+    for view in views:
+        view.release()
+    return msg
+
+
+def encode_record(serializer, request_id, kind, msg, shm_threshold, arena):
+    """Encode a message into the parts of one ring record and the blocks its payloads went into."""
+    header, payloads = split_payloads(msg, shm_threshold)
+    blocks = []
+    if payloads:
+        header[SHM_BLOCKS_KEY] = []
+        for payload in payloads:
+            block, entry = _publish_block(arena, payload)
+            blocks.append(block)
+            header[SHM_BLOCKS_KEY].append(entry)
+    frames = serializer.dumps(header)
+    parts = [_RECORD.pack(request_id, kind, len(frames))]
+    for frame in frames:
+        parts.append(_FRAME_LENGTH.pack(memoryview(frame).nbytes))
+        parts.append(frame)
+    return parts, blocks
+
+
+def decode_record(serializer, record):
+    """Decode a ring record into (request id, kind, msg)."""
+    body = memoryview(record)
+    request_id, kind, frame_count = _RECORD.unpack_from(body)
+    offset = _RECORD.size
+    frames = []
+    for _ in range(frame_count):
+        (size,) = _FRAME_LENGTH.unpack_from(body, offset)
+        offset += _FRAME_LENGTH.size
+        frames.append(body[offset:offset + size])
+        offset += size
+    return request_id, kind, serializer.loads(frames)
+
+
+class RingChannel:
+    """One end of a shared-memory connection: an outgoing and an incoming ring with their doorbells."""
+
+    def __init__(self, buf, ring_size, name, is_server, serializer, shm_threshold):
+        requests = ShmRing(buf, 0, ring_size)
+        replies = ShmRing(buf, ring_size, ring_size)
+        self.outgoing, self.incoming = (replies, requests) if is_server else (requests, replies)
+        out_direction, in_direction = ("resp", "req") if is_server else ("req", "resp")
+        # O_RDWR keeps the FIFOs open regardless of the peer, so neither end blocks or sees EOF
+        self._out_fd = os.open(doorbell_path(name, out_direction), os.O_RDWR | os.O_NONBLOCK)
+        self._in_fd = os.open(doorbell_path(name, in_direction), os.O_RDWR | os.O_NONBLOCK)
+        self.serializer = serializer
+        self.shm_threshold = shm_threshold
+        self.arena = SharedMemoryArena(min_size=max(1, shm_threshold), max_free=MAX_FREE_BLOCKS)
+        self._blocks = {}  # name -> block sent to the peer and not yet released by it
+        self._outbox = collections.deque()  # Records waiting for room in the outgoing ring
+        self._flusher = None
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self._in_fd, self._on_doorbell)
+
+    def _on_doorbell(self):
+        try:
+            os.read(self._in_fd, 4096)
+        except BlockingIOError:
+            pass
+        self._ready.set()
+
+    def _ring_doorbell(self):
+        try:
+            os.write(self._out_fd, b"\0")
+        except BlockingIOError:
+            pass  # The FIFO is full of unread rings; the peer is already awake
+
+    def send(self, request_id, kind, msg):
+        """Queue a message; it is written to the ring now if there is room, else by flush()."""
+        parts, blocks = encode_record(self.serializer, request_id, kind, msg, self.shm_threshold, self.arena)
+        for block in blocks:
+            self._blocks[block.name] = block
+        if not self._outbox and self.outgoing.try_write(parts):
+            self._ring_doorbell()
+            return
+        self._outbox.append(parts)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._drain_outbox())
+
+    async def flush(self):
+        """Wait until every queued message is in the ring."""
+        if self._flusher is not None and not self._flusher.done():
+            await asyncio.shield(self._flusher)
+
+    async def _drain_outbox(self):
+        while self._outbox:
+            if self.outgoing.try_write(self._outbox[0]):
+                self._outbox.popleft()
+                self._ring_doorbell()
+            else:
+                await asyncio.sleep(RING_FULL_BACKOFF)
+
+    async def receive(self):
+        """Wait for the next message; returns (request id, kind, msg)."""
+        while True:
+            while (record := self.incoming.try_read()) is None:
+                # Any record written from now on rings the doorbell again
+                self._ready.clear()
+                await self._ready.wait()
+            request_id, kind, msg = decode_record(self.serializer, record)
+            if kind == RELEASE:
+                # The peer has read these blocks; they can carry the next payloads
+                for name in msg[SHM_BLOCKS_KEY]:
+                    self.arena.release(self._blocks.pop(name))
+                continue
+            blocks = msg.pop(SHM_BLOCKS_KEY, None)
+            if blocks:
+                msg = _join_blocks(msg, blocks)
+                self.send(0, RELEASE, {SHM_BLOCKS_KEY: [name for name, _ in blocks]})
+            return request_id, kind, msg
+
+    def close(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+        self._loop.remove_reader(self._in_fd)
+        os.close(self._in_fd)
+        os.close(self._out_fd)
+        self.outgoing.release()
+        self.incoming.release()
+        # Unlinks every block, including those the peer never released
+        self._blocks.clear()
+        self.arena.close()
+
+
+class SharedMemoryServer(AsyncioServer):
+    """Serves one client through a shared memory segment; answers like AsyncioServer."""
+
+    def __init__(self, name, ring_size=DEFAULT_RING_SIZE, serializer="binary", shm_threshold=DEFAULT_SHM_THRESHOLD):
+        self.name = name
+        self.ring_size = ring_size
+        self.serializer = get_serializer(serializer)
+        self.shm_threshold = shm_threshold
+        self.shm = None
+        self.channel = None
+        self.task = None
+
+    async def start(self):
+        remove_shm_resources(self.name)
+        self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=2 * self.ring_size)
+        for direction in ("req", "resp"):
+            os.mkfifo(doorbell_path(self.name, direction))
+        self.channel = RingChannel(self.shm.buf, self.ring_size, self.name, True,
+                                   self.serializer, self.shm_threshold)
+        self.task = asyncio.create_task(self._serve())
+        logger.info("Shared-memory RPC server listening on segment %s", self.name)
+
+    async def _serve(self):
+        streams = {}  # request id -> (task pushing that stream, its chunk credits)
+        try:
+            while True:
+                request_id, kind, msg = await self.channel.receive()
+                self._handle_message(request_id, kind, msg, streams,
+                                     self.channel.send, self.channel.flush)
+                await self.channel.flush()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._cancel_streams(streams)
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        if self.channel:
+            self.channel.close()
+            self.channel = None
+        if self.shm:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        remove_shm_resources(self.name)
+
+
+class SharedMemoryImplementation(AsyncioImplementation):
+    def __init__(self, name=None, external_server=False, ring_size=DEFAULT_RING_SIZE, serializer="binary",
+                 shm_threshold=DEFAULT_SHM_THRESHOLD, stream_chunk_size=100, stream_credits=8):
+        """
+        name: shared memory segment (and doorbell) name; must match the server's.
+        ring_size: bytes per direction; a message must fit in one ring.
+        shm_threshold: payloads of this many bytes or more travel in a pooled block (0 = never).
+        """
+        if os.name == "nt":
+            raise RuntimeError("The shared-memory backend needs POSIX named FIFOs")
+        super().__init__(external_server=True, serializer=serializer,
+                         stream_chunk_size=stream_chunk_size, stream_credits=stream_credits)
+        self.name = name or f"art{uuid.uuid4().hex[:16]}"
+        self.external_server = external_server
+        self.ring_size = ring_size
+        self.shm_threshold = shm_threshold
+        self.server = None if external_server else SharedMemoryServer(
+            self.name, ring_size, serializer, shm_threshold)
+        self.shm = None
+        self.channel = None
+
+    async def setup(self):
+        if self.server:
+            await self.server.start()
+            self.shm = self.server.shm
+        else:
+            self.shm = shared_memory.SharedMemory(name=self.name)
+            # The server owns and unlinks the segment
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.channel = RingChannel(self.shm.buf, self.ring_size, self.name, False,
+                                   self.serializer, self.shm_threshold)
+        self.receiver_task = asyncio.create_task(self._receive())
+
+    async def teardown(self):
+        if self.receiver_task:
+            self.receiver_task.cancel()
+            try:
+                await self.receiver_task
+            except asyncio.CancelledError:
+                pass
+            self.receiver_task = None
+        self._fail_pending(RuntimeError("Shared-memory RPC client shut down"))
+        if self.channel:
+            self.channel.close()
+            self.channel = None
+        if self.server:
+            await self.server.close()
+        elif self.shm:
+            self.shm.close()
+        self.shm = None
+
+    def _send(self, request_id, kind, msg):
+        self.channel.send(request_id, kind, msg)
+
+    async def _flush(self):
+        await self.channel.flush()
+
+    def _connected(self):
+        return self.channel is not None
+
+    async def _receive(self):
+        while True:
+            self._dispatch(*await self.channel.receive())
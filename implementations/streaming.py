@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Callable, Iterable
+
+# Marks the end of the chunk stream in the prefetch queue
+_END = object()
+
+
+async def prefetch_chunks(open_chunks: Callable[[], Iterable], prefetch_depth: int = 2) -> AsyncIterator:
+    """
+    Yield the items of a blocking, chunked stream as the chunks arrive.
+
+    open_chunks is called on a background thread and must return an iterable of
+    chunks (sequences of items); the thread keeps fetching chunks ahead of the
+    consumer, handing them over to the event loop without ever blocking on it;
+    at most prefetch_depth chunks are buffered regardless of the stream length.
+    """
+    if prefetch_depth < 1:
+        raise ValueError("prefetch_depth must be at least 1")
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    # One slot per chunk handed over but not yet taken by the consumer
+    slots = threading.Semaphore(prefetch_depth)
+    stop = threading.Event()
+
+    def put(item):
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def produce():
+        try:
+            chunks = open_chunks()
+            try:
+                for chunk in chunks:
+                    # Backpressure: wait for the consumer to take a chunk, or to stop
+                    slots.acquire()
+                    if stop.is_set():
+                        break
+                    put(chunk)
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+            if not stop.is_set():
+                put(_END)
+        except Exception as e:
+            if not stop.is_set():
+                logging.error(f"Error while prefetching stream chunks: {e}")
+                put(e)
+
+    producer = threading.Thread(target=produce, name="StreamPrefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is _END:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            slots.release()
+            for item in chunk:
+                yield item
+    finally:
+        stop.set()
+        # Wake a producer waiting for a slot so it can observe the stop flag
+        slots.release()
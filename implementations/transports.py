@@ -0,0 +1,27 @@
+import contextlib
+import os
+import tempfile
+
+# Same-host transports: loopback TCP or local (Unix domain) sockets
+TRANSPORTS = ("tcp", "ipc")
+
+
+def ipc_path(name: str, port: int) -> str:
+    """
+    Filesystem path of the local socket standing in for a TCP port.
+
+    Keying the path on the port lets launchers and clients that already agree
+    on a port number find the same socket without extra plumbing.
+    """
+    return os.path.join(tempfile.gettempdir(), f"art-benchmark-{name}-{port}.sock")
+
+
+def check_transport(transport: str):
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport: {transport}. Choose from {', '.join(TRANSPORTS)}")
+
+
+def remove_socket_file(socket_path):
+    """Remove a Unix socket file left behind by a previous server, if any."""
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(socket_path)
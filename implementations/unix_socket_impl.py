@@ -0,0 +1,46 @@
+import os
+import socket
+import rpyc
+from rpyc.core.stream import SocketStream
+from rpyc.utils.server import ThreadedServer
+from implementations.rpyc_impl import BenchmarkService, RPyCImplementation
+from implementations.transports import ipc_path, remove_socket_file
+
+
+def create_unix_socket_server(socket_path):
+    """ThreadedServer for BenchmarkService listening on a Unix domain socket."""
+    # bind() fails with EADDRINUSE while a stale socket file exists
+    remove_socket_file(socket_path)
+    return ThreadedServer(
+        BenchmarkService,
+        socket_path=socket_path,
+        protocol_config={"allow_public_attrs": True}
+    )
+
+
+class UnixSocketImplementation(RPyCImplementation):
+    """
+    RPyC over an AF_UNIX socket: the POSIX counterpart of NamedPipeImplementation.
+
+    Same service, client modes, connection pool and streaming as
+    RPyCImplementation; only the stream underneath the connection changes.
+    """
+
+    def __init__(self, socket_path=None, external_server=False, **kwargs):
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("Unix domain sockets are not supported on this platform")
+        # Needed by _create_server(), which the base constructor calls
+        self.socket_path = socket_path or ipc_path("rpyc", os.getpid())
+        self.external_server = external_server
+        super().__init__(external_server=external_server, **kwargs)
+
+    def _create_server(self):
+        return create_unix_socket_server(self.socket_path)
+
+    def _connect(self):
+        return rpyc.connect_stream(SocketStream.unix_connect(self.socket_path))
+
+    async def teardown(self):
+        await super().teardown()
+        if not self.external_server:
+            remove_socket_file(self.socket_path)
@@ -1,37 +1,65 @@
 import asyncio
+import itertools
 import logging
-import threading
 import time
 import uuid
 
 import zmq
 import zmq.asyncio
 from interface import RPCImplementation
+from implementations.operations import double
+from implementations.serializers import byte_view, get_serializer, join_payloads, split_payloads
+from implementations.transports import check_transport, ipc_path
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Message key of echo_bytes() payloads; they always travel as a raw frame
+BYTES_KEY = "data"
+
+# Milliseconds a stream socket may linger on close to deliver a cancel message
+CANCEL_LINGER_MS = 1000
+
 
 class ZMQImplementation(RPCImplementation):
-    def __init__(self, external_server=False):
+    def __init__(self, external_server=False, stream_window=64, serializer="json",
+                 zero_copy_threshold=64 * 1024, transport="tcp", port=5555, stream_port=5556):
         logger.info(
-            "Initializing ZMQImplementation (external_server=%s)", external_server)
+            "Initializing ZMQImplementation (external_server=%s, serializer=%s, transport=%s)",
+            external_server, serializer, transport)
+        check_transport(transport)
         self.server_ctx = zmq.asyncio.Context()  # Context for server operations
         self.client_ctx = zmq.asyncio.Context()  # Separate context for client operations
         self.external_server = external_server
         
-        # Use different ports for simple calls and streaming
-        self.simple_endpoint = "tcp://127.0.0.1:5555"
-        self.stream_endpoint = "tcp://127.0.0.1:5556"
+        # Use different ports for simple calls and streaming; over ipc the port
+        # numbers only name the socket files
+        self.transport = transport
+        self.simple_endpoint = self._endpoint(port)
+        self.stream_endpoint = self._endpoint(stream_port)
         
         self.simple_server_task = None
         self.stream_server_task = None
         self.simple_server_ready = asyncio.Event()  # Event for simple server readiness
         self.stream_server_ready = asyncio.Event()  # Event for stream server readiness
         
-        # Shared client socket for all simple_call operations
+        # Number of stream values the server may send ahead of the consumer
+        self.stream_window = stream_window
+
+        # Message encoding used by both servers and the client ("json", "binary", "pickle");
+        # a message travels as [identity, b"", *frames]
+        self.serializer = get_serializer(serializer)
+
+        # Simple-call payloads of at least this many bytes are sent as separate raw
+        # frames with copy=False and received as zero-copy frames; 0 keeps them inline
+        self.zero_copy_threshold = zero_copy_threshold
+
+        # Shared client socket for all simple_call operations; requests carry a
+        # correlation ID and a single receiver task resolves the matching future
         self.client_socket = None
-        self.client_socket_lock = asyncio.Lock()  # Lock for thread safety
+        self.client_receiver_task = None
+        self._pending_calls = {}  # correlation ID -> future
+        self._call_ids = itertools.count()
 
         # REMOVED Shared client socket for stream_values operations
         # self.stream_client_socket = None
@@ -54,55 +82,72 @@ class ZMQImplementation(RPCImplementation):
                 await asyncio.wait_for(self.simple_server_ready.wait(), timeout=5.0)
                 await asyncio.wait_for(self.stream_server_ready.wait(), timeout=5.0)
                 logger.info("ZMQ servers are ready.")
-                
-                # Create shared client socket for simple calls
-                self.client_socket = self.client_ctx.socket(zmq.DEALER)
-                self.client_socket.setsockopt(zmq.IDENTITY, b"client-shared-socket")
-                self.client_socket.setsockopt(zmq.LINGER, 1000)  # Longer linger time
-                self.client_socket.setsockopt(zmq.RCVTIMEO, 10000)  # 10 second timeout
-                self.client_socket.connect(self.simple_endpoint)
-                logger.info("Created shared client socket")
-
-                # REMOVED Creation of shared stream client socket
-
-                # Test basic communication with retries
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        result = await asyncio.wait_for(
-                            self.test_basic_communication(),
-                            timeout=5.0
-                        )
-                        if result:
-                            logger.info("Basic ZMQ communication test passed")
-                            break
-                        else:
-                            logger.warning(f"Basic ZMQ communication test failed (attempt {attempt+1}/{max_retries})")
-                            if attempt < max_retries - 1:
-                                await asyncio.sleep(1)  # Wait before retry
-                    except asyncio.TimeoutError:
-                        logger.warning(f"Timeout in basic communication test (attempt {attempt+1}/{max_retries})")
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(1)  # Wait before retry
-                    except Exception as e:
-                        logger.error(f"Error in basic communication test: {e}")
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(1)  # Wait before retry
-                        else:
-                            raise
-                else:
-                    # This runs if the for loop completes without a break
-                    logger.error("All basic ZMQ communication test attempts failed")
-                    raise RuntimeError("Failed to establish basic ZMQ communication")
-                    
             except asyncio.TimeoutError:
                 logger.error("ZMQ servers did not become ready in time.")
                 raise RuntimeError("ZMQ servers failed to start")
 
+        # Create shared client socket for simple calls (also when the servers run in another process)
+        self.client_socket = self.client_ctx.socket(zmq.DEALER)
+        # Unique identity: a launched server process connects its own client to the same ROUTER
+        self.client_socket.setsockopt(zmq.IDENTITY, f"client-{uuid.uuid4().hex}".encode())
+        self.client_socket.setsockopt(zmq.LINGER, 1000)  # Longer linger time
+        self._configure_zero_copy(self.client_socket)
+        # No RCVTIMEO: the receiver task idles between calls, timeouts are per call
+        self.client_socket.connect(self.simple_endpoint)
+        self.client_receiver_task = asyncio.create_task(self.run_client_receiver())
+        logger.info("Created shared client socket")
+
+        # Test basic communication with retries
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                result = await asyncio.wait_for(
+                    self.test_basic_communication(),
+                    timeout=5.0
+                )
+                if result:
+                    logger.info("Basic ZMQ communication test passed")
+                    break
+                else:
+                    logger.warning(f"Basic ZMQ communication test failed (attempt {attempt+1}/{max_retries})")
+                    if attempt < max_retries - 1:
+                        await asyncio.sleep(1)  # Wait before retry
+            except asyncio.TimeoutError:
+                logger.warning(f"Timeout in basic communication test (attempt {attempt+1}/{max_retries})")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1)  # Wait before retry
+            except Exception as e:
+                logger.error(f"Error in basic communication test: {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1)  # Wait before retry
+                else:
+                    raise
+        else:
+            # This runs if the for loop completes without a break
+            logger.error("All basic ZMQ communication test attempts failed")
+            raise RuntimeError("Failed to establish basic ZMQ communication")
+
+    def _endpoint(self, port):
+        if self.transport == "ipc":
+            return f"ipc://{ipc_path('zmq', port)}"
+        return f"tcp://127.0.0.1:{port}"
+
     async def teardown(self):
         logger.info("Tearing down ZMQ implementation")
 
-        # Close the shared client socket first
+        # Stop dispatching replies, then close the shared client socket
+        if self.client_receiver_task:
+            self.client_receiver_task.cancel()
+            try:
+                await self.client_receiver_task
+            except asyncio.CancelledError:
+                pass
+            self.client_receiver_task = None
+        for future in self._pending_calls.values():
+            if not future.done():
+                future.set_exception(RuntimeError("ZMQ client shut down"))
+        self._pending_calls.clear()
+
         if self.client_socket and not self.client_socket.closed:
             try:
                 self.client_socket.close()
@@ -156,9 +201,9 @@ class ZMQImplementation(RPCImplementation):
         client_socket.connect(self.simple_endpoint)
         
         # Send a simple test message
-        test_message = b'{"test": true}'
+        test_message = {"test": True}
         logger.info(f"CLIENT: Sending test message: {test_message}")
-        await client_socket.send_multipart([b"", test_message])
+        await client_socket.send_multipart([b"", *self.serializer.dumps(test_message)])
         logger.info("CLIENT: Test message sent")
         
         # Wait for response
@@ -166,8 +211,8 @@ class ZMQImplementation(RPCImplementation):
             logger.info("CLIENT: Waiting for response")
             # Yield control to event loop before waiting for response
             await asyncio.sleep(0)
-            _, response = await asyncio.wait_for(client_socket.recv_multipart(), timeout=5.0)
-            logger.info(f"CLIENT: Received response: {response}")
+            response = await asyncio.wait_for(client_socket.recv_multipart(), timeout=5.0)
+            logger.info(f"CLIENT: Received response: {self.serializer.loads(response[1:])}")
             client_socket.close()
             
             # Test 2: Stream message
@@ -177,9 +222,9 @@ class ZMQImplementation(RPCImplementation):
             stream_socket.setsockopt(zmq.RCVTIMEO, 5000)  # 5 second timeout
             stream_socket.connect(self.stream_endpoint)
             
-            stream_message = zmq.utils.jsonapi.dumps({"count": 1, "request_id": "test-stream"})
+            stream_message = {"count": 1, "request_id": "test-stream"}
             logger.info(f"CLIENT: Sending stream test message: {stream_message}")
-            await stream_socket.send_multipart([b"", stream_message])
+            await stream_socket.send_multipart([b"", *self.serializer.dumps(stream_message)])
             logger.info("CLIENT: Stream test message sent")
             
             # Yield control to event loop before waiting for response
@@ -187,8 +232,8 @@ class ZMQImplementation(RPCImplementation):
             
             try:
                 logger.info("CLIENT: Waiting for stream response")
-                _, stream_response = await asyncio.wait_for(stream_socket.recv_multipart(), timeout=5.0)
-                logger.info(f"CLIENT: Received stream response: {stream_response}")
+                stream_response = await asyncio.wait_for(stream_socket.recv_multipart(), timeout=5.0)
+                logger.info(f"CLIENT: Received stream response: {self.serializer.loads(stream_response[1:])}")
                 return True
             except asyncio.TimeoutError:
                 logger.error("CLIENT: Timeout waiting for stream response")
@@ -208,6 +253,7 @@ class ZMQImplementation(RPCImplementation):
         logger.info("Starting ZMQ ROUTER server for simple calls on %s (event loop: %d)", self.simple_endpoint, loop_id)
         socket = self.server_ctx.socket(zmq.ROUTER)
         socket.setsockopt(zmq.LINGER, 0)  # Ensure immediate close when needed
+        self._configure_zero_copy(socket)
         socket.bind(self.simple_endpoint)
         
         # Signal readiness after binding
@@ -215,36 +261,25 @@ class ZMQImplementation(RPCImplementation):
         self.simple_server_ready.set()  # Signal that the server is ready
         logger.info("ZMQ simple server bound and ready event set.")
 
+        # Requests are handled in their own tasks so replies go out as soon as they are ready
+        handlers = set()
+
         try:  # Main server loop
             while True:
                 try:
-                    # This is already non-blocking with zmq.asyncio
-                    # Add a timeout to prevent blocking forever
-                    multipart = await asyncio.wait_for(
-                        socket.recv_multipart(),
-                        timeout=1.0  # 1 second timeout to allow for clean cancellation
-                    )
+                    # Cancellation interrupts the await directly, so no receive timeout is needed
+                    multipart = await socket.recv_multipart(copy=not self.zero_copy_threshold)
                     
-                    if len(multipart) != 3:
+                    if len(multipart) < 3:
                         continue
                     
-                    identity, empty, message = multipart
-
-                    # Yield after receiving before processing
-                    await asyncio.sleep(0)
+                    identity = multipart[0]
 
                     try:
-                        msg = zmq.utils.jsonapi.loads(message)
+                        msg = self._decode(multipart[2:])
                     except Exception:
-                        error_response = zmq.utils.jsonapi.dumps({"error": "Invalid JSON format"})
-                        await socket.send_multipart([identity, b"", error_response])
-                        # Yield after sending error response
-                        await asyncio.sleep(0)
+                        await self._send(socket, identity, {"error": "Invalid message format"})
                         continue
-                except asyncio.TimeoutError:
-                    # This is just a timeout on the recv_multipart to allow for clean cancellation
-                    # Just continue the loop
-                    continue
                 except asyncio.CancelledError:
                     raise
                 except Exception:
@@ -253,43 +288,61 @@ class ZMQImplementation(RPCImplementation):
                     # Continue the loop to keep the server running
                     continue
 
-                # Handle test message
-                if "test" in msg and msg["test"] is True:
-                    response = zmq.utils.jsonapi.dumps({"test_response": True})
-                    await socket.send_multipart([identity, b"", response])
-                    # Yield after sending test response
-                    await asyncio.sleep(0)
-                    continue
-
-                # Process simple call
-                if "value" in msg:  # Simple call
-                    value = msg["value"]
-                    if isinstance(value, str):
-                        # Handle large payload test
-                        result = value + value
-                    else:
-                        # Handle numeric value
-                        result = value * 2
-
-                    response = zmq.utils.jsonapi.dumps({"result": result})
-                    await socket.send_multipart([identity, b"", response])
-                    # Yield after sending simple call response
-                    await asyncio.sleep(0)
-                else:
-                    error_response = zmq.utils.jsonapi.dumps(
-                        {"error": "Unknown request format"})
-                    await socket.send_multipart([identity, b"", error_response])
-                    # Yield after sending unknown format error
-                    await asyncio.sleep(0)
+                handler = asyncio.create_task(self._handle_simple_request(socket, identity, msg))
+                handlers.add(handler)
+                handler.add_done_callback(handlers.discard)
         except asyncio.CancelledError:
             logger.info("ZMQ simple server task cancelled.")
         except Exception as e:
             logger.error("ZMQ simple server error: %s", e, exc_info=True)
         finally:
+            for handler in handlers:
+                handler.cancel()
             self.simple_server_ready.clear()  # Clear readiness on exit
             socket.setsockopt(zmq.LINGER, 0)  # Ensure immediate close
             socket.close()
             
+    async def _handle_simple_request(self, socket, identity, msg):
+        """Handle one simple-call request and reply with the caller's correlation ID."""
+        # Handle test message
+        if "test" in msg and msg["test"] is True:
+            await self._send(socket, identity, {"test_response": True})
+            return
+
+        reply = {"id": msg.get("id")}
+        # Process simple call
+        if "value" in msg:  # Simple call
+            reply["result"] = double(msg["value"])
+        elif "values" in msg:  # Batched simple call
+            reply["results"] = [double(value) for value in msg["values"]]
+        elif BYTES_KEY in msg:  # Echo: send the received frame straight back
+            reply[BYTES_KEY] = msg[BYTES_KEY]
+        else:
+            reply["error"] = "Unknown request format"
+        await self._send(socket, identity, reply)
+
+    async def _send(self, socket, identity, msg):
+        """Encode a message with the configured serializer and route it to identity."""
+        frames, zero_copy = self._encode(msg)
+        await socket.send_multipart([identity, b"", *frames], copy=not zero_copy)
+
+    def _encode(self, msg):
+        """
+        Encode msg into frames, moving large payloads into trailing raw frames.
+        Returns the frames and whether they should be sent without copying.
+        """
+        header, raw_frames = split_payloads(msg, self.zero_copy_threshold, raw_keys=(BYTES_KEY,))
+        return self.serializer.dumps(header) + raw_frames, bool(raw_frames)
+
+    def _decode(self, frames):
+        """Decode the frames produced by _encode() back into a message."""
+        return join_payloads(self.serializer.loads(frames), frames)
+
+    def _configure_zero_copy(self, socket):
+        """Let pyzmq hand frames over the zero-copy threshold to libzmq without copying."""
+        if self.zero_copy_threshold:
+            socket.copy_threshold = self.zero_copy_threshold
+
     async def run_stream_server(self):
         """Runs a ROUTER socket server that handles streaming only."""
         loop_id = id(asyncio.get_running_loop())
@@ -319,23 +372,22 @@ class ZMQImplementation(RPCImplementation):
                     # Log the raw bytes received
                     logger.debug("STREAM SERVER: Received multipart message with %d parts", len(multipart))
                     
-                    if len(multipart) != 3:
-                        logger.error("STREAM SERVER: Invalid message format (expected 3 parts, got %d)", len(multipart))
+                    if len(multipart) < 3:
+                        logger.error("STREAM SERVER: Invalid message format (expected at least 3 parts, got %d)", len(multipart))
                         continue
                     
-                    identity, empty, message = multipart
+                    identity = multipart[0]
                     logger.debug("STREAM SERVER: Message from identity: %r", identity)
 
                     # Yield after receiving before processing
                     await asyncio.sleep(0)
 
                     try:
-                        msg = zmq.utils.jsonapi.loads(message)
-                        logger.debug("STREAM SERVER: Successfully parsed JSON message: %s", msg)
+                        msg = self.serializer.loads(multipart[2:])
+                        logger.debug("STREAM SERVER: Successfully decoded message: %s", msg)
                     except Exception as e:
-                        logger.error("STREAM SERVER: Failed to parse JSON message: %s. Error: %s", message, e)
-                        error_response = zmq.utils.jsonapi.dumps({"error": "Invalid JSON format"})
-                        await socket.send_multipart([identity, b"", error_response])
+                        logger.error("STREAM SERVER: Failed to decode message: %s. Error: %s", multipart[2:], e)
+                        await self._send(socket, identity, {"error": "Invalid message format"})
                         await asyncio.sleep(0) # Yield after sending error response
                         continue
                 except asyncio.TimeoutError:
@@ -354,8 +406,7 @@ class ZMQImplementation(RPCImplementation):
                 # Handle test message
                 if "test" in msg and msg["test"] is True:
                     logger.info("STREAM SERVER: Received test message, sending response")
-                    response = zmq.utils.jsonapi.dumps({"test_response": True})
-                    await socket.send_multipart([identity, b"", response])
+                    await self._send(socket, identity, {"test_response": True})
                     await asyncio.sleep(0) # Yield after sending test response
                     continue
 
@@ -369,60 +420,40 @@ class ZMQImplementation(RPCImplementation):
                     if count <= 0:
                         # Handle empty stream case
                         logger.debug("STREAM SERVER: Empty stream requested, sending None value")
-                        await socket.send_multipart([identity, b"", zmq.utils.jsonapi.dumps({"value": None})])
+                        await self._send(socket, identity, {"value": None})
                         continue
 
-                    # Store stream state
+                    # Store stream state; credits is how many values we may send unprompted
                     streams[request_id] = {
                         "current": 0,
                         "count": count,
+                        "credits": msg.get("credits", 1),
                         "identity": identity  # Store client identity for later responses
                     }
                     logger.debug("STREAM SERVER: Created stream state for req_id %s: %s", request_id, streams[request_id])
+                    await self._push_stream_values(socket, streams, request_id)
 
-                    # Send first value
-                    response = zmq.utils.jsonapi.dumps({"value": 0})
-                    logger.debug("STREAM SERVER: Starting stream for req_id %s with %d items", request_id, count)
-                    await socket.send_multipart([identity, b"", response])
-                    logger.debug("STREAM SERVER: First stream value sent successfully for req_id %s", request_id)
-                    # Yield after sending first value
-                    await asyncio.sleep(0)
-
-                elif "next" in msg:  # Subsequent stream request
+                elif "credit" in msg:  # Client consumed values and grants more credits
                     request_id = msg.get("request_id", "unknown")
-                    logger.debug("STREAM SERVER: Processing 'next' request for stream req_id: %s", request_id)
+                    logger.debug("STREAM SERVER: Received %s credits for stream req_id: %s", msg["credit"], request_id)
 
                     if request_id not in streams:
                         logger.error("STREAM SERVER: Unknown stream request_id: %s. Available streams: %s", 
                                     request_id, list(streams.keys()))
-                        error_response = zmq.utils.jsonapi.dumps(
-                            {"error": "Unknown stream"})
-                        await socket.send_multipart([identity, b"", error_response])
+                        await self._send(socket, identity, {"error": "Unknown stream"})
                         continue
 
-                    stream = streams[request_id]
-                    stream["current"] += 1
-                    logger.debug("STREAM SERVER: Updated stream current value to %d", stream["current"])
-
-                    if stream["current"] >= stream["count"]:
-                        # Stream complete, clean up
-                        logger.debug("STREAM SERVER: Stream completed for req_id %s, cleaning up", request_id)
-                        del streams[request_id]
-
-                    # Send next value
-                    response = zmq.utils.jsonapi.dumps({"value": stream["current"]})
-                    logger.debug("STREAM SERVER: Sending next stream value %d for req_id %s", 
-                                stream["current"], request_id)
-                    await socket.send_multipart([identity, b"", response])
-                    logger.debug("STREAM SERVER: Next stream value sent successfully for req_id %s", request_id)
-                    # Yield after sending next value
-                    await asyncio.sleep(0)
+                    streams[request_id]["credits"] += msg["credit"]
+                    await self._push_stream_values(socket, streams, request_id)
+
+                elif "cancel" in msg:  # Client abandoned the stream; it may already have completed
+                    request_id = msg.get("request_id", "unknown")
+                    logger.debug("STREAM SERVER: Cancelling stream req_id: %s", request_id)
+                    streams.pop(request_id, None)
 
                 else:
                     logger.error("STREAM SERVER: Unknown message format: %s", msg)
-                    error_response = zmq.utils.jsonapi.dumps(
-                        {"error": "Unknown request format"})
-                    await socket.send_multipart([identity, b"", error_response])
+                    await self._send(socket, identity, {"error": "Unknown request format"})
                     # Yield after sending unknown format error
                     await asyncio.sleep(0)
         except asyncio.CancelledError:
@@ -434,42 +465,84 @@ class ZMQImplementation(RPCImplementation):
             socket.setsockopt(zmq.LINGER, 0)  # Ensure immediate close
             socket.close()
 
-    async def simple_call(self, value) -> object:
-        loop_id = id(asyncio.get_running_loop())
-        logger.debug("CLIENT: simple_call running in event loop %d", loop_id)
-        TIMEOUT = 10.0  # 10 second timeout for socket operations
-
+    async def _push_stream_values(self, socket, streams, request_id):
+        """Send as many stream values as the stream's credits allow, without waiting for requests."""
+        stream = streams[request_id]
+        identity = stream["identity"]
+        while stream["credits"] > 0 and stream["current"] < stream["count"]:
+            await self._send(socket, identity, {"value": stream["current"]})
+            stream["current"] += 1
+            stream["credits"] -= 1
+        logger.debug("STREAM SERVER: Pushed stream req_id %s up to value %d", request_id, stream["current"])
+
+        if stream["current"] >= stream["count"]:
+            # Stream complete, clean up
+            logger.debug("STREAM SERVER: Stream completed for req_id %s, cleaning up", request_id)
+            del streams[request_id]
+        # Yield after sending a burst of values
+        await asyncio.sleep(0)
+
+    async def run_client_receiver(self):
+        """Receive replies on the shared client socket and resolve the waiting calls."""
         try:
-            # Use the shared socket with a lock for thread safety
-            async with self.client_socket_lock:
-                # Send request (empty delimiter frame + content)
-                request = zmq.utils.jsonapi.dumps({"value": value})
-                await self.client_socket.send_multipart([b"", request])
-                
-                # Yield control to event loop after sending request
-                await asyncio.sleep(0)
-
-                # Wait for response with timeout
+            while True:
+                frames = await self.client_socket.recv_multipart(copy=not self.zero_copy_threshold)
+                if len(frames) < 2:
+                    logger.error("CLIENT: Unexpected reply with %d parts", len(frames))
+                    continue
                 try:
-                    # Use asyncio.wait_for to enforce timeout at asyncio level
-                    _, response = await asyncio.wait_for(
-                        self.client_socket.recv_multipart(), 
-                        timeout=TIMEOUT
-                    )
-                    response_data = zmq.utils.jsonapi.loads(response)
-                except asyncio.TimeoutError:
-                    raise RuntimeError(f"Timeout waiting for simple_call response after {TIMEOUT} seconds")
-
-            return response_data["result"]
-        except Exception as e:
+                    reply = self._decode(frames[1:])
+                except Exception as e:
+                    logger.error("CLIENT: Could not decode reply: %s", e)
+                    continue
+                future = self._pending_calls.pop(reply.get("id"), None)
+                if future is None or future.done():
+                    # Late reply for a call that already timed out
+                    continue
+                if "error" in reply:
+                    future.set_exception(RuntimeError(f"Error from server: {reply['error']}"))
+                else:
+                    future.set_result(reply)
+        except asyncio.CancelledError:
+            logger.info("ZMQ client receiver task cancelled.")
             raise
 
+    async def _call(self, request, timeout):
+        """Send a request tagged with a fresh correlation ID and wait for its reply."""
+        call_id = next(self._call_ids)
+        request["id"] = call_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending_calls[call_id] = future
+        try:
+            frames, zero_copy = self._encode(request)
+            await self.client_socket.send_multipart([b"", *frames], copy=not zero_copy)
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Timeout waiting for response after {timeout} seconds")
+        finally:
+            self._pending_calls.pop(call_id, None)
+
+    async def simple_call(self, value) -> object:
+        TIMEOUT = 10.0  # 10 second timeout per call
+        reply = await self._call({"value": value}, TIMEOUT)
+        return reply["result"]
+
+    async def simple_call_many(self, values) -> list:
+        """Send all values in a single message and receive all results in one reply."""
+        TIMEOUT = 60.0
+        reply = await self._call({"values": list(values)}, TIMEOUT)
+        return reply["results"]
+
+    async def echo_bytes(self, buf) -> bytes:
+        reply = await self._call({BYTES_KEY: byte_view(buf)}, 60.0)
+        return reply[BYTES_KEY]
+
     async def stream_values(self, count: int):
-        thread_id = threading.get_ident()
-        # Use a shorter request ID
-        request_id = f"stream-{thread_id}"  # Much shorter than UUID
-        logger.debug("CLIENT req_id %s: Requesting stream of %d values (thread: %d)",
-                     request_id, count, thread_id)
+        # Unique per call so concurrent streams from one thread do not collide
+        request_id = f"stream-{uuid.uuid4().hex}"
+        window = max(1, self.stream_window)
+        logger.debug("CLIENT req_id %s: Requesting stream of %d values (window: %d)",
+                     request_id, count, window)
 
         if count <= 0:
             logger.debug("CLIENT req_id %s: Empty stream requested, returning immediately", request_id)
@@ -488,7 +561,7 @@ class ZMQImplementation(RPCImplementation):
             # Create and connect a DEALER socket for this specific stream
             socket = self.client_ctx.socket(zmq.DEALER)
             # Use a unique identity for this stream's socket
-            socket_identity = f"stream-{request_id}".encode()
+            socket_identity = request_id.encode()
             socket.setsockopt(zmq.IDENTITY, socket_identity)
             socket.setsockopt(zmq.LINGER, 0) # Close immediately if needed
             # DO NOT set RCVTIMEO here, rely on asyncio.wait_for
@@ -496,102 +569,61 @@ class ZMQImplementation(RPCImplementation):
             logger.debug("CLIENT req_id %s: Created and connected dedicated socket with identity %r",
                          request_id, socket_identity)
 
-            # Send initial request (empty delimiter frame + content)
-            request = zmq.utils.jsonapi.dumps(
-                {"count": count, "request_id": request_id})
+            # Send the initial request with the first grant of credits; the server
+            # pushes that many values without waiting for further requests
+            granted = min(window, count)
+            request = {"count": count, "request_id": request_id, "credits": granted}
             logger.debug("CLIENT req_id %s: Sending initial stream request", request_id)
-            await socket.send_multipart([b"", request]) # Use local socket
-            # Yield control to event loop after sending request
-            await asyncio.sleep(0)
+            await socket.send_multipart([b"", *self.serializer.dumps(request)]) # Use local socket
             logger.debug("CLIENT req_id %s: Initial stream request sent successfully", request_id)
 
-            # Receive first value with timeout
-            logger.debug("CLIENT req_id %s: Waiting for first stream value (timeout: %ss)", request_id, TIMEOUT)
-            try:
-                # Use asyncio.wait_for to enforce timeout at asyncio level
-                logger.debug("CLIENT req_id %s: Entering await socket.recv_multipart() for first value", request_id)
-                raw_response = await asyncio.wait_for(
-                    socket.recv_multipart(), # Use local socket
-                    timeout=TIMEOUT
-                )
-                logger.debug("CLIENT req_id %s: Exited await socket.recv_multipart() for first value", request_id)
-                # Expecting [empty, payload] from DEALER after ROUTER routes it
-                if len(raw_response) != 2:
-                     logger.error("CLIENT req_id %s: Received unexpected multipart message length: %d parts, content: %r",
-                                  request_id, len(raw_response), raw_response)
-                     raise RuntimeError(f"CLIENT req_id {request_id}: Unexpected response format from server.")
-                _, response = raw_response
-                logger.debug("CLIENT req_id %s: Received first response payload: %r", request_id, response)
-            except asyncio.TimeoutError:
-                logger.error("CLIENT req_id %s: asyncio.TimeoutError waiting for first stream value", request_id)
-                raise RuntimeError(f"Timeout waiting for first stream value after {TIMEOUT} seconds")
-
-            msg = zmq.utils.jsonapi.loads(response)
-            logger.debug("CLIENT req_id %s: Parsed first response: %s", request_id, msg)
-
-            if "error" in msg:
-                logger.error("CLIENT req_id %s: Server returned error: %s", request_id, msg["error"])
-                raise RuntimeError(
-                    f"CLIENT req_id {request_id}: Error from server: {msg['error']}")
-
-            if "value" not in msg:
-                logger.error("CLIENT req_id %s: Invalid response format, missing 'value': %s", request_id, msg)
-                raise RuntimeError(
-                    f"CLIENT req_id {request_id}: Invalid response format: {msg}")
-
-            # Yield first value
-            logger.debug("CLIENT req_id %s: Yielding first value: %s", request_id, msg["value"])
-            yield msg["value"]
-            items_received += 1
-
-            # Request and yield remaining values
-            for i in range(1, count):
-                # Send request for next value
-                next_request = zmq.utils.jsonapi.dumps(
-                    {"next": True, "request_id": request_id})
-                logger.debug("CLIENT req_id %s: Sending request for next value (%d/%d)", 
-                            request_id, i+1, count)
-                # Use the dedicated stream socket
-                await socket.send_multipart([b"", next_request])
-                # Yield control to event loop after sending request
-                await asyncio.sleep(0)
-                logger.debug("CLIENT req_id %s: Next request sent successfully", request_id)
-
-                # Receive next value with timeout
-                logger.debug("CLIENT req_id %s: Waiting for next value (%d/%d)", request_id, i+1, count)
+            while items_received < count:
                 try:
                     # Use asyncio.wait_for to enforce timeout at asyncio level
-                    # Use the dedicated stream socket
-                    _, response = await asyncio.wait_for(
+                    raw_response = await asyncio.wait_for(
                         socket.recv_multipart(),
                         timeout=TIMEOUT
                     )
-                    logger.debug("CLIENT req_id %s: Received next response for item %d", request_id, i+1)
                 except asyncio.TimeoutError:
-                    logger.error("CLIENT req_id %s: Timeout waiting for value %d", request_id, i+1)
-                    raise RuntimeError(f"Timeout waiting for stream value {i+1} after {TIMEOUT} seconds")
+                    logger.error("CLIENT req_id %s: Timeout waiting for value %d", request_id, items_received + 1)
+                    raise RuntimeError(f"Timeout waiting for stream value {items_received + 1} after {TIMEOUT} seconds")
 
-                msg = zmq.utils.jsonapi.loads(response)
-                logger.debug("CLIENT req_id %s: Parsed next response for item %d", request_id, i+1)
+                # Expecting [empty, *frames] from DEALER after ROUTER routes it
+                if len(raw_response) < 2:
+                    logger.error("CLIENT req_id %s: Received unexpected multipart message length: %d parts, content: %r",
+                                 request_id, len(raw_response), raw_response)
+                    raise RuntimeError(f"CLIENT req_id {request_id}: Unexpected response format from server.")
+                msg = self.serializer.loads(raw_response[1:])
 
                 if "error" in msg:
                     logger.error("CLIENT req_id %s: Server returned error for item %d: %s", 
-                                request_id, i+1, msg["error"])
+                                request_id, items_received + 1, msg["error"])
                     raise RuntimeError(
                         f"CLIENT req_id {request_id}: Error from server: {msg['error']}")
 
                 if "value" not in msg:
                     logger.error("CLIENT req_id %s: Invalid response format for item %d: %s", 
-                                request_id, i+1, msg)
+                                request_id, items_received + 1, msg)
                     raise RuntimeError(
                         f"CLIENT req_id {request_id}: Invalid response format: {msg}")
 
-                logger.debug("CLIENT req_id %s: Yielding value %d: %s", request_id, i+1, msg["value"])
-                yield msg["value"]
                 items_received += 1
 
+                # Top up credits once half the window has been consumed, before
+                # handing the value to the caller, so the server keeps pushing
+                outstanding = granted - items_received
+                if granted < count and outstanding <= window // 2:
+                    credit = min(window - outstanding, count - granted)
+                    await socket.send_multipart([b"", *self.serializer.dumps(
+                        {"credit": credit, "request_id": request_id})])
+                    granted += credit
+                    logger.debug("CLIENT req_id %s: Granted %d more credits (%d/%d)",
+                                 request_id, credit, granted, count)
+
+                yield msg["value"]
+
                 # Log progress periodically
-                if items_received % 100 == 0 or i == count-1:
+                if items_received % 100 == 0 or items_received == count:
                     elapsed = time.time() - start_time
                     rate = items_received / elapsed if elapsed > 0 else 0
                     logger.debug("CLIENT req_id %s: Received %d/%d values (%.1f items/sec)",
@@ -608,8 +640,17 @@ class ZMQImplementation(RPCImplementation):
         finally:
             # Ensure the dedicated socket is always closed
             if socket and not socket.closed:
+                linger = 0
+                if items_received < count:
+                    # Abandoned or failed: tell the server to drop the stream's state
+                    try:
+                        await socket.send_multipart([b"", *self.serializer.dumps(
+                            {"cancel": True, "request_id": request_id})], flags=zmq.NOBLOCK)
+                        linger = CANCEL_LINGER_MS  # Long enough for the cancel to leave
+                    except Exception as e:
+                        logger.debug("CLIENT req_id %s: Could not cancel stream: %s", request_id, e)
                 try:
-                    socket.close(linger=0) # Close immediately
+                    socket.close(linger=linger)
                     logger.debug(f"CLIENT req_id %s: Closed dedicated stream socket", request_id)
                 except Exception as e:
                     logger.error(f"CLIENT req_id %s: Error closing stream socket: {e}", request_id)
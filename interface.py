@@ -1,7 +1,11 @@
 import abc
-from typing import AsyncIterator
+import asyncio
+from typing import AsyncIterator, List, Sequence
 
 class RPCImplementation(abc.ABC):
+    # Process id of the server when it runs in a process of its own (--rpc-isolated), else None
+    server_pid = None
+
     @abc.abstractmethod
     async def setup(self):
         """Set up the RPC implementation, including starting any servers or connections."""
@@ -17,6 +21,25 @@ class RPCImplementation(abc.ABC):
         """Make a simple RPC call that multiplies the input value by 2."""
         pass
 
+    async def simple_call_many(self, values: Sequence) -> List[object]:
+        """Apply simple_call to every value, ideally in a single round trip.
+
+        The default issues one simple_call per value; implementations with a
+        native batch path should override it.
+        """
+        return list(await asyncio.gather(*(self.simple_call(value) for value in values)))
+
+    @abc.abstractmethod
+    async def echo_bytes(self, buf) -> bytes:
+        """Send a binary payload to the server and return it unchanged.
+
+        buf may be any object supporting the buffer protocol (bytes, bytearray,
+        memoryview, NumPy array); it is carried as raw bytes, never as str. The
+        result is a bytes-like object (bytes or a memoryview over the received
+        message) holding the same bytes.
+        """
+        pass
+
     @abc.abstractmethod
     async def stream_values(self, count: int) -> AsyncIterator[int]:
         """Return an asynchronous iterator yielding integer values from 0 to count-1."""
@@ -0,0 +1,134 @@
+"""
+HDR-style latency histogram for per-call timings.
+
+Latencies are counted in integer nanoseconds in log-linear buckets: values
+below 2**sub_bucket_bits nanoseconds get a bucket each, and every power of two
+above that is split into 2**(sub_bucket_bits - 1) equal buckets. A bucket is
+therefore never wider than 1/2**(sub_bucket_bits - 1) of the values in it
+(under 1.6% with the default 7 bits), whatever the range of latencies, and a
+histogram of millions of calls stays a few hundred counters.
+
+Histograms travel in a benchmark's extra_info as to_dict() and are read back
+with from_dict(), so reports compute percentiles from the full distribution
+instead of pytest-benchmark's per-round batch times.
+"""
+import contextlib
+import math
+import time
+
+DEFAULT_SUB_BUCKET_BITS = 7
+
+# Percentiles reported for each benchmark, as extra_info key -> percentile
+PERCENTILES = {
+    "latency_p50": 50.0,
+    "latency_p90": 90.0,
+    "latency_p99": 99.0,
+    "latency_p99_9": 99.9,
+}
+
+
+class LatencyHistogram:
+    """Log-bucketed counts of latencies, with their exact minimum and maximum."""
+
+    def __init__(self, sub_bucket_bits=DEFAULT_SUB_BUCKET_BITS):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = {}  # bucket index -> number of latencies in it
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def _index(self, ns):
+        shift = ns.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return ns
+        # The top sub_bucket_bits bits of ns, after the 2**sub_bucket_bits exact buckets
+        return (shift << (self.sub_bucket_bits - 1)) + (ns >> shift)
+
+    def _highest_value(self, index):
+        """Largest latency in nanoseconds that falls into bucket index."""
+        half = 1 << (self.sub_bucket_bits - 1)
+        shift = index // half - 1
+        if shift <= 0:
+            return index
+        return ((index - shift * half) << shift) + (1 << shift) - 1
+
+    def record_ns(self, ns):
+        index = self._index(ns)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total_ns += ns
+        if self.min_ns is None or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def record(self, seconds):
+        self.record_ns(max(0, round(seconds * 1e9)))
+
+    @contextlib.contextmanager
+    def time(self):
+        """Record the time spent in the with block; also around an await inside a coroutine."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_ns(time.perf_counter_ns() - start)
+
+    def merge(self, other):
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different bucket precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, percentile):
+        """Latency in seconds that percentile % of the calls did not exceed, or None if empty."""
+        if not self.count:
+            return None
+        if percentile >= 100:
+            return self.max_ns / 1e9
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest_value(index), self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def mean(self):
+        return self.total_ns / self.count / 1e9 if self.count else None
+
+    def summary(self):
+        """The reported percentiles, mean and maximum in seconds, keyed as in extra_info."""
+        summary = {key: self.percentile(percentile) for key, percentile in PERCENTILES.items()}
+        summary["latency_max"] = self.max_ns / 1e9 if self.count else None
+        summary["latency_mean"] = self.mean()
+        summary["latency_count"] = self.count
+        return summary
+
+    def to_dict(self):
+        return {
+            "unit": "ns",
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "count": self.count,
+            "total": self.total_ns,
+            "min": self.min_ns,
+            "max": self.max_ns,
+            # [bucket index, count] pairs; JSON objects would turn the indices into strings
+            "buckets": sorted(self.counts.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["sub_bucket_bits"])
+        histogram.counts = {int(index): int(count) for index, count in data["buckets"]}
+        histogram.count = data["count"]
+        histogram.total_ns = data["total"]
+        histogram.min_ns = data["min"]
+        histogram.max_ns = data["max"]
+        return histogram
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import logging
+import sys
+import signal
+if sys.platform.startswith('win'):
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+from implementations.asyncio_impl import AsyncioServer
+from alloc_profile import serve_profiles
+
+# Handle signals properly
+def handle_signal(sig, frame):
+    print("Received signal, shutting down...")
+    sys.exit(0)
+
+signal.signal(signal.SIGINT, handle_signal)
+signal.signal(signal.SIGTERM, handle_signal)
+
+async def run_server(port, transport, serializer):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s', stream=sys.stdout)
+    server = AsyncioServer(serializer=serializer, transport=transport, port=port)
+    await server.start()
+    print("READY", flush=True)
+    sys.stdout.flush()  # Ensure the READY signal is sent immediately
+    logging.info("Asyncio RPC server is ready and waiting for connections")
+
+    try:
+        # Keep the server running indefinitely
+        await asyncio.Event().wait()
+    except asyncio.CancelledError:
+        logging.info("Server task cancelled")
+    finally:
+        await server.close()
+        logging.info("Server shutdown complete")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=5557, help="Port to bind the asyncio RPC server")
+    parser.add_argument("--transport", default="tcp", choices=["tcp", "ipc"],
+                        help="Loopback TCP or a Unix domain socket (named after the port)")
+    parser.add_argument("--serializer", default="binary", choices=["json", "binary", "pickle"],
+                        help="Message encoding; must match the client's --asyncio-serializer")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
+    args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
+
+    try:
+        asyncio.run(run_server(args.port, args.transport, args.serializer))
+    except KeyboardInterrupt:
+        print("Server stopped by user")
@@ -8,10 +8,11 @@ if not os.path.exists("proto/rpc_pb2.py"):
     import subprocess
     subprocess.run(["python", "build_protos.py"], check=True)
 from implementations.grpc_impl import GRPCImplementation
+from alloc_profile import serve_profiles
 
-async def run_server(port):
+async def run_server(port, transport):
     logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
-    impl = GRPCImplementation(port=port)
+    impl = GRPCImplementation(port=port, transport=transport)
     await impl.setup()
     print("READY", flush=True)
     sys.stdout.flush()  # Ensure the READY signal is sent immediately
@@ -21,5 +22,11 @@ async def run_server(port):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--port", type=int, default=50051, help="Port to bind the gRPC server")
+    parser.add_argument("--transport", default="tcp", choices=["tcp", "ipc"],
+                        help="Loopback TCP or a unix: socket (named after the port)")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
     args = parser.parse_args()
-    asyncio.run(run_server(args.port))
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
+    asyncio.run(run_server(args.port, args.transport))
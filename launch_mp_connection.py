@@ -0,0 +1,30 @@
+#!/usr/bin/env python
+import argparse
+import logging
+import time
+import sys
+from implementations.mp_connection_impl import MPConnectionServer
+from alloc_profile import serve_profiles
+
+def run_server(port, transport):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+    # Serve each client connection on its own thread
+    server = MPConnectionServer(transport=transport, port=port)
+    server.start()
+    print("READY", flush=True)
+    sys.stdout.flush()  # Ensure the READY signal is sent immediately
+    # Keep the server running indefinitely
+    while True:
+        time.sleep(3600)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=5558, help="Port to bind the multiprocessing.connection server")
+    parser.add_argument("--transport", default="tcp", choices=["tcp", "ipc"],
+                        help="Loopback TCP or an AF_UNIX socket (named after the port)")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
+    args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
+    run_server(args.port, args.transport)
@@ -8,6 +8,7 @@ import uuid
 import sys
 import rpyc
 from named_pipe_impl import BenchmarkService, NamedPipeServer
+from alloc_profile import serve_profiles
 
 def run_server(pipe_name=None):
     if os.name != "nt":
@@ -37,5 +38,9 @@ def run_server(pipe_name=None):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--pipe-name", type=str, help="Named pipe path")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
     args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
     run_server(args.pipe_name)
@@ -5,6 +5,7 @@ import sys
 import time
 import Pyro4
 from implementations.pyro_impl import BenchmarkService
+from alloc_profile import serve_profiles
 
 def run_server(name):
     """
@@ -55,5 +56,9 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--name", type=str, default="example.benchmark.service", 
                         help="Name to register in the Pyro name server")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
     args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
     run_server(args.name)
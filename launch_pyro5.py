@@ -7,6 +7,7 @@ import signal  # Import signal module for handling termination
 import Pyro5.api
 import Pyro5.errors
 from implementations.pyro5_impl import BenchmarkService # Import from the new pyro5 implementation
+from alloc_profile import serve_profiles
 
 # Global variables for signal handling
 daemon_instance = None
@@ -111,5 +112,9 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Pyro5 Benchmark Service Launcher")
     parser.add_argument("--name", type=str, default="example.benchmark.pyro5.service",
                         help="Name to register in the Pyro5 name server")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
     args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
     run_server(args.name)
@@ -3,14 +3,14 @@ import argparse
 import logging
 import time
 import threading
-import rpyc
 import sys
-from implementations.rpyc_impl import BenchmarkService
+from implementations.rpyc_impl import create_tcp_server
+from alloc_profile import serve_profiles
 
 def run_server(port):
     logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
     # Create the RPyC server using BenchmarkService
-    server = rpyc.ThreadedServer(BenchmarkService, port=port, protocol_config={"allow_public_attrs": True})
+    server = create_tcp_server(port)
     thread = threading.Thread(target=server.start, daemon=True)
     thread.start()
     time.sleep(0.5)
@@ -23,5 +23,9 @@ def run_server(port):
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--port", type=int, default=18861, help="Port to bind the RPyC server")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
     args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
     run_server(args.port)
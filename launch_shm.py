@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import signal
+from implementations.shm_impl import DEFAULT_RING_SIZE, DEFAULT_SHM_THRESHOLD, SharedMemoryServer
+from alloc_profile import serve_profiles
+
+# Handle signals properly
+def handle_signal(sig, frame):
+    print("Received signal, shutting down...")
+    sys.exit(0)
+
+signal.signal(signal.SIGINT, handle_signal)
+signal.signal(signal.SIGTERM, handle_signal)
+
+async def run_server(name, ring_size, shm_threshold):
+    if os.name == "nt":
+        print("The shared-memory backend needs POSIX named FIFOs")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s', stream=sys.stdout)
+    server = SharedMemoryServer(name, ring_size=ring_size, shm_threshold=shm_threshold)
+    await server.start()
+    print("READY", flush=True)
+    sys.stdout.flush()  # Ensure the READY signal is sent immediately
+    logging.info("Shared-memory RPC server is ready and waiting for a client")
+
+    try:
+        # Keep the server running indefinitely
+        await asyncio.Event().wait()
+    except asyncio.CancelledError:
+        logging.info("Server task cancelled")
+    finally:
+        await server.close()
+        logging.info("Server shutdown complete")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name", type=str, required=True, help="Shared memory segment name")
+    parser.add_argument("--ring-size", type=int, default=DEFAULT_RING_SIZE,
+                        help="Bytes per direction; must match the client's --shm-ring-size")
+    parser.add_argument("--shm-threshold", type=int, default=DEFAULT_SHM_THRESHOLD,
+                        help="Payload size in bytes from which replies use a pooled shared memory block")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
+    args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
+
+    try:
+        asyncio.run(run_server(args.name, args.ring_size, args.shm_threshold))
+    except KeyboardInterrupt:
+        print("Server stopped by user")
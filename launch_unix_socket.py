@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+import argparse
+import logging
+import time
+import threading
+import socket
+import sys
+from implementations.unix_socket_impl import create_unix_socket_server
+from alloc_profile import serve_profiles
+
+def run_server(socket_path):
+    if not hasattr(socket, "AF_UNIX"):
+        print("Unix domain sockets are not supported on this platform")
+        sys.exit(1)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+    # Create the RPyC server using BenchmarkService on the Unix socket
+    server = create_unix_socket_server(socket_path)
+    thread = threading.Thread(target=server.start, daemon=True)
+    thread.start()
+    time.sleep(0.5)
+    print(f"Starting Unix socket server on {socket_path}")
+    print("READY", flush=True)
+    sys.stdout.flush()  # Ensure the READY signal is sent immediately
+    # Keep the server running indefinitely
+    while True:
+        time.sleep(3600)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--socket-path", type=str, required=True, help="Unix domain socket path to bind")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
+    args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
+    run_server(args.socket_path)
@@ -7,6 +7,7 @@ import signal
 if sys.platform.startswith('win'):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 from implementations.zmq_impl import ZMQImplementation
+from alloc_profile import serve_profiles
 
 # Handle signals properly
 def handle_signal(sig, frame):
@@ -16,11 +17,10 @@ def handle_signal(sig, frame):
 signal.signal(signal.SIGINT, handle_signal)
 signal.signal(signal.SIGTERM, handle_signal)
 
-async def run_server(port):
+async def run_server(port, stream_port, transport, serializer, zero_copy_threshold):
     logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s', stream=sys.stdout)
-    impl = ZMQImplementation()
-    # Override the endpoint with the dynamic port
-    impl.simple_endpoint = f"tcp://127.0.0.1:{port}"
+    impl = ZMQImplementation(serializer=serializer, zero_copy_threshold=zero_copy_threshold,
+                             transport=transport, port=port, stream_port=stream_port)
     await impl.setup()
     print("READY", flush=True)
     sys.stdout.flush()  # Ensure the READY signal is sent immediately
@@ -39,9 +39,21 @@ async def run_server(port):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--port", type=int, default=5555, help="Port to bind the ZeroMQ simple server")
+    parser.add_argument("--stream-port", type=int, default=5556, help="Port to bind the ZeroMQ stream server")
+    parser.add_argument("--transport", default="tcp", choices=["tcp", "ipc"],
+                        help="Loopback TCP or ipc:// sockets (named after the ports)")
+    parser.add_argument("--serializer", default="json", choices=["json", "binary", "pickle"],
+                        help="Message encoding; must match the client's --zmq-serializer")
+    parser.add_argument("--zero-copy-threshold", type=int, default=64 * 1024,
+                        help="Payload size in bytes from which replies use raw zero-copy frames (0 = always copy)")
+    parser.add_argument("--alloc-profile", metavar="DIR",
+                        help="Profile allocations with tracemalloc when told to through a FIFO in DIR")
     args = parser.parse_args()
+    if args.alloc_profile:
+        serve_profiles(args.alloc_profile)
     
     try:
-        asyncio.run(run_server(args.port))
+        asyncio.run(run_server(args.port, args.stream_port, args.transport,
+                               args.serializer, args.zero_copy_threshold))
     except KeyboardInterrupt:
         print("Server stopped by user")
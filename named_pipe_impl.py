@@ -7,6 +7,9 @@ import rpyc
 from rpyc.utils.server import ThreadedServer
 from rpyc.core.stream import NamedPipeStream
 from interface import RPCImplementation
+# The same service as RPyC over TCP, exposed over a named pipe
+from implementations.rpyc_impl import CLIENT_MODES, BenchmarkService, bridge_async_result
+from implementations.streaming import prefetch_chunks
 
 class NamedPipeServer(ThreadedServer):
     def _listen(self):
@@ -42,21 +45,17 @@ class NamedPipeServer(ThreadedServer):
         finally:
             self.logger.info(f"goodbye {addrinfo}")
 
-class BenchmarkService(rpyc.Service):
-    def exposed_simple_call(self, value):
-        # For demonstration, simply multiply value by 2
-        return value * 2
-
-    def exposed_stream_values(self, count):
-        # Return a generator yielding values from 0 to count-1
-        for i in range(count):
-            yield i
-
 class NamedPipeImplementation(RPCImplementation):
-    def __init__(self, external_server=False):
+    def __init__(self, external_server=False, client_mode="executor", stream_chunk_size=100, stream_prefetch=2):
         if os.name != "nt":
             raise RuntimeError("Named pipes are only supported on Windows")
+        if client_mode not in CLIENT_MODES:
+            raise ValueError(f"Unknown RPyC client mode: {client_mode}")
         
+        self.client_mode = client_mode
+        # Same streaming knobs as RPyCImplementation
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_prefetch = stream_prefetch
         self.pipe_name = r"\\.\pipe\RPyC_{}".format(uuid.uuid4().hex)
         self.external_server = external_server
         
@@ -72,6 +71,10 @@ class NamedPipeImplementation(RPCImplementation):
             
         self.server_thread = None
         self.conn = None
+        self.bg_thread = None
+        self._async_simple_call = None
+        self._async_simple_call_many = None
+        self._async_echo_bytes = None
 
     async def setup(self):
         loop = asyncio.get_running_loop()
@@ -88,6 +91,12 @@ class NamedPipeImplementation(RPCImplementation):
             from rpyc.utils.factory import connect_stream
             stream = NamedPipeStream.create_client(self.pipe_name)
             self.conn = connect_stream(stream, service=BenchmarkService)
+            if self.client_mode == "async":
+                self._async_simple_call = rpyc.async_(self.conn.root.simple_call)
+                self._async_simple_call_many = rpyc.async_(self.conn.root.simple_call_many)
+                self._async_echo_bytes = rpyc.async_(self.conn.root.echo_bytes)
+                # Block in serve() instead of the default poll-then-sleep(0.1) cycle
+                self.bg_thread = rpyc.BgServingThread(self.conn, serve_interval=0.1, sleep_interval=0)
             
         # Try to connect with retries
         max_retries = 5
@@ -101,6 +110,9 @@ class NamedPipeImplementation(RPCImplementation):
                 await asyncio.sleep(0.5)
 
     async def teardown(self):
+        if self.bg_thread:
+            self.bg_thread.stop()
+            self.bg_thread = None
         if self.conn:
             self.conn.close()
         if self.server:
@@ -112,6 +124,18 @@ class NamedPipeImplementation(RPCImplementation):
 
     async def simple_call(self, value) -> object:
         loop = asyncio.get_running_loop()
+        if self.client_mode == "async":
+            try:
+                return await asyncio.wait_for(
+                    bridge_async_result(self._async_simple_call(value), loop), timeout=15.0)
+            except asyncio.TimeoutError:
+                import logging
+                logging.error("Named pipe simple_call timeout")
+                return None
+            except Exception as e:
+                import logging
+                logging.error(f"Named pipe simple_call error: {e}")
+                return None
         def remote_call():
             try:
                 return self.conn.root.simple_call(value)
@@ -131,10 +155,46 @@ class NamedPipeImplementation(RPCImplementation):
             logging.error(f"Named pipe simple_call unexpected error: {e}")
             return None
 
+    async def simple_call_many(self, values) -> list:
+        loop = asyncio.get_running_loop()
+        values = tuple(values)
+        if self.client_mode == "async":
+            result = await asyncio.wait_for(
+                bridge_async_result(self._async_simple_call_many(values), loop), timeout=60.0)
+            return list(result)
+        def remote_call():
+            return list(self.conn.root.simple_call_many(values))
+        return await asyncio.wait_for(loop.run_in_executor(None, remote_call), timeout=60.0)
+
+    async def echo_bytes(self, buf) -> bytes:
+        loop = asyncio.get_running_loop()
+        # Only bytes travels by value; a bytearray, memoryview or array would become a netref
+        data = bytes(buf)
+        if self.client_mode == "async":
+            return await asyncio.wait_for(
+                bridge_async_result(self._async_echo_bytes(data), loop), timeout=60.0)
+        def remote_call():
+            return self.conn.root.echo_bytes(data)
+        return await asyncio.wait_for(loop.run_in_executor(None, remote_call), timeout=60.0)
+
     async def stream_values(self, count: int) -> AsyncIterator[int]:
+        if self.stream_chunk_size > 0:
+            async for item in self._stream_values_chunked(count):
+                yield item
+            return
+
         loop = asyncio.get_running_loop()
         def remote_stream():
             return list(self.conn.root.stream_values(count))
         result = await loop.run_in_executor(None, remote_stream)
         for item in result:
             yield item
+
+    async def _stream_values_chunked(self, count: int) -> AsyncIterator[int]:
+        """Stream values in chunks prefetched by a background thread"""
+        def open_chunks():
+            # Runs on the prefetch thread; each next() fetches a whole chunk
+            return self.conn.root.stream_chunks(count, self.stream_chunk_size)
+
+        async for item in prefetch_chunks(open_chunks, self.stream_prefetch):
+            yield item
@@ -0,0 +1,139 @@
+"""
+Open-loop load generator for any RPCImplementation.
+
+The closed-loop tests keep a fixed number of calls in flight, so when a
+backend stalls they simply send less and the wait never shows up in their
+latencies (coordinated omission). Here requests are scheduled at a target
+rate, with fixed or Poisson (exponential) inter-arrival times, and each one
+is started as its own task at its scheduled time whether or not earlier
+requests have finished. Latency is measured from the intended send time, so
+time spent behind a stalled backend, or behind a client that fell behind
+its schedule, counts against the call. Requests that fail or time out are
+recorded too, at the time they gave up, so an overloaded backend shows in
+the tail rather than dropping out of it; they are also counted as errors.
+The time from the actual send is kept separately as the service time, for
+completed requests only.
+"""
+import asyncio
+import random
+import time
+
+from latency import LatencyHistogram
+
+# Arrival processes for run_open_loop()
+FIXED, POISSON = "fixed", "poisson"
+
+# Operations for run_open_loop(): one simple_call, or one stream_values consumed to the end
+SIMPLE_CALL, STREAM = "simple_call", "stream"
+
+
+class OpenLoopResult:
+    """Outcome of one open-loop run."""
+
+    def __init__(self, target_rate, arrivals, latency, service):
+        self.target_rate = target_rate
+        self.arrivals = arrivals
+        self.latency = latency  # LatencyHistogram from the intended send times
+        self.service = service  # LatencyHistogram from the actual send times
+        self.sent = 0
+        self.completed = 0
+        self.errors = 0
+        self.duration = 0.0
+        self.max_send_lag = 0.0  # Furthest the client fell behind its schedule, in seconds
+
+    @property
+    def achieved_rate(self):
+        return self.completed / self.duration if self.duration else 0.0
+
+    def extra_info(self):
+        """The run's figures, keyed for a benchmark's extra_info."""
+        return {
+            "target_rate": self.target_rate,
+            "arrivals": self.arrivals,
+            "achieved_rate": self.achieved_rate,
+            "sent": self.sent,
+            "completed": self.completed,
+            "errors": self.errors,
+            "max_send_lag": self.max_send_lag,
+            "service_p50": self.service.percentile(50),
+            "service_p99": self.service.percentile(99),
+        }
+
+
+def arrival_offsets(rate, count, arrivals=FIXED, seed=0):
+    """Intended send times of count requests at rate per second, in seconds from the start."""
+    if rate <= 0:
+        raise ValueError(f"Target rate must be positive, got {rate}")
+    if arrivals == FIXED:
+        return [i / rate for i in range(count)]
+    if arrivals == POISSON:
+        rng = random.Random(seed)
+        offsets = []
+        t = 0.0
+        for _ in range(count):
+            offsets.append(t)
+            t += rng.expovariate(rate)
+        return offsets
+    raise ValueError(f"Unknown arrival process {arrivals!r}; expected {FIXED!r} or {POISSON!r}")
+
+
+async def _consume_stream(rpc_implementation, stream_length):
+    count = 0
+    async for _ in rpc_implementation.stream_values(stream_length):
+        count += 1
+    if count != stream_length:
+        raise RuntimeError(f"Stream ended after {count} of {stream_length} values")
+
+
+async def run_open_loop(rpc_implementation, rate, count, arrivals=FIXED, operation=SIMPLE_CALL,
+                        stream_length=100, seed=0, latency=None, service=None, timeout=30.0):
+    """
+    Send count requests at rate per second and wait for all of them.
+
+    operation: SIMPLE_CALL or STREAM (stream_values(stream_length) read to the end).
+    latency: LatencyHistogram to record the corrected latencies into; a new one by default.
+    service: LatencyHistogram to record the service times into; a new one by default.
+    timeout: seconds each request may take before it counts as an error; it is
+    still recorded in latency, at no less than timeout.
+    """
+    if operation == SIMPLE_CALL:
+        def request():
+            return rpc_implementation.simple_call(42)
+    elif operation == STREAM:
+        def request():
+            return _consume_stream(rpc_implementation, stream_length)
+    else:
+        raise ValueError(f"Unknown operation {operation!r}; expected {SIMPLE_CALL!r} or {STREAM!r}")
+
+    result = OpenLoopResult(rate, arrivals, latency if latency is not None else LatencyHistogram(),
+                            service if service is not None else LatencyHistogram())
+
+    async def send(intended_ns):
+        sent_ns = time.perf_counter_ns()
+        try:
+            await asyncio.wait_for(request(), timeout)
+        except Exception:
+            # Dropping it would hide the slowest requests again (coordinated omission)
+            result.latency.record_ns(time.perf_counter_ns() - intended_ns)
+            result.errors += 1
+            return
+        done_ns = time.perf_counter_ns()
+        result.latency.record_ns(done_ns - intended_ns)
+        result.service.record_ns(done_ns - sent_ns)
+        result.completed += 1
+
+    tasks = []
+    start_ns = time.perf_counter_ns()
+    for offset in arrival_offsets(rate, count, arrivals, seed):
+        intended_ns = start_ns + round(offset * 1e9)
+        delay = (intended_ns - time.perf_counter_ns()) / 1e9
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            # Behind schedule: send now, still timed from the intended time
+            result.max_send_lag = max(result.max_send_lag, -delay)
+        tasks.append(asyncio.create_task(send(intended_ns)))
+        result.sent += 1
+    await asyncio.gather(*tasks)
+    result.duration = (time.perf_counter_ns() - start_ns) / 1e9
+    return result
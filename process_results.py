@@ -4,6 +4,51 @@ import os
 import pandas as pd
 from collections import defaultdict
 
+from alloc_profile import TOP_SITES
+from latency import PERCENTILES, LatencyHistogram
+from scaling import MIN_POINTS, analyse_curve
+
+# Per-call latency columns, as reported, in seconds
+LATENCY_COLUMNS = ['p50', 'p90', 'p99', 'p99_9', 'max_latency']
+
+# Client and server resource usage columns, from the /proc sampler in conftest.py
+RESOURCE_COLUMNS = [f'{role}_{figure}' for role in ('client', 'server')
+                    for figure in ('cpu_s_per_1k_ops', 'peak_rss_kb',
+                                   'voluntary_ctx_switches_per_op', 'involuntary_ctx_switches_per_op')]
+
+# Client and server retained allocation and peak columns from --rpc-alloc-profile, and their top retaining sites
+ALLOC_COLUMNS = [f'{role}_{figure}' for role in ('client', 'server')
+                 for figure in ('retained_bytes_per_op', 'retained_blocks_per_op', 'alloc_peak_bytes')]
+ALLOC_SITE_COLUMNS = ['client_retained_sites', 'server_retained_sites']
+
+# Columns of every row; any other column holds a parametrize value
+STATS_COLUMNS = (['implementation', 'test', 'case', 'mean', 'min', 'max', 'median', 'stddev', 'ops',
+                  'rounds', 'operations_per_run', 'original_mean']
+                 + LATENCY_COLUMNS + RESOURCE_COLUMNS + ALLOC_COLUMNS + ALLOC_SITE_COLUMNS)
+
+# Parametrize names stored under another column name
+PARAM_COLUMN_ALIASES = {
+    'rpc_implementation': 'offload',  # tests/test_large_payload.py's direct/offload fixture
+}
+
+# Parameter the scaling curves are fitted against
+SCALING_PARAMETER = 'concurrency'
+
+def param_columns(params):
+    """A benchmark's parametrize values keyed by their column names."""
+    return {PARAM_COLUMN_ALIASES.get(name, name): value for name, value in (params or {}).items()}
+
+def latency_percentiles(extra_info):
+    """Per-call latency percentiles from a benchmark's latency histogram, or None if it has none."""
+    if 'latency_histogram' not in extra_info:
+        return None
+    histogram = LatencyHistogram.from_dict(extra_info['latency_histogram'])
+    if not histogram.count:
+        return None
+    values = [histogram.percentile(percentile) for percentile in PERCENTILES.values()]
+    values.append(histogram.max_ns / 1e9)
+    return dict(zip(LATENCY_COLUMNS, values))
+
 def load_benchmark_data(results_dir):
     """Load benchmark data from JSON files and convert to structured format."""
     data = []
@@ -44,7 +89,8 @@ def load_benchmark_data(results_dir):
                 continue
                 
             for benchmark in benchmark_data['benchmarks']:
-                test_name = benchmark['name'].split('[')[0] # Get base test name
+                case_name = benchmark['name']  # Test name with its parametrize IDs
+                test_name = case_name.split('[')[0] # Get base test name
 
                 # Get operations count from extra_info, default to 1 if not present
                 operations_per_run = benchmark.get('extra_info', {}).get('operations', 1)
@@ -89,6 +135,7 @@ def load_benchmark_data(results_dir):
                 stats = {
                     'implementation': impl_name,
                     'test': test_name,
+                    'case': case_name,
                     'mean': mean_time,          # Adjusted mean time per operation
                     'min': min_time,            # Adjusted min time per operation
                     'max': max_time,            # Adjusted max time per operation
@@ -99,6 +146,17 @@ def load_benchmark_data(results_dir):
                     'operations_per_run': operations_per_run, # Store for reference
                     'original_mean': original_mean,         # Store original mean for debugging
                 }
+                # Latency of individual calls; the mean above is batch time / operations,
+                # i.e. inverse throughput, and hides the tail of concurrent calls
+                percentiles = latency_percentiles(benchmark.get('extra_info', {}))
+                for column in LATENCY_COLUMNS:
+                    stats[column] = percentiles[column] if percentiles else None
+                # CPU, memory and context switches; server columns stay empty for in-process servers
+                for column in RESOURCE_COLUMNS + ALLOC_COLUMNS + ALLOC_SITE_COLUMNS:
+                    stats[column] = benchmark.get('extra_info', {}).get(column)
+                # One column per parametrize argument, e.g. concurrency
+                for column, value in param_columns(benchmark.get('params')).items():
+                    stats[column if column not in stats else f'param_{column}'] = value
                 data.append(stats)
         except Exception as e:
             print(f"Error processing {filepath}: {e}")
@@ -117,8 +175,9 @@ def calculate_comparisons(df):
     if df.empty:
         return comparisons
     
-    for test in df['test'].unique():
-        test_df = df[df['test'] == test]
+    # Each parametrized case is compared on its own
+    for test in df['case'].unique():
+        test_df = df[df['case'] == test]
         
         # Skip tests with only one implementation
         if len(test_df) < 2:
@@ -137,9 +196,93 @@ def calculate_comparisons(df):
                 'ops_per_sec': row['ops'],
                 'is_fastest': impl == fastest_impl
             }
+            if 'p99' in row and pd.notna(row['p99']):
+                comparisons[test][impl]['latency'] = {column: row[column] for column in LATENCY_COLUMNS}
+            if 'client_cpu_s_per_1k_ops' in row and pd.notna(row['client_cpu_s_per_1k_ops']):
+                comparisons[test][impl]['resources'] = {
+                    column: row[column] if pd.notna(row[column]) else None for column in RESOURCE_COLUMNS
+                }
+            if 'client_retained_bytes_per_op' in row and pd.notna(row['client_retained_bytes_per_op']):
+                comparisons[test][impl]['allocations'] = {
+                    column: row[column] if pd.notna(row[column]) else None for column in ALLOC_COLUMNS
+                }
     
     return comparisons
 
+def calculate_retained_sites(df, top=TOP_SITES):
+    """
+    Top retaining sites of each implementation's client and server, with the
+    bytes and blocks they allocated and still held added up over all its tests.
+    """
+    sites = {}
+    if df.empty or 'client_retained_sites' not in df.columns:
+        return sites
+    for impl, impl_df in df.groupby('implementation'):
+        for role in ('client', 'server'):
+            totals = defaultdict(lambda: {'bytes': 0, 'blocks': 0, 'tests': 0})
+            for case_sites in impl_df[f'{role}_retained_sites']:
+                if not isinstance(case_sites, list):
+                    continue  # Not profiled, or no server of its own
+                for site in case_sites:
+                    total = totals[site['site']]
+                    total['bytes'] += site['bytes']
+                    total['blocks'] += site['blocks']
+                    total['tests'] += 1
+            if totals:
+                ranked = sorted(totals.items(), key=lambda item: -item[1]['bytes'])[:top]
+                sites.setdefault(impl, {})[role] = [dict(total, site=site) for site, total in ranked]
+    return sites
+
+def _plain(value):
+    """A parameter value as a JSON-friendly Python scalar (integral floats back to int)."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def calculate_scaling(df, parameter=SCALING_PARAMETER):
+    """
+    Throughput and latency curves against parameter, one per implementation,
+    test and combination of the test's other parameters with at least
+    MIN_POINTS values of parameter, each with its USL fit, knee and
+    saturation point (see scaling.py).
+    """
+    curves = []
+    if df.empty or parameter not in df.columns:
+        return curves
+    param_names = [column for column in df.columns if column not in STATS_COLUMNS]
+
+    for test in sorted(df['test'].unique()):
+        test_df = df[(df['test'] == test) & df[parameter].notna()]
+        if test_df.empty:
+            continue
+        # The test's other parameters tell its curves apart
+        others = [column for column in param_names
+                  if column != parameter and test_df[column].notna().any()]
+        keys = ['implementation'] + others
+        for key, curve_df in test_df.groupby(keys, sort=True, dropna=False):
+            key = key if isinstance(key, tuple) else (key,)
+            if curve_df[parameter].nunique() < MIN_POINTS:
+                continue  # Too few points for a curve; the cases stay in the per-case comparisons
+            curve_df = curve_df.sort_values(parameter)
+            concurrency = [_plain(value) for value in curve_df[parameter]]
+            throughput = curve_df['ops'].tolist()
+            curve = {
+                'implementation': key[0],
+                'test': test,
+                'params': {name: _plain(value) for name, value in zip(others, key[1:])},
+                'cases': curve_df['case'].tolist(),
+                'parameter': parameter,
+                parameter: concurrency,
+                'throughput': throughput,
+                'p50': [None if pd.isna(value) else value for value in curve_df['p50']],
+                'p99': [None if pd.isna(value) else value for value in curve_df['p99']],
+                'fit': analyse_curve(concurrency, throughput),
+            }
+            curves.append(curve)
+    return curves
+
 def process_results(results_dir):
     """Process benchmark results and return structured data for reporting."""
     df = load_benchmark_data(results_dir)
@@ -156,22 +299,26 @@ def process_results(results_dir):
         return {
             'raw_data': df,
             'comparisons': {},
+            'scaling': [],
+            'retained_sites': {},
             'summary': empty_summary
         }
     
     comparisons = calculate_comparisons(df)
+    scaling = calculate_scaling(df)
+    retained_sites = calculate_retained_sites(df)
     
     # Calculate summary statistics
     summary = {
         'fastest_by_test': {},
-        'test_count': len(df['test'].unique()),
+        'test_count': len(df['case'].unique()),
         'total_rounds': df['rounds'].sum() if 'rounds' in df.columns else 0,
         'implementations': sorted(df['implementation'].unique().tolist()),
     }
     
     # Find fastest implementation for each test
-    for test in df['test'].unique():
-        test_df = df[df['test'] == test]
+    for test in df['case'].unique():
+        test_df = df[df['case'] == test]
         if not test_df.empty:
             fastest_idx = test_df['mean'].idxmin()
             if fastest_idx is not None:
@@ -193,6 +340,8 @@ def process_results(results_dir):
     return {
         'raw_data': df,
         'comparisons': comparisons,
+        'scaling': scaling,
+        'retained_sites': retained_sites,
         'summary': summary
     }
 
@@ -237,6 +386,8 @@ if __name__ == "__main__":
     # Save comparisons and summary as JSON
     output = {
         'comparisons': results['comparisons'],
+        'scaling': results['scaling'],
+        'retained_sites': results['retained_sites'],
         'summary': results['summary']
     }
     
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\trpc.proto\x12\x03rpc\"D\n\rSimpleRequest\x12\x13\n\tint_value\x18\x01 \x01(\x05H\x00\x12\x13\n\tstr_value\x18\x02 \x01(\tH\x00\x42\t\n\x07payload\"E\n\x0eSimpleResponse\x12\x13\n\tint_value\x18\x01 \x01(\x05H\x00\x12\x13\n\tstr_value\x18\x02 \x01(\tH\x00\x42\t\n\x07payload\"\x1e\n\rStreamRequest\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\"\x1f\n\x0eStreamResponse\x12\r\n\x05value\x18\x01 \x01(\x05\x32~\n\nRPCService\x12\x35\n\nSimpleCall\x12\x12.rpc.SimpleRequest\x1a\x13.rpc.SimpleResponse\x12\x39\n\x0cStreamValues\x12\x12.rpc.StreamRequest\x1a\x13.rpc.StreamResponse0\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\trpc.proto\x12\x03rpc\"[\n\rSimpleRequest\x12\x13\n\tint_value\x18\x01 \x01(\x05H\x00\x12\x13\n\tstr_value\x18\x02 \x01(\tH\x00\x12\x15\n\x0b\x62ytes_value\x18\x03 \x01(\x0cH\x00\x42\t\n\x07payload\"\\\n\x0eSimpleResponse\x12\x13\n\tint_value\x18\x01 \x01(\x05H\x00\x12\x13\n\tstr_value\x18\x02 \x01(\tH\x00\x12\x15\n\x0b\x62ytes_value\x18\x03 \x01(\x0cH\x00\x42\t\n\x07payload\"C\n\x10PipelinedRequest\x12\n\n\x02id\x18\x01 \x01(\x04\x12#\n\x07request\x18\x02 \x01(\x0b\x32\x12.rpc.SimpleRequest\"F\n\x11PipelinedResponse\x12\n\n\x02id\x18\x01 \x01(\x04\x12%\n\x08response\x18\x02 \x01(\x0b\x32\x13.rpc.SimpleResponse\":\n\x12SimpleBatchRequest\x12$\n\x08requests\x18\x01 \x03(\x0b\x32\x12.rpc.SimpleRequest\"=\n\x13SimpleBatchResponse\x12&\n\tresponses\x18\x01 \x03(\x0b\x32\x13.rpc.SimpleResponse\"2\n\rStreamRequest\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x12\x12\n\nbatch_size\x18\x02 \x01(\x05\"\x1f\n\x0eStreamResponse\x12\r\n\x05value\x18\x01 \x01(\x05\"\x1d\n\x0bStreamBatch\x12\x0e\n\x06values\x18\x01 \x03(\x03\",\n\x0cPayloadChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0e\n\x06repeat\x18\x02 \x01(\r\"\x1e\n\x0eUploadResponse\x12\x0c\n\x04size\x18\x01 \x01(\x03\"\x1c\n\x0c\x42ytesPayload\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x32\xda\x03\n\nRPCService\x12\x35\n\nSimpleCall\x12\x12.rpc.SimpleRequest\x1a\x13.rpc.SimpleResponse\x12\x43\n\x0eSimpleCallMany\x12\x17.rpc.SimpleBatchRequest\x1a\x18.rpc.SimpleBatchResponse\x12=\n\x08Pipeline\x12\x15.rpc.PipelinedRequest\x1a\x16.rpc.PipelinedResponse(\x01\x30\x01\x12\x39\n\x0cStreamValues\x12\x12.rpc.StreamRequest\x1a\x13.rpc.StreamResponse0\x01\x12=\n\x13StreamValuesBatched\x12\x12.rpc.StreamRequest\x1a\x10.rpc.StreamBatch0\x01\x12\x32\n\x06Upload\x12\x11.rpc.PayloadChunk\x1a\x13.rpc.UploadResponse(\x01\x12\x30\n\x04\x45\x63ho\x12\x11.rpc.PayloadChunk\x1a\x11.rpc.PayloadChunk(\x01\x30\x01\x12\x31\n\tEchoBytes\x12\x11.rpc.BytesPayload\x1a\x11.rpc.BytesPayloadb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -32,13 +32,29 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'rpc_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_SIMPLEREQUEST']._serialized_start=18
-  _globals['_SIMPLEREQUEST']._serialized_end=86
-  _globals['_SIMPLERESPONSE']._serialized_start=88
-  _globals['_SIMPLERESPONSE']._serialized_end=157
-  _globals['_STREAMREQUEST']._serialized_start=159
-  _globals['_STREAMREQUEST']._serialized_end=189
-  _globals['_STREAMRESPONSE']._serialized_start=191
-  _globals['_STREAMRESPONSE']._serialized_end=222
-  _globals['_RPCSERVICE']._serialized_start=224
-  _globals['_RPCSERVICE']._serialized_end=350
+  _globals['_SIMPLEREQUEST']._serialized_end=109
+  _globals['_SIMPLERESPONSE']._serialized_start=111
+  _globals['_SIMPLERESPONSE']._serialized_end=203
+  _globals['_PIPELINEDREQUEST']._serialized_start=205
+  _globals['_PIPELINEDREQUEST']._serialized_end=272
+  _globals['_PIPELINEDRESPONSE']._serialized_start=274
+  _globals['_PIPELINEDRESPONSE']._serialized_end=344
+  _globals['_SIMPLEBATCHREQUEST']._serialized_start=346
+  _globals['_SIMPLEBATCHREQUEST']._serialized_end=404
+  _globals['_SIMPLEBATCHRESPONSE']._serialized_start=406
+  _globals['_SIMPLEBATCHRESPONSE']._serialized_end=467
+  _globals['_STREAMREQUEST']._serialized_start=469
+  _globals['_STREAMREQUEST']._serialized_end=519
+  _globals['_STREAMRESPONSE']._serialized_start=521
+  _globals['_STREAMRESPONSE']._serialized_end=552
+  _globals['_STREAMBATCH']._serialized_start=554
+  _globals['_STREAMBATCH']._serialized_end=583
+  _globals['_PAYLOADCHUNK']._serialized_start=585
+  _globals['_PAYLOADCHUNK']._serialized_end=629
+  _globals['_UPLOADRESPONSE']._serialized_start=631
+  _globals['_UPLOADRESPONSE']._serialized_end=661
+  _globals['_BYTESPAYLOAD']._serialized_start=663
+  _globals['_BYTESPAYLOAD']._serialized_end=691
+  _globals['_RPCSERVICE']._serialized_start=694
+  _globals['_RPCSERVICE']._serialized_end=1168
 # @@protoc_insertion_point(module_scope)
@@ -39,11 +39,41 @@ class RPCServiceStub(object):
                 request_serializer=rpc__pb2.SimpleRequest.SerializeToString,
                 response_deserializer=rpc__pb2.SimpleResponse.FromString,
                 _registered_method=True)
+        self.SimpleCallMany = channel.unary_unary(
+                '/rpc.RPCService/SimpleCallMany',
+                request_serializer=rpc__pb2.SimpleBatchRequest.SerializeToString,
+                response_deserializer=rpc__pb2.SimpleBatchResponse.FromString,
+                _registered_method=True)
+        self.Pipeline = channel.stream_stream(
+                '/rpc.RPCService/Pipeline',
+                request_serializer=rpc__pb2.PipelinedRequest.SerializeToString,
+                response_deserializer=rpc__pb2.PipelinedResponse.FromString,
+                _registered_method=True)
         self.StreamValues = channel.unary_stream(
                 '/rpc.RPCService/StreamValues',
                 request_serializer=rpc__pb2.StreamRequest.SerializeToString,
                 response_deserializer=rpc__pb2.StreamResponse.FromString,
                 _registered_method=True)
+        self.StreamValuesBatched = channel.unary_stream(
+                '/rpc.RPCService/StreamValuesBatched',
+                request_serializer=rpc__pb2.StreamRequest.SerializeToString,
+                response_deserializer=rpc__pb2.StreamBatch.FromString,
+                _registered_method=True)
+        self.Upload = channel.stream_unary(
+                '/rpc.RPCService/Upload',
+                request_serializer=rpc__pb2.PayloadChunk.SerializeToString,
+                response_deserializer=rpc__pb2.UploadResponse.FromString,
+                _registered_method=True)
+        self.Echo = channel.stream_stream(
+                '/rpc.RPCService/Echo',
+                request_serializer=rpc__pb2.PayloadChunk.SerializeToString,
+                response_deserializer=rpc__pb2.PayloadChunk.FromString,
+                _registered_method=True)
+        self.EchoBytes = channel.unary_unary(
+                '/rpc.RPCService/EchoBytes',
+                request_serializer=rpc__pb2.BytesPayload.SerializeToString,
+                response_deserializer=rpc__pb2.BytesPayload.FromString,
+                _registered_method=True)
 
 
 class RPCServiceServicer(object):
@@ -55,12 +85,48 @@ class RPCServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def SimpleCallMany(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Pipeline(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def StreamValues(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamValuesBatched(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Upload(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Echo(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def EchoBytes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_RPCServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -69,11 +135,41 @@ def add_RPCServiceServicer_to_server(servicer, server):
                     request_deserializer=rpc__pb2.SimpleRequest.FromString,
                     response_serializer=rpc__pb2.SimpleResponse.SerializeToString,
             ),
+            'SimpleCallMany': grpc.unary_unary_rpc_method_handler(
+                    servicer.SimpleCallMany,
+                    request_deserializer=rpc__pb2.SimpleBatchRequest.FromString,
+                    response_serializer=rpc__pb2.SimpleBatchResponse.SerializeToString,
+            ),
+            'Pipeline': grpc.stream_stream_rpc_method_handler(
+                    servicer.Pipeline,
+                    request_deserializer=rpc__pb2.PipelinedRequest.FromString,
+                    response_serializer=rpc__pb2.PipelinedResponse.SerializeToString,
+            ),
             'StreamValues': grpc.unary_stream_rpc_method_handler(
                     servicer.StreamValues,
                     request_deserializer=rpc__pb2.StreamRequest.FromString,
                     response_serializer=rpc__pb2.StreamResponse.SerializeToString,
             ),
+            'StreamValuesBatched': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamValuesBatched,
+                    request_deserializer=rpc__pb2.StreamRequest.FromString,
+                    response_serializer=rpc__pb2.StreamBatch.SerializeToString,
+            ),
+            'Upload': grpc.stream_unary_rpc_method_handler(
+                    servicer.Upload,
+                    request_deserializer=rpc__pb2.PayloadChunk.FromString,
+                    response_serializer=rpc__pb2.UploadResponse.SerializeToString,
+            ),
+            'Echo': grpc.stream_stream_rpc_method_handler(
+                    servicer.Echo,
+                    request_deserializer=rpc__pb2.PayloadChunk.FromString,
+                    response_serializer=rpc__pb2.PayloadChunk.SerializeToString,
+            ),
+            'EchoBytes': grpc.unary_unary_rpc_method_handler(
+                    servicer.EchoBytes,
+                    request_deserializer=rpc__pb2.BytesPayload.FromString,
+                    response_serializer=rpc__pb2.BytesPayload.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'rpc.RPCService', rpc_method_handlers)
@@ -112,6 +208,60 @@ class RPCService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def SimpleCallMany(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rpc.RPCService/SimpleCallMany',
+            rpc__pb2.SimpleBatchRequest.SerializeToString,
+            rpc__pb2.SimpleBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Pipeline(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/rpc.RPCService/Pipeline',
+            rpc__pb2.PipelinedRequest.SerializeToString,
+            rpc__pb2.PipelinedResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def StreamValues(request,
             target,
@@ -138,3 +288,111 @@ class RPCService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def StreamValuesBatched(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/rpc.RPCService/StreamValuesBatched',
+            rpc__pb2.StreamRequest.SerializeToString,
+            rpc__pb2.StreamBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Upload(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/rpc.RPCService/Upload',
+            rpc__pb2.PayloadChunk.SerializeToString,
+            rpc__pb2.UploadResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Echo(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/rpc.RPCService/Echo',
+            rpc__pb2.PayloadChunk.SerializeToString,
+            rpc__pb2.PayloadChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def EchoBytes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/rpc.RPCService/EchoBytes',
+            rpc__pb2.BytesPayload.SerializeToString,
+            rpc__pb2.BytesPayload.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
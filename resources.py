@@ -0,0 +1,189 @@
+"""
+CPU, memory, context-switch and I/O sampling of benchmark processes from /proc.
+
+ResourceSampler reads /proc/<pid>/stat, status and io of each process it is
+given at start(), every interval seconds on a background thread, and at
+stop(). Counters (CPU time, context switches, I/O bytes) are reported as the
+difference between the first and last readings, and resident memory as the
+highest reading in between, so the figures cover only the sampled window
+rather than the life of the process. Where the kernel allows it, start()
+also resets each process's resident high-water mark (VmHWM, by writing "5"
+to /proc/<pid>/clear_refs), so the peak includes spikes that fall between
+readings. Context switches are read per thread
+and added up from each thread's increments between readings, so threads
+started during the window count and those that exit keep what was seen of
+them up to their last reading.
+
+/proc is Linux only; elsewhere available() is False and nothing is sampled.
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# Fields of /proc/<pid>/status and /proc/<pid>/io kept in a reading
+_STATUS_FIELDS = {
+    "VmRSS": "rss_kb",
+    "VmHWM": "hwm_kb",
+    "voluntary_ctxt_switches": "voluntary_ctx_switches",
+    "nonvoluntary_ctxt_switches": "involuntary_ctx_switches",
+}
+_IO_FIELDS = {
+    "read_bytes": "read_bytes",
+    "write_bytes": "write_bytes",
+}
+
+# Counters reported as the difference between the first and last readings
+_COUNTERS = ("cpu_s", "read_bytes", "write_bytes")
+
+# Per-thread counters, added up over the increments each thread shows between readings
+_SWITCHES = ("voluntary_ctx_switches", "involuntary_ctx_switches")
+
+
+def available():
+    return os.path.exists("/proc/self/stat")
+
+
+def _status_fields(status, keys):
+    fields = {}
+    for line in status.splitlines():
+        name, _, value = line.partition(":")
+        if _STATUS_FIELDS.get(name) in keys:
+            fields[_STATUS_FIELDS[name]] = int(value.split()[0])
+    return fields
+
+
+def reset_peak_rss(pid):
+    """Reset a process's resident high-water mark (Linux 4.0+); False if that is not allowed."""
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:  # Gone, an older kernel, or not ours to write
+        return False
+    return True
+
+
+def read_process(pid):
+    """One reading of a process's counters and resident memory, or None if it has gone."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+        with open(f"/proc/{pid}/status") as f:
+            status = f.read()
+    except (FileNotFoundError, ProcessLookupError):
+        return None
+    # The command name may contain spaces; utime and stime are fields 14 and 15
+    fields = stat[stat.rindex(")") + 2:].split()
+    reading = {"cpu_s": (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS}
+    reading.update(_status_fields(status, ("rss_kb", "hwm_kb")))
+    # A process's status counts the context switches of its main thread only, so read each thread's
+    try:
+        tids = os.listdir(f"/proc/{pid}/task")
+    except FileNotFoundError:
+        return None
+    reading["threads"] = {}
+    for tid in tids:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/status") as f:
+                reading["threads"][tid] = _status_fields(f.read(), _SWITCHES)
+        except (FileNotFoundError, ProcessLookupError):
+            continue  # The thread exited
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in _IO_FIELDS:
+                    reading[_IO_FIELDS[name]] = int(value)
+    except (PermissionError, FileNotFoundError):
+        pass  # Needs ptrace access, which hardened kernels deny even for children
+    return reading
+
+
+class ResourceSampler:
+    """Samples named processes, e.g. {"client": os.getpid(), "server": server_pid}, on a thread."""
+
+    def __init__(self, pids, interval=0.05):
+        self.pids = dict(pids)
+        self.interval = interval
+        self.samples = 0
+        self._first = {}
+        self._last = {}
+        self._peak_rss_kb = {}
+        self._hwm_reset = set()  # Roles whose VmHWM counts from start()
+        self._switches = {}  # role -> {counter: total}
+        self._threads = {}  # role -> {tid: last reading}
+        self._stop = threading.Event()
+        self._thread = None
+        self._own_tid = None  # The sampling thread's own switches are not the benchmark's
+
+    def _sample(self):
+        for role, pid in self.pids.items():
+            reading = read_process(pid)
+            if reading is None:
+                continue
+            first = self._first.setdefault(role, reading)
+            self._last[role] = reading
+            self._count_switches(role, reading["threads"], baseline=reading is first)
+            if "rss_kb" in reading:
+                peak = reading["rss_kb"]
+                if role in self._hwm_reset:
+                    peak = max(peak, reading.get("hwm_kb", 0))
+                self._peak_rss_kb[role] = max(self._peak_rss_kb.get(role, 0), peak)
+        self.samples += 1
+
+    def _count_switches(self, role, threads, baseline):
+        totals = self._switches.setdefault(role, dict.fromkeys(_SWITCHES, 0))
+        seen = self._threads.setdefault(role, {})
+        for tid, counts in threads.items():
+            if tid == self._own_tid:
+                continue
+            # Threads missing from the first reading started inside the window
+            previous = seen.get(tid, counts if baseline else {})
+            for counter in _SWITCHES:
+                totals[counter] += counts.get(counter, 0) - previous.get(counter, 0)
+            seen[tid] = counts
+
+    def _run(self):
+        self._own_tid = str(threading.get_native_id())
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._hwm_reset = {role for role, pid in self.pids.items() if reset_peak_rss(pid)}
+        self._sample()
+        self._thread = threading.Thread(target=self._run, name="ResourceSampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._sample()
+
+    def results(self, operations):
+        """
+        Figures per process role, keyed for a benchmark's extra_info: e.g.
+        client_cpu_s, client_cpu_s_per_1k_ops, client_peak_rss_kb and
+        client_voluntary_ctx_switches_per_op for operations calls.
+        """
+        results = {"resource_samples": self.samples}
+        for role, first in self._first.items():
+            last = self._last[role]
+            for counter in _COUNTERS:
+                if counter not in first or counter not in last:
+                    continue
+                delta = last[counter] - first[counter]
+                results[f"{role}_{counter}"] = delta
+                if operations and counter == "cpu_s":
+                    results[f"{role}_cpu_s_per_1k_ops"] = delta * 1000 / operations
+            for counter, delta in self._switches[role].items():
+                results[f"{role}_{counter}"] = delta
+                if operations:
+                    results[f"{role}_{counter}_per_op"] = delta / operations
+            if role in self._peak_rss_kb:
+                results[f"{role}_peak_rss_kb"] = self._peak_rss_kb[role]
+        return results
@@ -17,11 +17,15 @@ def main():
     logging.info("Starting benchmark run")
     parser = argparse.ArgumentParser(description="Run RPC benchmarks and collect results")
     parser.add_argument("--implementations", nargs="+",
-                        choices=["pure-python", "rpyc", "zmq", "grpc", "named-pipe", "pyro", "pyro5"],
-                        default=["pure-python", "rpyc", "zmq", "grpc", "pyro", "pyro5"],
+                        choices=["pure-python", "asyncio", "rpyc", "zmq", "grpc", "named-pipe", "unix-socket", "shm", "mp-connection",
+                                 "pyro", "pyro5"],
+                        default=["pure-python", "asyncio", "rpyc", "zmq", "grpc", "unix-socket", "mp-connection",
+                                 "pyro", "pyro5"],
                         help="RPC implementations to benchmark")
     parser.add_argument("--isolated", action="store_true",
                         help="Run servers in isolated processes (ignored for pure-python)")
+    parser.add_argument("--transport", choices=["tcp", "ipc"], default="tcp",
+                        help="Same-host transport for asyncio, mp-connection, ZeroMQ and gRPC (ipc = Unix domain sockets)")
     parser.add_argument("--test", type=str, help="Specific test pattern to run")
     parser.add_argument("--output-dir", type=str, default="benchmark_results",
                         help="Directory to store results")
@@ -50,9 +54,15 @@ def main():
         os.symlink(results_dir, latest_link, target_is_directory=True)
     
     # Run benchmarks for each implementation
+    skipped_implementations = set()
     for impl in args.implementations:
         if impl == "named-pipe" and not sys.platform.startswith("win"):
             print("Skipping named-pipe benchmarks on non-Windows platform")
+            skipped_implementations.add(impl)
+            continue
+        if impl in ("unix-socket", "shm") and sys.platform.startswith("win"):
+            print(f"Skipping {impl} benchmarks on Windows")
+            skipped_implementations.add(impl)
             continue
 
         # Skip isolated mode check for pure-python
@@ -92,7 +102,7 @@ def main():
         if is_isolated:
             cmd.append("--rpc-isolated")
 
-        cmd.extend([f"--rpc={impl}"])
+        cmd.extend([f"--rpc={impl}", f"--rpc-transport={args.transport}"])
         
         if args.test:
             cmd.append(args.test)
@@ -168,6 +178,8 @@ def main():
     # Check for successful benchmarks
     successful_implementations = []
     for impl in args.implementations:
+        if impl in skipped_implementations:
+            continue
         result_file = os.path.join(results_dir, f"{impl}_results.json")
         if os.path.exists(result_file) and os.path.getsize(result_file) > 0:
             try:
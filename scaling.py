@@ -0,0 +1,128 @@
+"""
+Concurrency scaling of throughput and latency, fitted to the Universal Scalability Law.
+
+The USL models throughput at concurrency N as
+
+    X(N) = lambda * N / (1 + sigma * (N - 1) + kappa * N * (N - 1))
+
+where lambda is the throughput of a single client, sigma the contention
+(serialised fraction) and kappa the coherency cost that makes throughput
+fall again past its peak at N = sqrt((1 - sigma) / kappa). By Little's law
+the matching latency is R(N) = N / X(N).
+
+fit_usl() finds the least-squares fit: lambda has a closed form for given
+sigma and kappa, which are searched on a log grid that is then refined
+around the best point, so no optimiser beyond numpy is needed.
+"""
+import math
+
+import numpy as np
+
+# Fewest distinct concurrency levels a curve needs to be fitted
+MIN_POINTS = 3
+
+# A curve is saturated from the lowest concurrency reaching this fraction of its best throughput
+SATURATION_FRACTION = 0.9
+
+# The knee is where the fitted throughput reaches this fraction of its ceiling (USL peak or asymptote)
+KNEE_FRACTION = 0.8
+
+
+def usl_throughput(n, lam, sigma, kappa):
+    n = np.asarray(n, dtype=float)
+    return lam * n / (1 + sigma * (n - 1) + kappa * n * (n - 1))
+
+
+def _best_fit(n, x, sigmas, kappas):
+    """(squared error, lambda, sigma, kappa) of the best grid point."""
+    s, k = np.meshgrid(sigmas, kappas, indexing="ij")
+    # g[i, j, p]: the USL curve of point p for lambda = 1
+    g = n / (1 + s[..., None] * (n - 1) + k[..., None] * n * (n - 1))
+    lam = (g * x).sum(axis=-1) / (g * g).sum(axis=-1)
+    error = ((lam[..., None] * g - x) ** 2).sum(axis=-1)
+    i, j = np.unravel_index(np.argmin(error), error.shape)
+    return error[i, j], lam[i, j], sigmas[i], kappas[j]
+
+
+def fit_usl(concurrency, throughput):
+    """
+    Least-squares USL fit of throughput (operations/s) against concurrency.
+
+    Returns a dict with lambda, sigma, kappa, r_squared, peak_concurrency and
+    peak_throughput (None without a peak, i.e. when kappa is 0), or None with
+    fewer than MIN_POINTS distinct concurrency levels.
+    """
+    n = np.asarray(concurrency, dtype=float)
+    x = np.asarray(throughput, dtype=float)
+    if len(np.unique(n)) < MIN_POINTS or not np.all(np.isfinite(x)):
+        return None
+
+    sigmas = np.concatenate(([0.0], np.logspace(-4, 0, 41)))
+    kappas = np.concatenate(([0.0], np.logspace(-7, 0, 71)))
+    _, lam, sigma, kappa = _best_fit(n, x, sigmas, kappas)
+    for _ in range(3):
+        # Refine on a finer grid around the best point so far
+        sigmas = np.unique(np.clip(np.linspace(sigma * 0.5, sigma * 1.5 + 1e-4, 41), 0, 1))
+        kappas = np.unique(np.clip(np.linspace(kappa * 0.5, kappa * 1.5 + 1e-7, 41), 0, None))
+        error, lam, sigma, kappa = _best_fit(n, x, sigmas, kappas)
+
+    total = ((x - x.mean()) ** 2).sum()
+    fit = {
+        "lambda": float(lam),
+        "sigma": float(sigma),
+        "kappa": float(kappa),
+        "r_squared": float(1 - error / total) if total > 0 else 1.0,
+        "peak_concurrency": None,
+        "peak_throughput": None,
+    }
+    if kappa > 0 and sigma < 1:
+        peak = math.sqrt((1 - sigma) / kappa)
+        fit["peak_concurrency"] = peak
+        fit["peak_throughput"] = float(usl_throughput(peak, lam, sigma, kappa))
+    return fit
+
+
+def throughput_ceiling(fit):
+    """
+    Highest throughput the fitted curve approaches: its peak when kappa > 0,
+    else its asymptote lambda / sigma, or None if it scales without limit.
+    """
+    if fit["peak_throughput"] is not None:
+        return fit["peak_throughput"]
+    if fit["sigma"] > 0:
+        return fit["lambda"] / fit["sigma"]
+    return None
+
+
+def knee_concurrency(fit, max_concurrency):
+    """
+    Lowest concurrency up to max_concurrency at which the fitted throughput
+    reaches KNEE_FRACTION of throughput_ceiling(), or None.
+    """
+    ceiling = throughput_ceiling(fit)
+    if ceiling is None:
+        return None
+    n = np.arange(1, int(max_concurrency) + 1)
+    x = usl_throughput(n, fit["lambda"], fit["sigma"], fit["kappa"])
+    reached = np.nonzero(x >= KNEE_FRACTION * ceiling)[0]
+    return int(n[reached[0]]) if len(reached) else None
+
+
+def saturation_concurrency(concurrency, throughput):
+    """Lowest measured concurrency reaching SATURATION_FRACTION of the best measured throughput."""
+    points = sorted(zip(concurrency, throughput))
+    best = max(x for _, x in points)
+    return next(n for n, x in points if x >= SATURATION_FRACTION * best)
+
+
+def analyse_curve(concurrency, throughput):
+    """USL fit, knee and saturation point of one throughput curve, or None if it cannot be fitted."""
+    fit = fit_usl(concurrency, throughput)
+    if fit is None:
+        return None
+    fit["knee_concurrency"] = knee_concurrency(fit, max(concurrency))
+    fit["saturation_concurrency"] = saturation_concurrency(concurrency, throughput)
+    fit["fitted_throughput"] = usl_throughput(concurrency, fit["lambda"], fit["sigma"], fit["kappa"]).tolist()
+    # Little's law: mean latency of the fitted curve
+    fit["fitted_latency"] = [n / x if x > 0 else None for n, x in zip(concurrency, fit["fitted_throughput"])]
+    return fit
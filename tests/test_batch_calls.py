@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import pytest
+
+
+@pytest.mark.parametrize("batch_size", [1, 10, 100, 1000, 10000])
+@pytest.mark.parametrize("mode", ["unbatched", "batched"])
+def test_benchmark_simple_call_many(rpc_implementation, benchmark, latency, mode, batch_size):
+    """Benchmark batched simple_call_many against the same number of individual simple_calls"""
+
+    values = list(range(batch_size))
+
+    def run_test():
+        async def batch_test():
+            if mode == "batched":
+                # One call per batch: its latency is that of the whole batch
+                with latency.time():
+                    return await rpc_implementation.simple_call_many(values)
+
+            semaphore = asyncio.Semaphore(10)
+
+            async def single_call(value):
+                async with semaphore:
+                    with latency.time():
+                        return await rpc_implementation.simple_call(value)
+
+            return await asyncio.gather(*(single_call(value) for value in values))
+
+        return asyncio.get_event_loop().run_until_complete(
+            asyncio.wait_for(batch_test(), timeout=300)
+        )
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = batch_size
+    benchmark.extra_info['mode'] = mode
+    results = benchmark(run_test)
+
+    logging.info(f"Completed {mode} benchmark with batch_size={batch_size}")
+
+    # Verify correct return values, in order
+    assert list(results) == [value * 2 for value in values]
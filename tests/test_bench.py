@@ -1,10 +1,11 @@
 import asyncio
 import logging
+import time
 import pytest
 
 
 
-def test_benchmark_simple_call(rpc_implementation, benchmark):
+def test_benchmark_simple_call(rpc_implementation, benchmark, latency):
     """Benchmark concurrent simple RPC calls"""
     num_calls = 50  # Define the number of operations
 
@@ -15,7 +16,8 @@ def test_benchmark_simple_call(rpc_implementation, benchmark):
 
             async def single_call():
                 async with semaphore:
-                    return await rpc_implementation.simple_call(42)
+                    with latency.time():
+                        return await rpc_implementation.simple_call(42)
 
             tasks = [single_call() for _ in range(num_calls)] # Use num_calls
             return await asyncio.gather(*tasks)
@@ -40,16 +42,22 @@ def test_benchmark_simple_call(rpc_implementation, benchmark):
         assert result == 84
 
 
-def test_benchmark_stream_thousand(rpc_implementation, benchmark):
+def test_benchmark_stream_thousand(rpc_implementation, benchmark, latency):
     """Benchmark streaming 1000 values from RPC"""
     num_values = 1000 # Define the number of operations
 
-    async def _run_stream_test():
+    async def _run_stream_test(histogram=None):
         # No try/except - let exceptions propagate
         result = []
         try:
             # Iterate directly over the async iterator
+            last = time.perf_counter_ns()
             async for x in rpc_implementation.stream_values(num_values): # Use num_values
+                if histogram is not None:
+                    # Latency of each value: the wait since the previous one (or since the request)
+                    now = time.perf_counter_ns()
+                    histogram.record_ns(now - last)
+                    last = now
                 result.append(x)
                 if len(result) % 100 == 0:
                     await asyncio.sleep(0)  # Yield control periodically
@@ -62,7 +70,7 @@ def test_benchmark_stream_thousand(rpc_implementation, benchmark):
 
     def run_benchmark_wrapper():
         # Run the async test function to completion using the event loop
-        return asyncio.get_event_loop().run_until_complete(_run_stream_test())
+        return asyncio.get_event_loop().run_until_complete(_run_stream_test(latency))
 
     # Add extra info
     benchmark.extra_info['operations'] = num_values
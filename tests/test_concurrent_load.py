@@ -3,31 +3,34 @@ import logging
 import pytest
 
 
-@pytest.mark.parametrize("concurrency", [1, 5, 10, 20, 50, 100])
-def test_benchmark_simple_call(rpc_implementation, benchmark, concurrency):
-    """Benchmark simple RPC calls with varying concurrency levels"""
+def run_concurrent_calls(rpc_implementation, latency, concurrency, total_calls):
+    """Make total_calls simple calls with at most concurrency of them in flight; returns their results."""
+    async def concurrent_test():
+        semaphore = asyncio.Semaphore(concurrency)
 
-    total_calls = 200 # Define the number of operations
+        async def limited_call():
+            async with semaphore:
+                with latency.time():
+                    return await rpc_implementation.simple_call(42)
 
-    def run_test():
-        async def concurrent_test():
-            semaphore = asyncio.Semaphore(concurrency)
+        tasks = [limited_call() for _ in range(total_calls)]
+        return await asyncio.gather(*tasks)
 
-            async def limited_call():
-                async with semaphore:
-                    return await rpc_implementation.simple_call(42)
+    return asyncio.get_event_loop().run_until_complete(
+        asyncio.wait_for(concurrent_test(), timeout=60)
+    )
 
-            tasks = [limited_call() for _ in range(total_calls)]
-            return await asyncio.gather(*tasks)
 
-        return asyncio.get_event_loop().run_until_complete(
-            asyncio.wait_for(concurrent_test(), timeout=60)
-        )
+@pytest.mark.parametrize("concurrency", [1, 5, 10, 20, 50, 100])
+def test_benchmark_simple_call(rpc_implementation, benchmark, latency, concurrency):
+    """Benchmark simple RPC calls with varying concurrency levels"""
+
+    total_calls = 200 # Define the number of operations
 
     # Add extra info BEFORE running the benchmark
     benchmark.extra_info['operations'] = total_calls
     # Run the benchmark
-    results = benchmark(run_test)
+    results = benchmark(run_concurrent_calls, rpc_implementation, latency, concurrency, total_calls)
 
     # Log concurrency information
     logging.info(
@@ -41,3 +44,54 @@ def test_benchmark_simple_call(rpc_implementation, benchmark, concurrency):
     # Verify correct return values
     for result in results:
         assert result == 84
+
+
+@pytest.mark.parametrize("pool_size", [1, 2, 4, 8, 16])
+@pytest.mark.parametrize("concurrency", [10, 50])
+def test_benchmark_pool_scaling(rpc_implementation, benchmark, latency, concurrency, pool_size):
+    """Benchmark simple RPC call throughput against the size of the client connection pool"""
+    pool = getattr(rpc_implementation, "pool", None)
+    if pool is None:
+        pytest.skip("Implementation does not use a client connection pool")
+    pool.resize(pool_size)
+
+    total_calls = 200 # Define the number of operations
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = total_calls
+    # Replaces the --rpyc-pool-size or --pyro5-pool-size value recorded for the run
+    for option in ("rpyc_pool_size", "pyro5_pool_size"):
+        if option in benchmark.extra_info:
+            benchmark.extra_info[option] = pool_size
+    results = benchmark(run_concurrent_calls, rpc_implementation, latency, concurrency, total_calls)
+
+    logging.info(
+        f"Completed pool scaling benchmark with concurrency={concurrency}, pool_size={pool_size}, "
+        f"open connections={pool.size}")
+
+    # Verify correct return values
+    for result in results:
+        assert result == 84
+
+
+@pytest.mark.parametrize("call_mode", ["unary", "pipelined"])
+@pytest.mark.parametrize("concurrency", [1, 5, 10, 20, 50, 100])
+def test_benchmark_call_mode(rpc_implementation, benchmark, latency, concurrency, call_mode):
+    """Benchmark unary calls against calls pipelined over one stream at each concurrency level"""
+    if not hasattr(rpc_implementation, "call_mode"):
+        pytest.skip("Implementation has no alternative call modes")
+    rpc_implementation.call_mode = call_mode
+
+    total_calls = 200 # Define the number of operations
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = total_calls
+    # Replaces the --grpc-call-mode value recorded for the run
+    benchmark.extra_info['grpc_call_mode'] = call_mode
+    results = benchmark(run_concurrent_calls, rpc_implementation, latency, concurrency, total_calls)
+
+    logging.info(f"Completed call mode benchmark with concurrency={concurrency}, call_mode={call_mode}")
+
+    # Verify correct return values
+    for result in results:
+        assert result == 84
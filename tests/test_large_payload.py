@@ -1,9 +1,36 @@
 import asyncio
+import tracemalloc
 
+import numpy as np
 import pytest
 
+from implementations.offload import OffloadImplementation
 
-def test_benchmark_large_payload(rpc_implementation, benchmark):
+
+# Tests whose calls the offload layer passes straight to the backend, so an offload case would repeat direct
+DIRECT_ONLY_TESTS = {"test_benchmark_chunked_upload"}
+
+
+@pytest.fixture(params=[False, True], ids=["direct", "offload"])
+def rpc_implementation(rpc_implementation, request):
+    """The backend under test, then the same backend behind the shared-memory offload layer."""
+    if request.param and request.function.__name__ in DIRECT_ONLY_TESTS:
+        pytest.skip("Only simple_call() and echo_bytes() go through the offload layer")
+    if "benchmark" in request.fixturenames:
+        benchmark = request.getfixturevalue("benchmark")
+        benchmark.extra_info['offload'] = request.param
+        if request.param:
+            benchmark.extra_info['offload_threshold'] = request.config.getoption("--rpc-offload-threshold")
+    if not request.param:
+        yield rpc_implementation
+        return
+    offloaded = OffloadImplementation(rpc_implementation, request.config.getoption("--rpc-offload-threshold"))
+    yield offloaded
+    # The wrapped backend is torn down by its own fixture
+    offloaded.arena.close()
+
+
+def test_benchmark_large_payload(rpc_implementation, benchmark, latency):
     """Benchmark RPC calls with payloads of increasing sizes"""
 
     def run_test():
@@ -12,9 +39,12 @@ def test_benchmark_large_payload(rpc_implementation, benchmark):
             sizes = [1024, 10*1024, 100*1024, 1024*1024]
             num_operations = len(sizes) # Define the number of operations
 
+            async def timed_call(payload):
+                with latency.time():
+                    return await rpc_implementation.simple_call(payload)
+
             # Run concurrent calls with different payload sizes
-            tasks = [rpc_implementation.simple_call(
-                "x" * size) for size in sizes]
+            tasks = [timed_call("x" * size) for size in sizes]
             results = await asyncio.gather(*tasks)
 
             return list(zip(sizes, results))
@@ -37,3 +67,130 @@ def test_benchmark_large_payload(rpc_implementation, benchmark):
     for size, result in results:
         assert len(result) == 2 * \
             size, f"Expected result length {2*size}, got {len(result)}"
+
+
+@pytest.mark.parametrize("size", [1024, 10*1024, 100*1024, 1024*1024, 10*1024*1024, 100*1024*1024])
+def test_benchmark_payload_size_sweep(rpc_implementation, benchmark, latency, size):
+    """Benchmark a single call per payload size to compare per-MB latency and peak memory"""
+    # Peak memory of this test alone is recorded by the record_resources fixture
+
+    payload = "x" * size
+
+    def run_test():
+        with latency.time():
+            return asyncio.get_event_loop().run_until_complete(
+                asyncio.wait_for(rpc_implementation.simple_call(payload), timeout=300)
+            )
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = 1
+    benchmark.extra_info['payload_bytes'] = size
+    result = benchmark(run_test)
+
+    assert len(result) == 2 * size, f"Expected result length {2*size}, got {len(result)}"
+
+
+def make_buffer(buffer_type, size):
+    """Random (incompressible) payload of size bytes as bytes or a uint8 NumPy array."""
+    array = np.random.default_rng(size).integers(0, 256, size, dtype=np.uint8)
+    return array.tobytes() if buffer_type == "bytes" else array
+
+
+def traced_peak(call):
+    """Run call() once under tracemalloc and return the peak of traced memory above the start in bytes."""
+    # Already tracing under --rpc-alloc-profile, whose profiler then sees the peak of this call only
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1] - start
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+@pytest.mark.parametrize("buffer_type", ["bytes", "numpy"])
+@pytest.mark.parametrize("size", [1024, 10*1024, 100*1024, 1024*1024, 10*1024*1024, 100*1024*1024])
+def test_benchmark_echo_bytes_sweep(rpc_implementation, benchmark, latency, request, size, buffer_type):
+    """Benchmark echo_bytes() per payload size to compare throughput and allocations of binary payloads"""
+    # Incompressible 100 MB messages outlast RPyC's 30 s request timeout
+    if size > 10*1024*1024 and not request.config.getoption("--rpc-huge-payloads"):
+        pytest.skip("Echoes over 10 MB are opt-in; pass --rpc-huge-payloads")
+
+    payload = make_buffer(buffer_type, size)
+
+    def echo():
+        return asyncio.get_event_loop().run_until_complete(
+            asyncio.wait_for(rpc_implementation.echo_bytes(payload), timeout=300)
+        )
+
+    def run_test():
+        with latency.time():
+            return echo()
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = 1
+    benchmark.extra_info['payload_bytes'] = size
+    result = benchmark(run_test)
+    if benchmark.stats:
+        benchmark.extra_info['mb_per_s'] = size / benchmark.stats.stats.mean / 1e6
+    # One extra call outside the timed rounds; with an in-process server this
+    # also counts the server's allocations
+    peak = traced_peak(echo)
+    benchmark.extra_info['alloc_peak_bytes'] = peak
+    benchmark.extra_info['alloc_payload_copies'] = round(peak / size, 2)
+
+    assert memoryview(result).nbytes == size, f"Expected {size} bytes back, got {memoryview(result).nbytes}"
+    assert result == memoryview(payload).cast("B"), "Echoed payload differs from the one sent"
+
+
+HUGE_PAYLOAD_SIZES = [10*1024*1024, 100*1024*1024, 500*1024*1024]
+
+
+@pytest.mark.parametrize("size", HUGE_PAYLOAD_SIZES)
+def test_benchmark_huge_payload(rpc_implementation, benchmark, latency, request, size):
+    """Benchmark single calls with payloads beyond typical per-message limits (opt-in)"""
+    if not request.config.getoption("--rpc-huge-payloads"):
+        pytest.skip("Huge payloads are opt-in; pass --rpc-huge-payloads")
+
+    payload = "x" * size
+
+    def run_test():
+        with latency.time():
+            return asyncio.get_event_loop().run_until_complete(
+                asyncio.wait_for(rpc_implementation.simple_call(payload), timeout=600)
+            )
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = 1
+    benchmark.extra_info['payload_bytes'] = size
+    result = benchmark(run_test)
+
+    assert len(result) == 2 * size, f"Expected result length {2*size}, got {len(result)}"
+
+
+@pytest.mark.parametrize("size", HUGE_PAYLOAD_SIZES)
+def test_benchmark_chunked_upload(rpc_implementation, benchmark, latency, request, size):
+    """Benchmark one-way chunked uploads of huge bytes payloads (opt-in)"""
+    if not request.config.getoption("--rpc-huge-payloads"):
+        pytest.skip("Huge payloads are opt-in; pass --rpc-huge-payloads")
+    if not hasattr(rpc_implementation, "upload"):
+        pytest.skip("Implementation has no chunked upload")
+
+    payload = b"x" * size
+
+    def run_test():
+        with latency.time():
+            return asyncio.get_event_loop().run_until_complete(
+                asyncio.wait_for(rpc_implementation.upload(payload), timeout=600)
+            )
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = 1
+    benchmark.extra_info['payload_bytes'] = size
+    result = benchmark(run_test)
+
+    assert result == size, f"Expected the server to receive {size} bytes, got {result}"
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import pytest
+
+from latency import LatencyHistogram
+from open_loop import FIXED, POISSON, SIMPLE_CALL, STREAM, run_open_loop
+
+# Seconds of load per benchmark round, whatever the target rate
+RUN_SECONDS = 0.25
+
+
+def request_count(rate):
+    return max(10, int(rate * RUN_SECONDS))
+
+
+@pytest.fixture(autouse=True)
+def untraced(request):
+    """The target rates assume untraced processes; tracing every allocation overloads them at the higher rates."""
+    if request.config.getoption("--rpc-alloc-profile"):
+        pytest.skip("Open-loop target rates are not meaningful with --rpc-alloc-profile")
+
+
+@pytest.fixture
+def service_time():
+    """Service times (from the actual send) of every round, next to the corrected latency fixture."""
+    return LatencyHistogram()
+
+
+@pytest.fixture
+def load_totals():
+    """Requests sent and failed over every round, matching the latency histogram."""
+    return {"total_sent": 0, "total_errors": 0}
+
+
+def run_load(rpc_implementation, latency, service_time, load_totals, rate, arrivals, operation, stream_length=100):
+    count = request_count(rate)
+    result = asyncio.get_event_loop().run_until_complete(
+        run_open_loop(rpc_implementation, rate, count, arrivals=arrivals, operation=operation,
+                      stream_length=stream_length, latency=latency, service=service_time)
+    )
+    load_totals["total_sent"] += result.sent
+    load_totals["total_errors"] += result.errors
+    return result
+
+
+@pytest.mark.parametrize("arrivals", [FIXED, POISSON])
+@pytest.mark.parametrize("rate", [100, 500, 1000, 2000, 5000])
+def test_benchmark_open_loop_simple_call(rpc_implementation, benchmark, latency, service_time, load_totals,
+                                        rate, arrivals):
+    """Benchmark simple calls sent at a target rate, timed from their intended send times"""
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = request_count(rate)
+    result = benchmark(run_load, rpc_implementation, latency, service_time, load_totals, rate, arrivals,
+                       SIMPLE_CALL)
+    # Counts and rates of the last round; latencies and total_errors of all of them.
+    # Failed calls are a result of the sweep (the backend is saturated), not a test failure
+    benchmark.extra_info.update(result.extra_info())
+    benchmark.extra_info.update(load_totals)
+
+    logging.info(f"Completed open-loop benchmark at {rate}/s ({arrivals}): "
+                 f"achieved {result.achieved_rate:.0f}/s, p99 {latency.percentile(99)}, "
+                 f"{load_totals['total_errors']} of {load_totals['total_sent']} calls failed")
+
+    assert result.completed + result.errors == result.sent
+
+
+@pytest.mark.parametrize("arrivals", [FIXED, POISSON])
+@pytest.mark.parametrize("rate", [20, 100, 500])
+def test_benchmark_open_loop_stream(rpc_implementation, benchmark, latency, service_time, load_totals,
+                                    rate, arrivals):
+    """Benchmark 100-value streams opened at a target rate, timed from their intended start times"""
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = request_count(rate)
+    benchmark.extra_info['stream_length'] = 100
+    result = benchmark(run_load, rpc_implementation, latency, service_time, load_totals, rate, arrivals, STREAM)
+    # Counts and rates of the last round; latencies and total_errors of all of them.
+    # Failed streams are a result of the sweep (the backend is saturated), not a test failure
+    benchmark.extra_info.update(result.extra_info())
+    benchmark.extra_info.update(load_totals)
+
+    logging.info(f"Completed open-loop stream benchmark at {rate}/s ({arrivals}): "
+                 f"achieved {result.achieved_rate:.0f}/s, p99 {latency.percentile(99)}, "
+                 f"{load_totals['total_errors']} of {load_totals['total_sent']} streams failed")
+
+    assert result.completed + result.errors == result.sent
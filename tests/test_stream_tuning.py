@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+import pytest
+
+
+def run_stream(rpc_implementation, count, latency):
+    async def collect():
+        # Latency of each value: the wait since the previous one (or since the request)
+        values = []
+        last = time.perf_counter_ns()
+        async for x in rpc_implementation.stream_values(count):
+            now = time.perf_counter_ns()
+            latency.record_ns(now - last)
+            last = now
+            values.append(x)
+        return values
+
+    return asyncio.get_event_loop().run_until_complete(
+        asyncio.wait_for(collect(), timeout=120)
+    )
+
+
+@pytest.mark.parametrize("window", [1, 8, 64, 256, 1000])
+def test_benchmark_stream_window(rpc_implementation, benchmark, latency, window):
+    """Benchmark streaming 1000 values with flow-control windows of different numbers of values"""
+    if not hasattr(rpc_implementation, "stream_window"):
+        pytest.skip("Implementation has no stream flow-control window counted in values")
+    rpc_implementation.stream_window = window
+    num_values = 1000 # Define the number of operations
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = num_values
+    # Replaces the --zmq-stream-window value recorded for the run
+    benchmark.extra_info['zmq_stream_window'] = window
+    results = benchmark(run_stream, rpc_implementation, num_values, latency)
+
+    logging.info(f"Completed stream benchmark with window={window}")
+    assert results == list(range(num_values))
+
+
+@pytest.mark.parametrize("num_values", [1000, 10000])
+@pytest.mark.parametrize("batch_size", [0, 1, 10, 100, 1000])
+def test_benchmark_stream_batch_size(rpc_implementation, benchmark, latency, batch_size, num_values):
+    """Benchmark streaming with values packed into batches (0 = one message per value)"""
+    if not hasattr(rpc_implementation, "stream_batch_size"):
+        pytest.skip("Implementation has no batched stream mode")
+    rpc_implementation.stream_batch_size = batch_size
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = num_values
+    # Replaces the --grpc-stream-batch-size value recorded for the run
+    benchmark.extra_info['grpc_stream_batch_size'] = batch_size
+    results = benchmark(run_stream, rpc_implementation, num_values, latency)
+
+    logging.info(f"Completed stream benchmark with batch_size={batch_size}, num_values={num_values}")
+    assert results == list(range(num_values))
+
+
+@pytest.mark.parametrize("num_values", [1000, 100000])
+def test_benchmark_stream_first_item(rpc_implementation, benchmark, latency, num_values):
+    """Benchmark the time to the first streamed value, which should not grow with stream length"""
+
+    def run_test():
+        async def first_item():
+            stream = rpc_implementation.stream_values(num_values)
+            try:
+                with latency.time():
+                    async for x in stream:
+                        return x
+            finally:
+                await stream.aclose()
+
+        return asyncio.get_event_loop().run_until_complete(
+            asyncio.wait_for(first_item(), timeout=120)
+        )
+
+    # Add extra info BEFORE running the benchmark
+    benchmark.extra_info['operations'] = 1
+    benchmark.extra_info['stream_length'] = num_values
+    result = benchmark(run_test)
+
+    assert result == 0
@@ -5,6 +5,8 @@ import os
 import pandas as pd
 from tabulate import tabulate
 
+from generate_report import ALLOC_HEADERS, RESOURCE_HEADERS, format_allocation, format_resource
+
 def format_time(seconds):
     """Format time in a human-readable way based on magnitude."""
     if seconds < 0.000001:  # less than 1 microsecond
@@ -67,6 +69,34 @@ def view_test_details(results, test_name=None):
         headers = ["Implementation", "Mean Time", "Relative Speed", "Ops/Second"]
         print(tabulate(table_data, headers=headers, tablefmt="grid"))
 
+        # Per-call latency percentiles, lowest p99 first
+        latency_rows = sorted(((impl, data['latency']) for impl, data in impls.items() if 'latency' in data),
+                              key=lambda x: x[1]['p99'])
+        if latency_rows:
+            print("\nPer-call latency:")
+            table_data = [[impl] + [format_time(latency[key]) for key in ('p50', 'p90', 'p99', 'p99_9', 'max_latency')]
+                          for impl, latency in latency_rows]
+            headers = ["Implementation", "p50", "p90", "p99", "p99.9", "Max"]
+            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+        # Client and server CPU, memory and context switches
+        resource_rows = [(impl, data['resources']) for impl, data in impls.items() if 'resources' in data]
+        if resource_rows:
+            print("\nResource usage:")
+            table_data = [[impl] + [format_resource(key, resources[key]) for key, _ in RESOURCE_HEADERS]
+                          for impl, resources in resource_rows]
+            headers = ["Implementation"] + [header for _, header in RESOURCE_HEADERS]
+            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
+        # Retained allocations per operation, with --rpc-alloc-profile
+        alloc_rows = [(impl, data['allocations']) for impl, data in impls.items() if 'allocations' in data]
+        if alloc_rows:
+            print("\nRetained allocations:")
+            table_data = [[impl] + [format_allocation(key, allocations[key]) for key, _ in ALLOC_HEADERS]
+                          for impl, allocations in alloc_rows]
+            headers = ["Implementation"] + [header for _, header in ALLOC_HEADERS]
+            print(tabulate(table_data, headers=headers, tablefmt="grid"))
+
 def view_implementation_details(results, impl_name):
     """Display detailed results for a specific implementation."""
     if impl_name not in results['summary']['implementations']: